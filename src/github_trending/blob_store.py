@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from utils.logger import logger
+
+
+def blobs_dir() -> Path:
+    from github_trending.trending_service import cache_dir
+
+    path = cache_dir() / "blobs"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def blob_path(digest: str) -> Path:
+    return blobs_dir() / digest[:2] / digest
+
+
+def _copy_mode_path() -> Path:
+    return blobs_dir() / "copy-mode"
+
+
+def copy_mode() -> bool:
+    """文件系统不支持硬链接时进入复制模式：按日期的文件是独立副本，无法从链接数判断 blob 是否仍被引用"""
+    return _copy_mode_path().exists()
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def store_blob(data: bytes) -> Path:
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    return path
+
+
+def write_text(path: Path, text: str) -> Path:
+    """按内容寻址写入：相同内容只存一份 blob，按日期的路径是指向它的硬链接。"""
+    from github_trending.trending_service import _atomic_write_text
+
+    if copy_mode():
+        # blob 只作为硬链接的目标，复制模式下不再写入
+        _atomic_write_text(path, text)
+        return path
+    blob = store_blob(text.encode("utf-8"))
+    if _same_file(path, blob):
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.unlink(missing_ok=True)
+        os.link(blob, tmp_path)
+        tmp_path.replace(path)
+    except OSError as e:
+        # 文件系统不支持硬链接时退回普通写入，并记录下来供 gc_blobs 判断
+        logger.info(f"创建硬链接失败，blob 存储改为复制写入: {path} ({e})")
+        _copy_mode_path().touch()
+        _atomic_write_text(path, text)
+    return path
+
+
+def gc_blobs() -> tuple[int, int]:
+    removed = 0
+    freed = 0
+    if copy_mode():
+        # 复制模式下所有 blob 的链接数都是 1，按链接数清理会删掉仍在使用的 blob
+        logger.info("blob 存储处于复制模式，跳过清理")
+        return removed, freed
+    root = blobs_dir()
+    for path in root.glob("*/*"):
+        try:
+            st = path.stat()
+            # 链接数为 1 说明已没有任何日期目录引用该 blob
+            if path.suffix == ".tmp" or st.st_nlink > 1:
+                continue
+            path.unlink()
+            removed += 1
+            freed += st.st_size
+        except OSError:
+            continue
+    if removed:
+        logger.info(f"清理无引用 blob: count={removed}, freed={freed / 1024 / 1024:.1f}MB")
+    return removed, freed
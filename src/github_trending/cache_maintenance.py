@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import shutil
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from github_trending.trending_service import CancelCheck
+
+
+COLD_DIRS = ("readme", "readme_html")
+DATED_DIRS = ("readme", "readme_summary", "readme_html")
+_DATE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    compress_after_days: int = 7
+    max_age_days: int = 180
+    max_size_mb: int = 1024
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> "CachePolicy":
+        cache_config = (config or {}).get("cache", {})
+        defaults = cls()
+        return cls(
+            compress_after_days=int(
+                cache_config.get("compress_after_days", defaults.compress_after_days)
+            ),
+            max_age_days=int(cache_config.get("max_age_days", defaults.max_age_days)),
+            max_size_mb=int(cache_config.get("max_size_mb", defaults.max_size_mb)),
+        )
+
+
+@dataclass
+class MaintenanceReport:
+    bytes_before: int = 0
+    bytes_after: int = 0
+    compressed_files: int = 0
+    deleted_files: int = 0
+    deleted_paths: list[str] = field(default_factory=list)
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return max(0, self.bytes_before - self.bytes_after)
+
+
+def _dir_size(path: Path) -> int:
+    # 硬链接到同一 blob 的文件只计一次
+    total = 0
+    seen: set[tuple[int, int]] = set()
+    for p in path.rglob("*"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if not p.is_file() or (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        total += st.st_size
+    return total
+
+
+def _date_dirs(root: Path) -> list[tuple[date, Path]]:
+    if not root.exists():
+        return []
+    result: list[tuple[date, Path]] = []
+    for p in root.iterdir():
+        if not p.is_dir():
+            continue
+        try:
+            result.append((date.fromisoformat(p.name), p))
+        except ValueError:
+            continue
+    return sorted(result)
+
+
+def _payload_files(base: Path) -> list[tuple[date, Path]]:
+    # payload / 日报 Markdown，以及 html/ 下的页面快照
+    result: list[tuple[date, Path]] = []
+    snapshots = base / "html"
+    candidates = list(base.iterdir())
+    if snapshots.exists():
+        candidates.extend(snapshots.iterdir())
+    for p in candidates:
+        if not p.is_file() or p.suffix not in {".json", ".md", ".gz"}:
+            continue
+        m = _DATE_RE.match(p.name)
+        if not m:
+            continue
+        try:
+            result.append((date.fromisoformat(m.group(1)), p))
+        except ValueError:
+            continue
+    return sorted(result)
+
+
+def _compress_file(path: Path) -> int:
+    gz_path = path.with_name(path.name + ".gz")
+    tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+    with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+    # 先让 .gz 就位再删除原文件，并发读取方总能读到其中之一
+    tmp_path.replace(gz_path)
+    saved = path.stat().st_size - gz_path.stat().st_size
+    path.unlink()
+    return saved
+
+
+def _remove(path: Path, report: MaintenanceReport) -> None:
+    try:
+        if path.is_dir():
+            for p in path.rglob("*"):
+                if p.is_file():
+                    report.deleted_files += 1
+                    report.deleted_paths.append(str(p.with_name(p.name.removesuffix(".gz"))))
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.exists():
+            report.deleted_files += 1
+            path.unlink()
+    except OSError as e:
+        logger.warning(f"删除缓存失败: {path} ({e})")
+
+
+def compress_cold_files(
+    base: Path,
+    cutoff: date,
+    report: MaintenanceReport,
+    should_cancel: CancelCheck | None = None,
+) -> None:
+    from github_trending.trending_service import _cancelled
+
+    for dirname in COLD_DIRS:
+        for d, date_dir in _date_dirs(base / dirname):
+            if d >= cutoff:
+                break
+            for path in date_dir.iterdir():
+                if _cancelled(should_cancel):
+                    return
+                if not path.is_file() or path.suffix not in {".md", ".html"}:
+                    continue
+                try:
+                    # blob 仍被其他日期共享时压缩反而多占空间；只剩 blob 与本文件时再压缩
+                    if path.stat().st_nlink > 2:
+                        continue
+                    _compress_file(path)
+                    report.compressed_files += 1
+                except OSError as e:
+                    logger.warning(f"压缩缓存失败: {path} ({e})")
+
+
+def remove_legacy_payloads(base: Path, report: MaintenanceReport) -> None:
+    # 旧版按日期命名的 <date>.json/.md 已被 <date>__since-daily.* 取代
+    for legacy_json in base.glob("????-??-??.json"):
+        ds = legacy_json.stem
+        if (base / f"{ds}__since-daily.json").exists():
+            _remove(legacy_json, report)
+            _remove(legacy_json.with_suffix(".md"), report)
+
+
+def _regenerable_payload(p: Path) -> bool:
+    # 日报 Markdown 可由 JSON 再生成，页面快照只用于重新解析
+    return p.suffix == ".md" or (p.parent.name == "html" and p.name.endswith(".html.gz"))
+
+
+def expire_old_files(base: Path, cutoff: date, report: MaintenanceReport) -> None:
+    # 过期后只保留摘要和 JSON：原始 README / HTML / 日报 Markdown 都可由它们或网络再生成，
+    # 页面快照只用于重新解析，同样随保留期清理
+    for dirname in COLD_DIRS:
+        for d, date_dir in _date_dirs(base / dirname):
+            if d >= cutoff:
+                break
+            _remove(date_dir, report)
+    for d, p in _payload_files(base):
+        if d < cutoff and _regenerable_payload(p):
+            _remove(p, report)
+
+
+def _files(path: Path) -> list[Path]:
+    return [p for p in path.rglob("*") if p.is_file()] if path.is_dir() else [path]
+
+
+def enforce_size_budget(
+    base: Path, max_bytes: int, today: date, report: MaintenanceReport
+) -> None:
+    """超出容量上限时从最早的日期开始清理可再生成的文件（原始 README、HTML、日报、页面快照），
+    JSON 与摘要不随容量清理；今天的数据不清理。"""
+    # 只统计按日期组织的数据；索引、历史库等派生数据不随日期清理
+    dated = [date_dir for dirname in DATED_DIRS for _, date_dir in _date_dirs(base / dirname)]
+    dated.extend(p for _, p in _payload_files(base))
+    total = 0
+    links: dict[tuple[int, int], int] = {}
+    for path in dated:
+        for p in _files(path):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if key not in links:
+                links[key] = st.st_nlink
+                total += st.st_size
+
+    evictable: dict[date, list[Path]] = {}
+    for dirname in COLD_DIRS:
+        for d, date_dir in _date_dirs(base / dirname):
+            evictable.setdefault(d, []).append(date_dir)
+    for d, p in _payload_files(base):
+        if _regenerable_payload(p):
+            evictable.setdefault(d, []).append(p)
+
+    freed: set[tuple[int, int]] = set()
+    removed_dates: list[str] = []
+    for d in sorted(evictable):
+        if total <= max_bytes or d >= today:
+            break
+        for path in evictable[d]:
+            for p in _files(path):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                key = (st.st_dev, st.st_ino)
+                links[key] = links.get(key, st.st_nlink) - 1
+                # 仍被其他日期的硬链接引用时空间不会释放；只剩 blob 一个链接时由 gc_blobs 回收
+                if links[key] <= 1 and key not in freed:
+                    freed.add(key)
+                    total -= st.st_size
+            _remove(path, report)
+        removed_dates.append(d.isoformat())
+    if removed_dates:
+        logger.info(
+            f"缓存超出容量上限，清理最早日期的可再生成文件: {removed_dates[0]} ~ {removed_dates[-1]} ({len(removed_dates)} 天)"
+        )
+    if total > max_bytes:
+        logger.warning(
+            f"缓存仍超出容量上限（JSON 与摘要不清理）: size={total / 1024 / 1024:.1f}MB, "
+            f"max={max_bytes / 1024 / 1024:.1f}MB"
+        )
+
+
+def _gc_blobs(report: MaintenanceReport) -> None:
+    from github_trending.blob_store import gc_blobs
+
+    removed_blobs, _ = gc_blobs()
+    report.deleted_files += removed_blobs
+
+
+def _state_path(base: Path) -> Path:
+    return base / "maintenance.json"
+
+
+def maintenance_due(base: Path | None = None, today: date | None = None) -> bool:
+    from github_trending.trending_service import cache_dir
+
+    base = base or cache_dir()
+    today = today or date.today()
+    try:
+        state = json.loads(_state_path(base).read_text(encoding="utf-8"))
+        return state.get("last_run") != today.isoformat()
+    except Exception:
+        return True
+
+
+def run_maintenance(
+    policy: CachePolicy | None = None,
+    base: Path | None = None,
+    today: date | None = None,
+    should_cancel: CancelCheck | None = None,
+) -> MaintenanceReport:
+    """should_cancel 返回 True 时在步骤之间（压缩时在文件之间）停下，本次不记为已完成，下次启动重新执行"""
+    from github_trending.cache_migration import migrate_all
+    from github_trending.job_queue import prune_jobs
+    from github_trending.search_index import forget_paths
+    from github_trending.trending_service import _atomic_write_json, _cancelled, cache_dir
+
+    policy = policy or CachePolicy()
+    base = base or cache_dir()
+    today = today or date.today()
+    report = MaintenanceReport(bytes_before=_dir_size(base))
+
+    steps = []
+    if base == cache_dir():
+        steps.append(migrate_all)
+    steps.append(lambda: remove_legacy_payloads(base, report))
+    if policy.max_age_days > 0:
+        cutoff = today - timedelta(days=policy.max_age_days)
+        steps.append(lambda: expire_old_files(base, cutoff, report))
+    if policy.compress_after_days > 0:
+        cold = today - timedelta(days=policy.compress_after_days)
+        steps.append(lambda: compress_cold_files(base, cold, report, should_cancel))
+    if policy.max_size_mb > 0:
+        steps.append(
+            lambda: enforce_size_budget(base, policy.max_size_mb * 1024 * 1024, today, report)
+        )
+    if base == cache_dir():
+        steps.append(lambda: prune_jobs(today - timedelta(days=7)))
+    steps.append(lambda: _gc_blobs(report))
+
+    for step in steps:
+        if _cancelled(should_cancel):
+            break
+        step()
+    # 已删除的文件无论是否取消都要从搜索索引中移除
+    forget_paths(report.deleted_paths)
+    if _cancelled(should_cancel):
+        logger.info(f"Trending 缓存维护已取消: deleted={report.deleted_files}")
+        return report
+    report.bytes_after = _dir_size(base)
+    _atomic_write_json(
+        _state_path(base),
+        {
+            "last_run": today.isoformat(),
+            "compressed_files": report.compressed_files,
+            "deleted_files": report.deleted_files,
+            "reclaimed_bytes": report.reclaimed_bytes,
+        },
+    )
+    logger.info(
+        f"Trending 缓存维护完成: compressed={report.compressed_files}, deleted={report.deleted_files}, "
+        f"reclaimed={report.reclaimed_bytes / 1024 / 1024:.1f}MB, size={report.bytes_after / 1024 / 1024:.1f}MB"
+    )
+    return report
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from utils.logger import logger
+
+
+_STEM_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:__(.*))?$")
+
+
+@dataclass(frozen=True)
+class MigrationContext:
+    json_path: Path
+    date: str
+    since: str
+    language: str | None
+
+
+def _language_from_report(json_path: Path) -> str | None:
+    # 同名日报 Markdown 的 Source 行保留了原始的 language 参数（未经 URL 编码）
+    try:
+        with open(json_path.with_suffix(".md"), encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("Source: "):
+                    _, _, query = line.strip().partition("?")
+                    for param in query.split("&"):
+                        key, _, value = param.partition("=")
+                        if key == "language" and value:
+                            return value
+                    return None
+    except OSError:
+        pass
+    return None
+
+
+def _context_from_path(json_path: Path, payload: dict[str, Any]) -> MigrationContext | None:
+    m = _STEM_RE.match(json_path.stem)
+    if not m:
+        return None
+    since = "daily"
+    language = None
+    for part in (m.group(2) or "").split("__"):
+        if part.startswith("since-"):
+            since = part.removeprefix("since-")
+        elif part.startswith("lang-"):
+            language = part.removeprefix("lang-")
+    # 文件名中的 language 经过替换（如 c++ -> c_），只在 payload 与日报都没有记录时使用
+    if payload.get("language"):
+        language = payload["language"]
+    elif language is not None:
+        language = _language_from_report(json_path) or language
+    return MigrationContext(
+        json_path=json_path,
+        date=str(payload.get("date") or m.group(1)),
+        since=str(payload.get("since") or since),
+        language=language,
+    )
+
+
+def _dated_file(kind: str, ds: str, full_name: str, suffix: str) -> Path:
+    # 与 repo_readme_path 等同名，但不为历史日期创建空目录
+    from github_trending.trending_service import cache_dir
+
+    safe = (full_name or "unknown").strip().replace("/", "__")
+    return cache_dir() / kind / ds / f"{safe}{suffix}"
+
+
+def _summary_source(payload: dict[str, Any]) -> str:
+    return "openai" if payload.get("openai_enabled") else "heuristic"
+
+
+def _v1_to_v2(payload: dict[str, Any], ctx: MigrationContext) -> dict[str, Any]:
+    # v2 起 payload 记录 date / since / language，条目带 rank
+    payload.setdefault("date", ctx.date)
+    payload.setdefault("since", ctx.since)
+    if not payload.get("language"):
+        payload["language"] = ctx.language
+    for idx, item in enumerate(payload.get("items") or [], start=1):
+        item.setdefault("rank", idx)
+    return payload
+
+
+def _v2_to_v3(payload: dict[str, Any], ctx: MigrationContext) -> dict[str, Any]:
+    # v3 起每个条目都有 readme_source 状态
+    for item in payload.get("items") or []:
+        if item.get("readme_source"):
+            continue
+        readme_md = item.get("readme_md")
+        if isinstance(readme_md, str) and readme_md.strip():
+            item["readme_source"] = _summary_source(payload)
+        else:
+            item["readme_source"] = "none"
+    return payload
+
+
+def _v3_to_v4(payload: dict[str, Any], ctx: MigrationContext) -> dict[str, Any]:
+    # v4 起原始 README / 摘要 / HTML 分别落盘，条目里只记路径；按磁盘上已有文件补齐
+    from github_trending.trending_service import cached_file_exists
+
+    for item in payload.get("items") or []:
+        full_name = str(item.get("full_name") or "")
+        if not full_name:
+            continue
+        raw = _dated_file("readme", ctx.date, full_name, ".md")
+        summary = _dated_file("readme_summary", ctx.date, full_name, ".md")
+        html = _dated_file("readme_html", ctx.date, full_name, ".html")
+        if not item.get("readme_raw_path") and cached_file_exists(raw):
+            item["readme_raw_path"] = str(raw)
+        if not item.get("readme_path") and cached_file_exists(summary):
+            item["readme_path"] = str(summary)
+        if not item.get("readme_html_path") and cached_file_exists(html):
+            item["readme_html_path"] = str(html)
+        state = item.get("readme_source")
+        if state in {"none", "error"} and item.get("readme_path"):
+            item["readme_source"] = _summary_source(payload)
+        elif state in {"none", "error"} and item.get("readme_raw_path"):
+            # 原始 README 已在本地，后续只需总结，不再请求 GitHub
+            item["readme_source"] = "raw"
+    return payload
+
+
+def _v4_to_v5(payload: dict[str, Any], ctx: MigrationContext) -> dict[str, Any]:
+    from github_trending.trending_service import _all_summaries_done
+
+    items = payload.get("items") or []
+    payload["summaries_complete"] = _all_summaries_done(items)
+    return payload
+
+
+def _v5_to_v6(payload: dict[str, Any], ctx: MigrationContext) -> dict[str, Any]:
+    # v6 的条目不再内联正文；只有内联摘要的旧条目先把摘要写成文件
+    from github_trending.blob_store import write_text as write_blob_text
+    from github_trending.trending_item import compact_item_dict
+
+    items: list[dict[str, Any]] = []
+    for item in payload.get("items") or []:
+        full_name = str(item.get("full_name") or "")
+        readme_md = item.get("readme_md")
+        if (
+            full_name
+            and not item.get("readme_path")
+            and isinstance(readme_md, str)
+            and readme_md.strip()
+        ):
+            summary = _dated_file("readme_summary", ctx.date, full_name, ".md")
+            write_blob_text(summary, readme_md.strip() + "\n")
+            item["readme_path"] = str(summary)
+        items.append(compact_item_dict(item))
+    payload["items"] = items
+    return payload
+
+
+MIGRATIONS: dict[int, Callable[[dict[str, Any], MigrationContext], dict[str, Any]]] = {
+    1: _v1_to_v2,
+    2: _v2_to_v3,
+    3: _v3_to_v4,
+    4: _v4_to_v5,
+    5: _v5_to_v6,
+}
+
+
+def migrate_payload(payload: dict[str, Any], json_path: Path) -> dict[str, Any] | None:
+    from github_trending.trending_service import SCHEMA_VERSION
+
+    version = payload.get("schema_version")
+    if not isinstance(version, int):
+        version = 1
+    if version >= SCHEMA_VERSION:
+        return payload
+    ctx = _context_from_path(json_path, payload)
+    if ctx is None or not isinstance(payload.get("items"), list):
+        return None
+    start = version
+    while version < SCHEMA_VERSION:
+        step = MIGRATIONS.get(version)
+        if step is None:
+            logger.warning(f"缺少缓存迁移步骤: v{version} -> v{version + 1} ({json_path})")
+            return None
+        payload = step(payload, ctx)
+        version += 1
+        payload["schema_version"] = version
+    logger.info(f"Trending 缓存已迁移: {json_path.name} v{start} -> v{version}")
+    return payload
+
+
+def upgrade_cached_payload(payload: dict[str, Any], json_path: Path) -> dict[str, Any] | None:
+    from github_trending.trending_service import _write_payload
+
+    original_version = payload.get("schema_version")
+    try:
+        migrated = migrate_payload(payload, json_path)
+    except Exception as e:
+        logger.warning(f"Trending 缓存迁移失败: {json_path} ({e})")
+        return None
+    if migrated is not None and migrated.get("schema_version") != original_version:
+        _write_payload(json_path, migrated)
+    return migrated
+
+
+def migrate_all() -> tuple[int, int]:
+    from github_trending.trending_service import SCHEMA_VERSION, cache_dir
+
+    migrated = 0
+    failed = 0
+    for json_path in sorted(cache_dir().glob("*.json")):
+        if not _STEM_RE.match(json_path.stem):
+            continue
+        try:
+            payload = json.loads(json_path.read_text(encoding="utf-8"))
+        except Exception:
+            failed += 1
+            continue
+        if not isinstance(payload, dict):
+            continue
+        if payload.get("schema_version") == SCHEMA_VERSION:
+            continue
+        if upgrade_cached_payload(payload, json_path) is None:
+            failed += 1
+        else:
+            migrated += 1
+    if migrated or failed:
+        logger.info(f"Trending 缓存批量迁移完成: migrated={migrated}, failed={failed}")
+    return migrated, failed
+
+
+if __name__ == "__main__":
+    migrate_all()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from utils.logger import logger
+
+
+STAGES = ("fetch", "summarize", "render")
+# pending / retry 仍待执行；done / skipped / failed / expired 为终态
+OPEN_STATUSES = ("pending", "retry")
+MAX_ATTEMPTS = 5
+BASE_DELAY_S = 30
+MAX_DELAY_S = 3600
+# 当天的任务最晚在次日该时刻前完成，之后不再重试
+DEADLINE_GRACE = timedelta(hours=6)
+
+# 每个线程复用一个连接：每个仓库每个阶段都要读写多次，不必每次重新打开并执行建表语句
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class Job:
+    date: str
+    repo: str
+    stage: str
+    status: str
+    attempts: int
+    next_attempt: float
+    deadline: float
+    last_error: str | None
+    # 完成时记录的结果，如 summarize 阶段实际使用的摘要来源（openai / heuristic）
+    result: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+
+def queue_path() -> Path:
+    from github_trending.trending_service import cache_dir
+
+    return cache_dir() / "jobs.sqlite3"
+
+
+def _connect() -> sqlite3.Connection:
+    path = queue_path().resolve()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == path:
+        return conn
+    if conn is not None:
+        # 缓存目录变化（工作目录切换）后重新打开
+        conn.close()
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            date TEXT NOT NULL,
+            repo TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL,
+            deadline REAL NOT NULL,
+            last_error TEXT,
+            updated_at REAL NOT NULL,
+            result TEXT,
+            PRIMARY KEY (date, repo, stage)
+        );
+        CREATE INDEX IF NOT EXISTS jobs_open ON jobs (status, next_attempt);
+        """
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "result" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN result TEXT")
+    _local.conn, _local.path = conn, path
+    return conn
+
+
+@contextmanager
+def _open() -> Iterator[sqlite3.Connection]:
+    # 连接保持打开，with 块结束时提交（异常时回滚）
+    conn = _connect()
+    with conn:
+        yield conn
+
+
+def _deadline(ds: str) -> float:
+    day = datetime.combine(date.fromisoformat(ds), datetime.min.time())
+    return (day + timedelta(days=1) + DEADLINE_GRACE).timestamp()
+
+
+def _backoff(attempts: int) -> float:
+    return min(MAX_DELAY_S, BASE_DELAY_S * 2 ** max(0, attempts - 1))
+
+
+def _expire(conn: sqlite3.Connection, now: float) -> None:
+    conn.execute(
+        "UPDATE jobs SET status = 'expired', updated_at = ? "
+        "WHERE status IN ('pending', 'retry') AND deadline <= ?",
+        (now, now),
+    )
+
+
+def ensure_jobs(ds: str, repos: list[str], stage: str) -> None:
+    now = time.time()
+    with _open() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (date, repo, stage, status, next_attempt, deadline, updated_at) "
+            "VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+            [(ds, repo, stage, now, _deadline(ds), now) for repo in repos if repo],
+        )
+
+
+def jobs_for(ds: str, repos: list[str] | None = None) -> dict[str, dict[str, Job]]:
+    now = time.time()
+    with _open() as conn:
+        _expire(conn, now)
+        rows = conn.execute(
+            "SELECT date, repo, stage, status, attempts, next_attempt, deadline, last_error, result "
+            "FROM jobs WHERE date = ?",
+            (ds,),
+        ).fetchall()
+    wanted = set(repos) if repos is not None else None
+    result: dict[str, dict[str, Job]] = {}
+    for row in rows:
+        job = Job(*row)
+        if wanted is None or job.repo in wanted:
+            result.setdefault(job.repo, {})[job.stage] = job
+    return result
+
+
+def is_due(job: Job | None, now: float | None = None) -> bool:
+    if job is None or not job.is_open:
+        return False
+    return job.next_attempt <= (now if now is not None else time.time())
+
+
+def _finish(ds: str, repo: str, stage: str, status: str, result: str | None = None) -> None:
+    now = time.time()
+    with _open() as conn:
+        conn.execute(
+            "INSERT INTO jobs (date, repo, stage, status, next_attempt, deadline, updated_at, result) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (date, repo, stage) DO UPDATE SET status = excluded.status, "
+            "last_error = NULL, updated_at = excluded.updated_at, result = excluded.result",
+            (ds, repo, stage, status, now, _deadline(ds), now, result),
+        )
+
+
+def complete(ds: str, repo: str, stage: str, result: str | None = None) -> None:
+    _finish(ds, repo, stage, "done", result)
+
+
+def skip(ds: str, repo: str, stages: tuple[str, ...]) -> None:
+    for stage in stages:
+        _finish(ds, repo, stage, "skipped")
+
+
+def fail(ds: str, repo: str, stage: str, error: str) -> bool:
+    """记录一次失败；返回 True 表示已安排退避重试，False 表示次数或期限用尽"""
+    now = time.time()
+    with _open() as conn:
+        row = conn.execute(
+            "SELECT attempts, deadline FROM jobs WHERE date = ? AND repo = ? AND stage = ?",
+            (ds, repo, stage),
+        ).fetchone()
+        attempts = (row[0] if row else 0) + 1
+        deadline = row[1] if row else _deadline(ds)
+        next_attempt = now + _backoff(attempts)
+        retry = attempts < MAX_ATTEMPTS and next_attempt < deadline
+        conn.execute(
+            "INSERT OR REPLACE INTO jobs "
+            "(date, repo, stage, status, attempts, next_attempt, deadline, last_error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                ds,
+                repo,
+                stage,
+                "retry" if retry else "failed",
+                attempts,
+                next_attempt,
+                deadline,
+                error[:500],
+                now,
+            ),
+        )
+    if retry:
+        logger.info(
+            f"Trending 任务失败，稍后重试: {repo} stage={stage} attempt={attempts} "
+            f"delay={_backoff(attempts):.0f}s ({error})"
+        )
+    else:
+        logger.warning(f"Trending 任务放弃: {repo} stage={stage} attempts={attempts} ({error})")
+    return retry
+
+
+def has_open_jobs(ds: str, repos: list[str]) -> bool:
+    return any(job.is_open for jobs in jobs_for(ds, repos).values() for job in jobs.values())
+
+
+def next_retry_at(ds: str) -> float | None:
+    now = time.time()
+    with _open() as conn:
+        _expire(conn, now)
+        row = conn.execute(
+            "SELECT MIN(next_attempt) FROM jobs WHERE date = ? AND status IN ('pending', 'retry')",
+            (ds,),
+        ).fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+def describe(ds: str, repo: str) -> str | None:
+    jobs = jobs_for(ds, [repo]).get(repo)
+    if not jobs:
+        return None
+    labels = {"fetch": "README 获取", "summarize": "README 总结", "render": "README 渲染"}
+    for stage in STAGES:
+        job = jobs.get(stage)
+        if job is None:
+            continue
+        label = labels[stage]
+        if job.status == "pending":
+            return f"{label}：排队中"
+        if job.status == "retry":
+            at = datetime.fromtimestamp(job.next_attempt).strftime("%H:%M")
+            return f"{label}失败，将于 {at} 第 {job.attempts + 1}/{MAX_ATTEMPTS} 次重试（{job.last_error}）"
+        if job.status in {"failed", "expired"}:
+            return f"{label}失败，已放弃（{job.last_error or '超过期限'}）"
+    return None
+
+
+def prune_jobs(before: date) -> int:
+    with _open() as conn:
+        removed = conn.execute("DELETE FROM jobs WHERE date < ?", (before.isoformat(),)).rowcount
+    if removed:
+        logger.info(f"清理过期 Trending 任务: count={removed}")
+    return removed
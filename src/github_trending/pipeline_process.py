@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+from collections.abc import Iterator
+from typing import Any
+
+from utils.logger import logger
+
+
+# 子进程发回的消息: (kind, since, data)
+#   progress     data = {"event": ..., **事件数据}
+#   period_done  data = {"updated": bool}
+#   error        data = {"message": str}
+#   cancelled    data = {}
+#   finished     data = {"updated": bool}
+Message = tuple[str, str | None, dict[str, Any]]
+
+
+def _run_periods(
+    out: Any, focus_in: Any, cancel_event: Any, periods: list[str], language: str | None
+) -> None:
+    from github_trending.trending_service import (
+        PipelineCancelled,
+        TrendingOptions,
+        fetch_and_cache_daily,
+    )
+
+    focus: dict[str, list[str]] = {}
+
+    def priority(since: str) -> list[str]:
+        # 只保留每个周期最新的焦点
+        while True:
+            try:
+                focus_since, names = focus_in.get_nowait()
+            except queue.Empty:
+                break
+            focus[focus_since] = names
+        return focus.get(since, [])
+
+    updated_any = False
+    for since in periods:
+        def progress(event: str, data: dict[str, Any], since: str = since) -> None:
+            out.put(("progress", since, {"event": event, **data}))
+
+        try:
+            _, updated = fetch_and_cache_daily(
+                options=TrendingOptions(since=since, language=language),
+                progress=progress,
+                should_cancel=cancel_event.is_set,
+                priority=lambda since=since: priority(since),
+            )
+        except PipelineCancelled:
+            out.put(("cancelled", since, {}))
+            return
+        except Exception as e:
+            out.put(("error", since, {"message": str(e)}))
+            continue
+        updated_any = updated_any or updated
+        out.put(("period_done", since, {"updated": updated}))
+    out.put(("finished", None, {"updated": updated_any}))
+
+
+class PipelineProcess:
+    """在子进程中运行 fetch_and_cache_daily，避免解析与序列化占用 GUI 进程的 GIL。"""
+
+    def __init__(self, periods: list[str], language: str | None = None):
+        # spawn 不继承父进程的 Qt 状态，各平台行为一致
+        ctx = mp.get_context("spawn")
+        self._queue = ctx.Queue()
+        self._focus_queue = ctx.Queue()
+        self._cancel_event = ctx.Event()
+        self._process = ctx.Process(
+            target=_run_periods,
+            args=(self._queue, self._focus_queue, self._cancel_event, list(periods), language),
+            name="trending-pipeline",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._process.start()
+        logger.info(f"Trending 子进程已启动: pid={self._process.pid}")
+
+    def messages(self, poll_s: float = 0.2) -> Iterator[Message]:
+        while True:
+            try:
+                msg = self._queue.get(timeout=poll_s)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    # 子进程退出后队列里可能还有残留消息
+                    try:
+                        msg = self._queue.get_nowait()
+                    except queue.Empty:
+                        code = self._process.exitcode
+                        if not self._cancel_event.is_set():
+                            yield "error", None, {"message": f"Trending 子进程异常退出: exitcode={code}"}
+                        return
+                else:
+                    continue
+            yield msg
+            if msg[0] in {"finished", "cancelled"}:
+                return
+
+    def focus(self, since: str, full_names: list[str]) -> None:
+        self._focus_queue.put((since, list(full_names)))
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def join(self, timeout_s: float = 5.0) -> None:
+        self._process.join(timeout_s)
+        if self._process.is_alive():
+            # 正在等待网络请求时无法及时响应取消，超时后直接结束
+            logger.warning("Trending 子进程未在超时内退出，强制结束")
+            self._process.terminate()
+            self._process.join(1.0)
+        for q in (self._queue, self._focus_queue):
+            q.close()
+            q.cancel_join_thread()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from utils.logger import logger
+
+
+# 按命中率排序；raw CDN 区分大小写
+README_NAMES = ("README.md", "readme.md", "Readme.md", "README.rst", "README.markdown", "README")
+DEFAULT_BRANCHES = ("main", "master")
+# 没有记录时只盲猜这几个组合，其余交给 API
+GUESS_LIMIT = 4
+
+
+def raw_base_url() -> str:
+    return (os.environ.get("GITHUB_RAW_BASE_URL") or "https://raw.githubusercontent.com").rstrip("/")
+
+
+def api_base_url() -> str:
+    return (os.environ.get("GITHUB_API_BASE_URL") or "https://api.github.com").rstrip("/")
+
+
+def locations_path() -> Path:
+    from github_trending.trending_service import cache_dir
+
+    # 放在 readme/ 下而不是缓存根目录，避免被当作榜单 payload 扫描
+    return cache_dir() / "readme" / "locations.json"
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) > max_chars:
+        return text[:max_chars] + "\n\n---\n\n_README 过大，已截断显示_"
+    return text
+
+
+class ReadmeLocator:
+    """优先从 raw.githubusercontent.com 获取 README（不占 API 配额），并记住每个仓库的分支与文件名；
+    记录失效或猜测都未命中时才调用 REST API。"""
+
+    def __init__(self, api_session: requests.Session, raw_session: requests.Session):
+        self.api_session = api_session
+        self.raw_session = raw_session
+        self.locations: dict[str, dict[str, str]] = {}
+        self.api_calls = 0
+        self.raw_hits = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        path = locations_path()
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"README 位置记录读取失败: {path} ({e})")
+            return
+        if isinstance(data, dict):
+            self.locations = {k: v for k, v in data.items() if isinstance(v, dict)}
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        from github_trending.trending_service import _atomic_write_json
+
+        _atomic_write_json(locations_path(), self.locations)
+        self._dirty = False
+
+    def _remember(self, full_name: str, branch: str, path: str) -> None:
+        if self.locations.get(full_name) != {"branch": branch, "path": path}:
+            self.locations[full_name] = {"branch": branch, "path": path}
+            self._dirty = True
+
+    def _forget(self, full_name: str) -> None:
+        if self.locations.pop(full_name, None) is not None:
+            self._dirty = True
+
+    def _candidates(self, full_name: str) -> list[tuple[str, str]]:
+        known = self.locations.get(full_name)
+        if known:
+            return [(known["branch"], known["path"])]
+        guesses = [(b, n) for n in README_NAMES for b in DEFAULT_BRANCHES]
+        return guesses[:GUESS_LIMIT]
+
+    def _get_raw(self, full_name: str, branch: str, path: str, timeout_s: int) -> str | None:
+        url = f"{raw_base_url()}/{full_name}/{quote(branch)}/{quote(path)}"
+        resp = self.raw_session.get(url, timeout=timeout_s)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        if "charset" not in resp.headers.get("Content-Type", ""):
+            resp.encoding = "utf-8"
+        return resp.text or ""
+
+    def _get_api(self, full_name: str, timeout_s: int) -> str | None:
+        self.api_calls += 1
+        resp = self.api_session.get(
+            f"{api_base_url()}/repos/{full_name}/readme",
+            headers={"Accept": "application/vnd.github+json"},
+            timeout=timeout_s,
+        )
+        if resp.status_code == 404:
+            logger.info(f"README 不存在: {full_name}")
+            return None
+        if resp.status_code in {403, 429}:
+            remaining = resp.headers.get("X-RateLimit-Remaining")
+            if remaining == "0":
+                raise RuntimeError("GitHub API 限流，请稍后再试或设置 GITHUB_TOKEN")
+            # 二级限流等临时限制交给任务队列稍后重试
+            raise RuntimeError(
+                f"README 获取被限制: {full_name}, status={resp.status_code}, remaining={remaining}"
+            )
+        resp.raise_for_status()
+        data: dict[str, Any] = resp.json()
+        self._learn_from_api(full_name, data)
+        content = str(data.get("content") or "")
+        if data.get("encoding") == "base64":
+            return base64.b64decode(content).decode("utf-8", errors="replace")
+        return content
+
+    def _learn_from_api(self, full_name: str, data: dict[str, Any]) -> None:
+        # download_url 形如 {raw}/{owner}/{repo}/{branch}/{path}；分支名含 "/" 时无法可靠拆分，不记录
+        path = str(data.get("path") or "")
+        download_url = str(data.get("download_url") or "")
+        parts = urlsplit(download_url).path.strip("/").split("/")
+        if path and len(parts) == 4 + path.count("/"):
+            self._remember(full_name, parts[2], path)
+        else:
+            self._forget(full_name)
+
+    def fetch(self, full_name: str, timeout_s: int = 12, max_chars: int = 1_000_000) -> str | None:
+        if not full_name:
+            return None
+        try:
+            for branch, path in self._candidates(full_name):
+                text = self._get_raw(full_name, branch, path, timeout_s)
+                if text is not None:
+                    self.raw_hits += 1
+                    self._remember(full_name, branch, path)
+                    return _truncate(text, max_chars)
+            # 记录的位置已失效（改名、换默认分支）
+            self._forget(full_name)
+        except requests.exceptions.RequestException as e:
+            # 包括 raw 主机熔断（CircuitOpenError）
+            logger.info(f"raw README 获取失败，改用 API: {full_name} ({e})")
+        text = self._get_api(full_name, timeout_s)
+        return _truncate(text, max_chars) if text is not None else None
+
+    def log_stats(self) -> None:
+        if self.raw_hits or self.api_calls:
+            logger.info(f"README 获取统计: raw={self.raw_hits}, api={self.api_calls}")
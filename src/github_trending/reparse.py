@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from utils.logger import logger
+
+
+# 重新解析只刷新这些来自列表页的字段，README 状态与路径保持不变
+LIST_FIELDS = ("rank", "full_name", "url", "language", "stars", "forks", "stars_today", "description")
+
+
+@dataclass
+class ReparseReport:
+    snapshots: int = 0
+    items: int = 0
+    payloads_updated: int = 0
+    payloads_created: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+
+
+def snapshot_files(start: date | str | None = None, end: date | str | None = None) -> list[Path]:
+    from github_trending.trending_service import cache_dir, date_str
+
+    root = cache_dir() / "html"
+    if not root.exists():
+        return []
+    lo = date_str(start) if start is not None else ""
+    hi = date_str(end) if end is not None else "9999-99-99"
+    return sorted(
+        p for p in root.glob("*.html.gz") if lo <= p.name[:10] <= hi
+    )
+
+
+def _parse_snapshot(path_str: str) -> tuple[str, list[dict[str, Any]] | None, str | None]:
+    from github_trending.trending_service import load_trending_snapshot, parse_trending_html
+
+    try:
+        return path_str, parse_trending_html(load_trending_snapshot(path_str)), None
+    except Exception as e:
+        return path_str, None, str(e)
+
+
+def merge_list_items(
+    existing: list[dict[str, Any]], parsed: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    by_name = {str(i.get("full_name") or ""): i for i in existing if isinstance(i, dict)}
+    merged: list[dict[str, Any]] = []
+    for item in parsed:
+        old = by_name.get(str(item.get("full_name") or ""))
+        if old is None:
+            merged.append(item)
+            continue
+        updated = dict(old)
+        for key in LIST_FIELDS:
+            updated[key] = item.get(key)
+        merged.append(updated)
+    return merged
+
+
+def _apply(path: Path, items: list[dict[str, Any]], report: ReparseReport) -> None:
+    from github_trending.cache_migration import _context_from_path
+    from github_trending.trending_service import (
+        SCHEMA_VERSION,
+        TrendingOptions,
+        _all_summaries_done,
+        _atomic_write_text,
+        _load_cached_payload_from_path,
+        _write_payload,
+        build_daily_markdown,
+    )
+
+    json_path = path.parents[1] / (path.name.removesuffix(".html.gz") + ".json")
+    payload = _load_cached_payload_from_path(json_path)
+    if payload is None:
+        ctx = _context_from_path(json_path, {})
+        if ctx is None:
+            report.failed += 1
+            return
+        payload = {
+            "schema_version": SCHEMA_VERSION,
+            "date": ctx.date,
+            "since": ctx.since,
+            "language": ctx.language,
+            "items": [],
+        }
+        report.payloads_created += 1
+    else:
+        report.payloads_updated += 1
+    payload["items"] = merge_list_items(payload.get("items") or [], items)
+    payload["summaries_complete"] = _all_summaries_done(payload["items"], payload.get("date"))
+    _write_payload(json_path, payload)
+    options = TrendingOptions(since=str(payload.get("since") or "daily"), language=payload.get("language"))
+    _atomic_write_text(
+        json_path.with_suffix(".md"),
+        build_daily_markdown(payload.get("date"), options, payload["items"]),
+    )
+
+
+def reparse_snapshots(
+    start: date | str | None = None,
+    end: date | str | None = None,
+    workers: int | None = None,
+    dry_run: bool = False,
+) -> ReparseReport:
+    """离线重新解析页面快照并回写 payload 元数据，不访问网络。"""
+    paths = snapshot_files(start, end)
+    report = ReparseReport(snapshots=len(paths))
+    t0 = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        results = map(_parse_snapshot, map(str, paths))
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(paths) // (workers * 4))
+        results = executor.map(_parse_snapshot, map(str, paths), chunksize=chunksize)
+    try:
+        for path_str, items, error in results:
+            if items is None:
+                logger.warning(f"解析 Trending 快照失败: {path_str} ({error})")
+                report.failed += 1
+                continue
+            report.items += len(items)
+            if not dry_run:
+                _apply(Path(path_str), items, report)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    report.elapsed_s = time.perf_counter() - t0
+    logger.info(
+        f"Trending 快照重新解析完成: snapshots={report.snapshots}, items={report.items}, "
+        f"updated={report.payloads_updated}, created={report.payloads_created}, "
+        f"failed={report.failed}, workers={workers}, elapsed={report.elapsed_s:.2f}s"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="离线重新解析 GitHub Trending 页面快照")
+    parser.add_argument("--from", dest="start", default=None, help="起始日期 YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", default=None, help="结束日期 YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认 CPU 核数")
+    parser.add_argument("--dry-run", action="store_true", help="只解析，不回写 payload")
+    parser.add_argument("--bench", action="store_true", help="对比单进程与进程池的解析耗时")
+    args = parser.parse_args()
+
+    if args.bench:
+        serial = reparse_snapshots(args.start, args.end, workers=1, dry_run=True)
+        pooled = reparse_snapshots(args.start, args.end, workers=args.workers, dry_run=True)
+        n = max(serial.snapshots, 1)
+        print(f"snapshots={serial.snapshots}, items={serial.items}")
+        print(f"serial: {serial.elapsed_s:.2f}s ({serial.elapsed_s / n * 1000:.1f} ms/snapshot)")
+        print(
+            f"pool({args.workers or os.cpu_count()}): {pooled.elapsed_s:.2f}s "
+            f"({pooled.elapsed_s / n * 1000:.1f} ms/snapshot), "
+            f"speedup={serial.elapsed_s / max(pooled.elapsed_s, 1e-9):.1f}x"
+        )
+    else:
+        reparse_snapshots(args.start, args.end, workers=args.workers, dry_run=args.dry_run)
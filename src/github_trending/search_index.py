@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from github_trending.trending_service import CancelCheck
+
+
+INDEX_KINDS = ("readme", "summary")
+MAX_INDEX_CHARS = 200_000
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9_+#-]*|[㐀-鿿豈-﫿]+")
+_CJK_RE = re.compile(r"[㐀-鿿豈-﫿]")
+_write_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    full_name: str
+    kind: str
+    date: str
+    path: str
+    score: float
+
+
+def index_path() -> Path:
+    from github_trending.trending_service import cache_dir
+
+    return cache_dir() / "search_index.sqlite3"
+
+
+def tokenize(text: str) -> list[str]:
+    # 英文按词切分；中文没有空格分词，连续汉字切成二元组
+    tokens: list[str] = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        if _CJK_RE.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+        elif len(word) <= 64:
+            tokens.append(word.strip("-"))
+    return [t for t in tokens if t]
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(index_path(), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS docs (
+            id INTEGER PRIMARY KEY,
+            full_name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            UNIQUE (full_name, kind, digest)
+        );
+        CREATE TABLE IF NOT EXISTS doc_dates (
+            doc_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            path TEXT NOT NULL,
+            PRIMARY KEY (doc_id, date)
+        );
+        CREATE INDEX IF NOT EXISTS doc_dates_path ON doc_dates (path);
+        CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+            tokens, content='', tokenize='unicode61 remove_diacritics 0'
+        );
+        """
+    )
+    return conn
+
+
+@contextmanager
+def _open() -> Iterator[sqlite3.Connection]:
+    conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _full_name_from_path(path: Path) -> str:
+    return path.stem.replace("__", "/", 1)
+
+
+def _index_one(
+    conn: sqlite3.Connection, full_name: str, ds: str, kind: str, path: Path, text: str
+) -> bool:
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    row = conn.execute(
+        "SELECT id FROM docs WHERE full_name = ? AND kind = ? AND digest = ?",
+        (full_name, kind, digest),
+    ).fetchone()
+    created = row is None
+    if created:
+        doc_id = conn.execute(
+            "INSERT INTO docs (full_name, kind, digest) VALUES (?, ?, ?)",
+            (full_name, kind, digest),
+        ).lastrowid
+        tokens = tokenize(full_name.replace("/", " ")) + tokenize(text[:MAX_INDEX_CHARS])
+        conn.execute(
+            "INSERT INTO docs_fts (rowid, tokens) VALUES (?, ?)", (doc_id, " ".join(tokens))
+        )
+    else:
+        doc_id = row[0]
+    conn.execute(
+        "INSERT OR REPLACE INTO doc_dates (doc_id, date, path) VALUES (?, ?, ?)",
+        (doc_id, ds, str(path)),
+    )
+    return created
+
+
+def index_document(
+    full_name: str,
+    d: date | str | None,
+    kind: str,
+    path: Path | str,
+    text: str | None = None,
+) -> None:
+    from github_trending.trending_service import date_str
+
+    if kind not in INDEX_KINDS or not full_name:
+        return
+    path = Path(path)
+    try:
+        if text is None:
+            text = path.read_text(encoding="utf-8")
+        with _write_lock, _open() as conn:
+            _index_one(conn, full_name, date_str(d), kind, path, text)
+    except Exception as e:
+        logger.warning(f"更新搜索索引失败: {full_name}, kind={kind} ({e})")
+
+
+def index_cache(should_cancel: CancelCheck | None = None) -> int:
+    """把缓存中尚未登记的 README 与摘要加入索引；should_cancel 返回 True 时提交已完成的部分后停下"""
+    from github_trending.trending_service import _cancelled, cache_dir, read_cache_text
+
+    roots = {"readme": cache_dir() / "readme", "summary": cache_dir() / "readme_summary"}
+    added = 0
+    t0 = time.perf_counter()
+    with _write_lock, _open() as conn:
+        known = {row[0] for row in conn.execute("SELECT path FROM doc_dates")}
+        for kind, root in roots.items():
+            if not root.exists():
+                continue
+            for date_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+                # 已压缩的 .md.gz 按原 .md 路径登记，读取由 read_cache_text 透明处理
+                names = {p.name.removesuffix(".gz") for p in date_dir.glob("*.md*")}
+                for path in (date_dir / name for name in sorted(names) if name.endswith(".md")):
+                    if str(path) in known:
+                        continue
+                    if _cancelled(should_cancel):
+                        logger.info(f"搜索索引更新已取消: files={added}")
+                        return added
+                    try:
+                        text = read_cache_text(path)
+                    except Exception as e:
+                        logger.warning(f"读取缓存文件失败，跳过索引: {path} ({e})")
+                        continue
+                    if text is None:
+                        continue
+                    _index_one(conn, _full_name_from_path(path), date_dir.name, kind, path, text)
+                    added += 1
+    if added:
+        logger.info(
+            f"搜索索引增量更新完成: files={added}, elapsed={time.perf_counter() - t0:.1f}s"
+        )
+    return added
+
+
+def forget_paths(paths: list[str]) -> None:
+    if not paths or not index_path().exists():
+        return
+    try:
+        with _write_lock, _open() as conn:
+            conn.executemany("DELETE FROM doc_dates WHERE path = ?", [(p,) for p in paths])
+    except Exception as e:
+        logger.warning(f"清理搜索索引失败: {e}")
+
+
+def _match_expr(tokens: list[str], op: str) -> str:
+    return f" {op} ".join('"' + t.replace('"', '""') + '"' for t in tokens)
+
+
+def search(query: str, limit: int = 50) -> list[SearchHit]:
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens or not index_path().exists():
+        return []
+    t0 = time.perf_counter()
+    sql = """
+        SELECT d.full_name, d.kind, dd.date, dd.path, f.rank
+        FROM (
+            SELECT rowid, rank FROM docs_fts WHERE docs_fts MATCH ? ORDER BY rank LIMIT ?
+        ) AS f
+        JOIN docs AS d ON d.id = f.rowid
+        JOIN doc_dates AS dd ON dd.doc_id = d.id
+        ORDER BY f.rank, dd.date DESC
+    """
+    hits: dict[str, SearchHit] = {}
+    with _open() as conn:
+        for op in ("AND", "OR"):
+            rows = conn.execute(sql, (_match_expr(tokens, op), limit * 4)).fetchall()
+            for full_name, kind, ds, path, rank in rows:
+                # 同一仓库只保留得分最高、日期最新的一条；摘要优先于原始 README
+                hit = SearchHit(full_name, kind, ds, path, -float(rank))
+                best = hits.get(full_name)
+                if best is None or (hit.score, hit.kind == "summary", hit.date) > (
+                    best.score,
+                    best.kind == "summary",
+                    best.date,
+                ):
+                    hits[full_name] = hit
+            if hits or len(tokens) == 1:
+                break
+    result = sorted(hits.values(), key=lambda h: (-h.score, h.full_name))[:limit]
+    logger.debug(
+        f"搜索完成: query={query!r}, hits={len(result)}, elapsed={(time.perf_counter() - t0) * 1000:.1f}ms"
+    )
+    return result
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from github_trending.trending_service import CancelCheck
+    from utils.openai_llm import OpenAISettings
+
+
+INDEX_VERSION = 1
+EMBED_BATCH_SIZE = 64
+MAX_EMBED_CHARS = 8000
+
+
+@dataclass(frozen=True)
+class SimilarRepo:
+    full_name: str
+    date: str
+    path: str
+    score: float
+
+
+def embeddings_dir() -> Path:
+    from github_trending.trending_service import cache_dir
+
+    path = cache_dir() / "embeddings"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SimilarityIndex:
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root is not None else embeddings_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._meta = self._load_meta()
+        # entries.jsonl 中已提交的字节数；崩溃可能在其后留下未写入 meta 的条目
+        self._entries_end = 0
+        self._entries: list[dict[str, str]] = self._load_entries()
+        self._by_digest: dict[str, int] = {}
+        self._latest: dict[str, int] = {}
+        # 正在计算 embedding、尚未写入的摘要；与 _by_digest 一起在 _lock 下检查，避免重复追加
+        self._reserved: set[str] = set()
+        for i, entry in enumerate(self._entries):
+            self._track(i, entry)
+        self._matrix: np.ndarray | None = None
+
+    @property
+    def rows(self) -> int:
+        return int(self._meta["rows"])
+
+    def _track(self, row: int, entry: dict[str, str]) -> None:
+        self._by_digest[entry["digest"]] = row
+        latest = self._latest.get(entry["full_name"])
+        if latest is None or entry["date"] >= self._entries[latest]["date"]:
+            self._latest[entry["full_name"]] = row
+
+    def _meta_path(self) -> Path:
+        return self.root / "meta.json"
+
+    def _vectors_path(self) -> Path:
+        return self.root / "vectors.f32"
+
+    def _entries_path(self) -> Path:
+        return self.root / "entries.jsonl"
+
+    def _empty_meta(self) -> dict[str, Any]:
+        return {"version": INDEX_VERSION, "model": None, "dim": 0, "rows": 0}
+
+    def _load_meta(self) -> dict[str, Any]:
+        try:
+            meta = json.loads(self._meta_path().read_text(encoding="utf-8"))
+            if isinstance(meta, dict) and meta.get("version") == INDEX_VERSION:
+                return meta
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"读取相似度索引元数据失败，重新建库: {e}")
+        self._reset_files()
+        return self._empty_meta()
+
+    def _reset_files(self) -> None:
+        self._vectors_path().unlink(missing_ok=True)
+        self._entries_path().unlink(missing_ok=True)
+
+    def _load_entries(self) -> list[dict[str, str]]:
+        entries: list[dict[str, str]] = []
+        try:
+            with open(self._entries_path(), "rb") as f:
+                for line in f:
+                    if len(entries) >= self.rows or not line.endswith(b"\n"):
+                        break
+                    entries.append(json.loads(line))
+                    self._entries_end += len(line)
+        except FileNotFoundError:
+            pass
+        if len(entries) < self.rows:
+            logger.warning(
+                f"相似度索引条目不完整，按条目数截断: entries={len(entries)}, rows={self.rows}"
+            )
+            self._meta["rows"] = len(entries)
+        return entries
+
+    def _save_meta(self) -> None:
+        from github_trending.trending_service import _atomic_write_text
+
+        _atomic_write_text(self._meta_path(), json.dumps(self._meta))
+
+    def matrix(self) -> np.ndarray:
+        with self._lock:
+            rows, dim = self.rows, int(self._meta["dim"])
+            if rows == 0:
+                return np.zeros((0, dim), dtype=np.float32)
+            if self._matrix is None or self._matrix.shape[0] != rows:
+                self._matrix = np.memmap(
+                    self._vectors_path(), dtype=np.float32, mode="r", shape=(rows, dim)
+                )
+            return self._matrix
+
+    def _append(self, vectors: np.ndarray, entries: list[dict[str, str]], model: str) -> None:
+        dim = vectors.shape[1]
+        with self._lock:
+            if self._meta["model"] not in (None, model) or self._meta["dim"] not in (0, dim):
+                logger.info(
+                    f"Embedding 模型变化，重建相似度索引: {self._meta['model']} -> {model}"
+                )
+                self._reset_files()
+                self._meta = self._empty_meta()
+                self._entries = []
+                self._entries_end = 0
+                self._by_digest = {}
+                self._latest = {}
+            self._meta["model"] = model
+            self._meta["dim"] = dim
+            # 两个文件都截断到已提交的行数再追加，已有矩阵无需重建
+            with open(self._vectors_path(), "ab") as f:
+                f.truncate(self.rows * dim * 4)
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+            data = data.encode("utf-8")
+            with open(self._entries_path(), "ab") as f:
+                f.truncate(self._entries_end)
+                f.write(data)
+            self._entries_end += len(data)
+            for entry in entries:
+                self._entries.append(entry)
+                self._track(len(self._entries) - 1, entry)
+            self._meta["rows"] = len(self._entries)
+            self._matrix = None
+            self._save_meta()
+
+    def add_summaries(
+        self,
+        docs: list[tuple[str, str, str, str]],
+        should_cancel: CancelCheck | None = None,
+    ) -> int:
+        """docs 为 (full_name, date, path, text)，按内容哈希去重后批量计算 embedding。
+
+        should_cancel 返回 True 时在批次之间停下，已写入的批次保留。
+        """
+        from utils.openai_llm import get_openai_settings
+
+        settings = get_openai_settings()
+        if not settings.api_key:
+            return 0
+        pending: dict[str, tuple[str, str, str, str]] = {}
+        for full_name, ds, path, text in docs:
+            text = (text or "").strip()
+            if not text or not full_name:
+                continue
+            pending.setdefault(_digest(f"{full_name}\n{text}"), (full_name, ds, path, text))
+        with self._lock:
+            pending = {
+                digest: doc
+                for digest, doc in pending.items()
+                if digest not in self._by_digest and digest not in self._reserved
+            }
+            self._reserved.update(pending)
+        try:
+            return self._embed_pending(pending, settings, should_cancel)
+        finally:
+            # 写入后已在 _by_digest 中；失败的条目释放后可由下次调用重试
+            with self._lock:
+                self._reserved.difference_update(pending)
+
+    def _embed_pending(
+        self,
+        pending: dict[str, tuple[str, str, str, str]],
+        settings: OpenAISettings,
+        should_cancel: CancelCheck | None = None,
+    ) -> int:
+        from github_trending.trending_service import _cancelled
+        from utils.openai_llm import embeddings
+
+        added = 0
+        batch = list(pending.items())
+        for start in range(0, len(batch), EMBED_BATCH_SIZE):
+            if _cancelled(should_cancel):
+                break
+            chunk = batch[start : start + EMBED_BATCH_SIZE]
+            vectors = np.asarray(
+                embeddings(
+                    [f"{name}\n{text[:MAX_EMBED_CHARS]}" for _, (name, _, _, text) in chunk],
+                    model=settings.embedding_model,
+                ),
+                dtype=np.float32,
+            )
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.maximum(norms, 1e-12)
+            entries = [
+                {"digest": digest, "full_name": name, "date": ds, "path": path}
+                for digest, (name, ds, path, _) in chunk
+            ]
+            self._append(vectors, entries, settings.embedding_model)
+            added += len(chunk)
+        if added:
+            logger.info(f"相似度索引追加: rows_added={added}, rows={self.rows}")
+        return added
+
+    def similar(self, full_name: str, k: int = 10) -> list[SimilarRepo]:
+        row = self._latest.get(full_name)
+        if row is None:
+            return []
+        mat = self.matrix()
+        return self.similar_to_vector(np.asarray(mat[row]), k, exclude=full_name)
+
+    def similar_to_vector(
+        self, vector: np.ndarray, k: int = 10, exclude: str | None = None
+    ) -> list[SimilarRepo]:
+        mat = self.matrix()
+        if mat.shape[0] == 0:
+            return []
+        scores = mat @ np.asarray(vector, dtype=np.float32)
+        # 同一仓库可能有多行（摘要更新过），多取一些候选再按仓库去重
+        want = min(scores.size, k * 4 + 1)
+        top = np.argpartition(-scores, want - 1)[:want]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        result: list[SimilarRepo] = []
+        seen = {exclude} if exclude else set()
+        for i in top:
+            entry = self._entries[int(i)]
+            if entry["full_name"] in seen:
+                continue
+            seen.add(entry["full_name"])
+            result.append(
+                SimilarRepo(entry["full_name"], entry["date"], entry["path"], float(scores[i]))
+            )
+            if len(result) >= k:
+                break
+        return result
+
+
+_index: SimilarityIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimilarityIndex()
+        return _index
+
+
+def index_summaries(docs: list[tuple[str, str, str, str]]) -> None:
+    try:
+        get_similarity_index().add_summaries(docs)
+    except Exception as e:
+        logger.warning(f"更新相似度索引失败: {e}")
+
+
+def index_cache_summaries(should_cancel: CancelCheck | None = None) -> int:
+    from github_trending.trending_service import cache_dir
+
+    root = cache_dir() / "readme_summary"
+    if not root.exists():
+        return 0
+    docs: list[tuple[str, str, str, str]] = []
+    for date_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        for path in sorted(date_dir.glob("*.md")):
+            try:
+                text = path.read_text(encoding="utf-8")
+            except Exception:
+                continue
+            docs.append((path.stem.replace("__", "/", 1), date_dir.name, str(path), text))
+    return get_similarity_index().add_summaries(docs, should_cancel)
+
+
+def similar_repos(full_name: str, k: int = 10) -> list[SimilarRepo]:
+    return get_similarity_index().similar(full_name, k)
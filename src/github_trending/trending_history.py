@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from utils.logger import logger
+
+
+HISTORY_VERSION = 1
+PERIOD_CODES = {"daily": 0, "weekly": 1, "monthly": 2}
+MISSING = -1
+
+# 每列一个定长二进制文件，行号即记录号；只追加，读取时按 meta 中的行数做内存映射
+COLUMNS: dict[str, np.dtype] = {
+    "day": np.dtype("<i4"),
+    "period": np.dtype("<i1"),
+    "repo": np.dtype("<i4"),
+    "rank": np.dtype("<i2"),
+    "stars": np.dtype("<i4"),
+    "forks": np.dtype("<i4"),
+    "stars_today": np.dtype("<i4"),
+}
+
+
+def history_dir() -> Path:
+    from github_trending.trending_service import cache_dir
+
+    path = cache_dir() / "history"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _day_number(d: date | str) -> int:
+    if isinstance(d, str):
+        d = datetime.strptime(d, "%Y-%m-%d").date()
+    return d.toordinal()
+
+
+def _day_str(n: int) -> str:
+    return date.fromordinal(int(n)).strftime("%Y-%m-%d")
+
+
+def _int_or_missing(v: Any) -> int:
+    return v if isinstance(v, int) and not isinstance(v, bool) else MISSING
+
+
+@dataclass(frozen=True)
+class HistoryColumns:
+    day: np.ndarray
+    period: np.ndarray
+    repo: np.ndarray
+    rank: np.ndarray
+    stars: np.ndarray
+    forks: np.ndarray
+    stars_today: np.ndarray
+
+
+class TrendingHistory:
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root is not None else history_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._meta = self._load_meta()
+        self._repo_ids = {name: i for i, name in enumerate(self._meta["repos"])}
+        self._ingested = set(self._meta["ingested"])
+
+    @property
+    def rows(self) -> int:
+        return int(self._meta["rows"])
+
+    @property
+    def repos(self) -> list[str]:
+        return self._meta["repos"]
+
+    def _meta_path(self) -> Path:
+        return self.root / "meta.json"
+
+    def _column_path(self, name: str) -> Path:
+        return self.root / f"{name}.bin"
+
+    def _load_meta(self) -> dict[str, Any]:
+        meta_path = self._meta_path()
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                if isinstance(meta, dict) and meta.get("version") == HISTORY_VERSION:
+                    return meta
+                logger.warning(f"Trending 历史库版本不匹配，重新建库: {meta_path}")
+            except Exception as e:
+                logger.warning(f"读取 Trending 历史库元数据失败，重新建库: {meta_path} ({e})")
+        for name in COLUMNS:
+            self._column_path(name).unlink(missing_ok=True)
+        return {
+            "version": HISTORY_VERSION,
+            "rows": 0,
+            "backfilled": False,
+            "repos": [],
+            "ingested": [],
+        }
+
+    def _save_meta(self) -> None:
+        from github_trending.trending_service import _atomic_write_text
+
+        self._meta["ingested"] = sorted(self._ingested)
+        _atomic_write_text(self._meta_path(), json.dumps(self._meta, ensure_ascii=False))
+
+    def _repo_id(self, full_name: str) -> int:
+        repo_id = self._repo_ids.get(full_name)
+        if repo_id is None:
+            repo_id = len(self._meta["repos"])
+            self._meta["repos"].append(full_name)
+            self._repo_ids[full_name] = repo_id
+        return repo_id
+
+    def has_snapshot(self, ds: str, since: str) -> bool:
+        return f"{ds}__{since}" in self._ingested
+
+    def append_payload(self, payload: dict[str, Any]) -> int:
+        ds = payload.get("date")
+        since = str(payload.get("since") or "daily")
+        items = payload.get("items")
+        if not isinstance(ds, str) or since not in PERIOD_CODES or not isinstance(items, list):
+            return 0
+        if payload.get("language"):
+            # 仅记录全语言榜单，按语言过滤的榜单排名不可比
+            return 0
+        key = f"{ds}__{since}"
+        with self._lock:
+            if key in self._ingested:
+                return 0
+            rows = [
+                item
+                for item in items
+                if isinstance(item, dict) and str(item.get("full_name") or "")
+            ]
+            n = len(rows)
+            if n:
+                block = {
+                    "day": np.full(n, _day_number(ds), dtype=COLUMNS["day"]),
+                    "period": np.full(n, PERIOD_CODES[since], dtype=COLUMNS["period"]),
+                    "repo": np.fromiter(
+                        (self._repo_id(str(item["full_name"])) for item in rows),
+                        dtype=COLUMNS["repo"],
+                        count=n,
+                    ),
+                }
+                for name in ("rank", "stars", "forks", "stars_today"):
+                    block[name] = np.fromiter(
+                        (_int_or_missing(item.get(name)) for item in rows),
+                        dtype=COLUMNS[name],
+                        count=n,
+                    )
+                self._append_block(block)
+            self._ingested.add(key)
+            self._meta["rows"] = self.rows + n
+            self._save_meta()
+            return n
+
+    def _append_block(self, block: dict[str, np.ndarray]) -> None:
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            # 先截断到已提交行数，丢弃上次中断时写了一半的尾部
+            with open(path, "ab") as f:
+                f.truncate(self.rows * dtype.itemsize)
+                f.write(block[name].tobytes())
+
+    def columns(self) -> HistoryColumns:
+        with self._lock:
+            rows = self.rows
+        arrays: dict[str, np.ndarray] = {}
+        for name, dtype in COLUMNS.items():
+            if rows == 0:
+                arrays[name] = np.empty(0, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    self._column_path(name), dtype=dtype, mode="r", shape=(rows,)
+                )
+        return HistoryColumns(**arrays)
+
+    def _window(
+        self,
+        cols: HistoryColumns,
+        since: str,
+        days: int,
+        end: date | str | None,
+    ) -> np.ndarray:
+        if cols.day.size == 0:
+            return np.zeros(0, dtype=bool)
+        end_day = int(cols.day.max()) if end is None else _day_number(end)
+        mask = cols.period == PERIOD_CODES.get(since, 0)
+        mask &= cols.day > end_day - days
+        mask &= cols.day <= end_day
+        return mask
+
+    def _first_last(
+        self, cols: HistoryColumns, mask: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        order = idx[np.lexsort((cols.day[idx], cols.repo[idx]))]
+        repo_sorted = cols.repo[order]
+        starts = np.flatnonzero(np.r_[True, repo_sorted[1:] != repo_sorted[:-1]])
+        ends = np.r_[starts[1:] - 1, order.size - 1]
+        return repo_sorted[starts], order[starts], order[ends]
+
+    def _top(
+        self, repo_ids: np.ndarray, values: np.ndarray, limit: int
+    ) -> list[tuple[str, float]]:
+        if values.size == 0 or limit <= 0:
+            return []
+        if values.size > limit:
+            picked = np.argpartition(-values, limit - 1)[:limit]
+        else:
+            picked = np.arange(values.size)
+        picked = picked[np.argsort(-values[picked], kind="stable")]
+        names = self.repos
+        return [(names[int(repo_ids[i])], float(values[i])) for i in picked]
+
+    def star_velocity(
+        self,
+        since: str = "daily",
+        days: int = 30,
+        end: date | str | None = None,
+        limit: int = 20,
+    ) -> list[tuple[str, float]]:
+        """窗口内 stars 日均增量，至少需要两天的观测。"""
+        cols = self.columns()
+        mask = self._window(cols, since, days, end) & (cols.stars >= 0)
+        repo_ids, first, last = self._first_last(cols, mask)
+        span = cols.day[last].astype(np.int64) - cols.day[first]
+        keep = span > 0
+        gained = cols.stars[last].astype(np.int64) - cols.stars[first]
+        velocity = gained[keep] / span[keep]
+        return self._top(repo_ids[keep], velocity, limit)
+
+    def days_on_list(
+        self,
+        since: str = "daily",
+        days: int = 30,
+        end: date | str | None = None,
+        limit: int = 20,
+    ) -> list[tuple[str, float]]:
+        cols = self.columns()
+        mask = self._window(cols, since, days, end)
+        counts = np.bincount(cols.repo[mask], minlength=len(self.repos))
+        repo_ids = np.flatnonzero(counts)
+        return self._top(repo_ids, counts[repo_ids].astype(np.float64), limit)
+
+    def rank_deltas(
+        self,
+        since: str = "daily",
+        days: int = 30,
+        end: date | str | None = None,
+        limit: int = 20,
+    ) -> list[tuple[str, float]]:
+        """首次与最近一次上榜的排名差，正数表示名次上升。"""
+        cols = self.columns()
+        mask = self._window(cols, since, days, end) & (cols.rank > 0)
+        repo_ids, first, last = self._first_last(cols, mask)
+        keep = first != last
+        delta = cols.rank[first].astype(np.int64) - cols.rank[last]
+        return self._top(repo_ids[keep], delta[keep].astype(np.float64), limit)
+
+    def rising_repos(
+        self,
+        since: str = "daily",
+        days: int = 30,
+        end: date | str | None = None,
+        limit: int = 10,
+    ) -> list[tuple[str, float]]:
+        return [
+            (name, delta)
+            for name, delta in self.rank_deltas(since, days, end, limit)
+            if delta > 0
+        ]
+
+    def repo_series(self, full_name: str, since: str = "daily") -> list[dict[str, Any]]:
+        repo_id = self._repo_ids.get(full_name)
+        if repo_id is None:
+            return []
+        cols = self.columns()
+        idx = np.flatnonzero((cols.repo == repo_id) & (cols.period == PERIOD_CODES[since]))
+        idx = idx[np.argsort(cols.day[idx], kind="stable")]
+        return [
+            {
+                "date": _day_str(cols.day[i]),
+                "rank": int(cols.rank[i]),
+                "stars": int(cols.stars[i]),
+                "forks": int(cols.forks[i]),
+                "stars_today": int(cols.stars_today[i]),
+            }
+            for i in idx
+        ]
+
+    def backfill(self, cache_root: Path | None = None) -> int:
+        from github_trending.trending_service import _load_cached_payload_from_path, cache_dir
+
+        root = cache_root or cache_dir()
+        added = 0
+        for json_path in sorted(root.glob("*.json")):
+            payload = _load_cached_payload_from_path(json_path)
+            if not payload:
+                continue
+            if not payload.get("since"):
+                payload = dict(payload, since="daily")
+            added += self.append_payload(payload)
+        with self._lock:
+            self._meta["backfilled"] = True
+            self._save_meta()
+        logger.info(f"Trending 历史库回填完成: rows_added={added}, rows={self.rows}")
+        return added
+
+
+_history: TrendingHistory | None = None
+_history_lock = threading.Lock()
+
+
+def get_history() -> TrendingHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = TrendingHistory()
+        return _history
+
+
+def record_payload(payload: dict[str, Any]) -> None:
+    try:
+        history = get_history()
+        if not history._meta.get("backfilled"):
+            history.backfill()
+        added = history.append_payload(payload)
+        if added:
+            logger.info(
+                f"Trending 历史库追加: date={payload.get('date')}, since={payload.get('since')}, rows={added}"
+            )
+    except Exception as e:
+        logger.warning(f"写入 Trending 历史库失败: {e}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="GitHub Trending 历史库")
+    parser.add_argument("command", choices=["backfill", "rising", "velocity", "days"])
+    parser.add_argument("--since", default="daily", choices=sorted(PERIOD_CODES))
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    history = get_history()
+    if args.command == "backfill":
+        history.backfill()
+    else:
+        query = {
+            "rising": history.rising_repos,
+            "velocity": history.star_velocity,
+            "days": history.days_on_list,
+        }[args.command]
+        t0 = time.perf_counter()
+        result = query(since=args.since, days=args.days, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        for name, value in result:
+            print(f"{value:>10.2f}  {name}")
+        print(f"rows={history.rows}, elapsed={elapsed_ms:.2f} ms")
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+META_FIELDS = (
+    "rank",
+    "full_name",
+    "url",
+    "language",
+    "stars",
+    "forks",
+    "stars_today",
+    "description",
+    "readme_source",
+)
+PATH_FIELDS = ("readme_raw_path", "readme_path", "readme_html_path")
+# 旧版 payload 中内联的正文字段，内容与 README 文件重复
+BODY_FIELDS = ("readme_md", "readme_html", "readme_html_page", "readme")
+
+
+def _opt_int(v: Any) -> int | None:
+    return v if isinstance(v, int) and not isinstance(v, bool) else None
+
+
+def _opt_str(v: Any) -> str | None:
+    return v if isinstance(v, str) and v else None
+
+
+def compact_item_dict(item: dict[str, Any]) -> dict[str, Any]:
+    compact = {k: v for k, v in item.items() if k not in BODY_FIELDS}
+    # 没有摘要文件的旧条目只能保留内联摘要，否则会丢失内容
+    readme_md = item.get("readme_md")
+    if not item.get("readme_path") and isinstance(readme_md, str) and readme_md.strip():
+        compact["readme_md"] = readme_md
+    return compact
+
+
+class TrendingItem:
+    __slots__ = META_FIELDS + PATH_FIELDS + ("readme_md", "readme_page")
+
+    def __init__(
+        self,
+        full_name: str = "",
+        *,
+        rank: int | None = None,
+        url: str = "",
+        language: str = "",
+        stars: int | None = None,
+        forks: int | None = None,
+        stars_today: int | None = None,
+        description: str = "",
+        readme_source: str = "none",
+        readme_raw_path: str | None = None,
+        readme_path: str | None = None,
+        readme_html_path: str | None = None,
+        readme_md: str | None = None,
+        readme_page: str | None = None,
+    ):
+        self.rank = rank
+        self.full_name = full_name
+        self.url = url
+        self.language = language
+        self.stars = stars
+        self.forks = forks
+        self.stars_today = stars_today
+        self.description = description
+        self.readme_source = readme_source
+        self.readme_raw_path = readme_raw_path
+        self.readme_path = readme_path
+        self.readme_html_path = readme_html_path
+        self.readme_md = readme_md
+        self.readme_page = readme_page
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TrendingItem":
+        readme_path = _opt_str(data.get("readme_path"))
+        readme_raw_path = _opt_str(data.get("readme_raw_path"))
+        readme_md = None
+        readme_page = None
+        if not readme_path:
+            readme_md = _opt_str(data.get("readme_md"))
+            if not readme_md and not readme_raw_path:
+                readme_page = _opt_str(data.get("readme"))
+        return cls(
+            str(data.get("full_name") or ""),
+            rank=_opt_int(data.get("rank")),
+            url=str(data.get("url") or ""),
+            language=str(data.get("language") or ""),
+            stars=_opt_int(data.get("stars")),
+            forks=_opt_int(data.get("forks")),
+            stars_today=_opt_int(data.get("stars_today")),
+            description=str(data.get("description") or ""),
+            readme_source=str(data.get("readme_source") or "none"),
+            readme_raw_path=readme_raw_path,
+            readme_path=readme_path,
+            readme_html_path=_opt_str(data.get("readme_html_path")),
+            readme_md=readme_md,
+            readme_page=readme_page,
+        )
+
+    @classmethod
+    def coerce(cls, item: "TrendingItem | dict[str, Any]") -> "TrendingItem":
+        return item if isinstance(item, TrendingItem) else cls.from_dict(item)
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {name: getattr(self, name) for name in META_FIELDS}
+        for name in PATH_FIELDS:
+            value = getattr(self, name)
+            if value:
+                data[name] = value
+        if self.readme_md and not self.readme_path:
+            data["readme_md"] = self.readme_md
+        return data
+
+    @property
+    def display_name(self) -> str:
+        full_name = self.full_name
+        return (full_name.split("/")[-1] if "/" in full_name else full_name) or "unknown"
+
+    def _load(self, path: str | None) -> str | None:
+        from github_trending.trending_service import read_cache_text
+
+        if not path:
+            return None
+        try:
+            text = read_cache_text(path)
+        except Exception:
+            return None
+        return text if text and text.strip() else None
+
+    def load_summary(self) -> str | None:
+        return self._load(self.readme_path) or self.readme_md
+
+    def load_raw(self) -> str | None:
+        return self._load(self.readme_raw_path)
+
+    def load_html(self) -> str | None:
+        return self._load(self.readme_html_path)
+
+    def __repr__(self) -> str:
+        return f"TrendingItem({self.full_name!r}, rank={self.rank!r}, source={self.readme_source!r})"
@@ -1,23 +1,38 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import re
+import time
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import requests
 from bs4 import BeautifulSoup
 
+from github_trending.readme_locator import ReadmeLocator, api_base_url
+from github_trending.trending_item import BODY_FIELDS, TrendingItem, compact_item_dict
+from utils.http_client import CircuitOpenError
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    from github_trending.job_queue import Job
+
 
 TRENDING_URL = "https://github.com/trending"
-SCHEMA_VERSION = 5
+SCHEMA_VERSION = 6
 VALID_SINCE_VALUES = {"daily", "weekly", "monthly"}
 
+# progress(event, data)：event 为 list_parsed / readme_fetched / summary_ready，data 只含可 pickle 的基本类型
+ProgressCallback = Callable[[str, dict[str, Any]], None]
+CancelCheck = Callable[[], bool]
+# 返回应优先处理的仓库 full_name（按优先级排序），每处理一个条目前查询一次
+PriorityHint = Callable[[], list[str]]
+
 
 @dataclass(frozen=True)
 class TrendingOptions:
@@ -25,6 +40,40 @@ class TrendingOptions:
     language: str | None = None
 
 
+class PipelineCancelled(Exception):
+    pass
+
+
+def _cancelled(should_cancel: CancelCheck | None) -> bool:
+    return should_cancel is not None and should_cancel()
+
+
+def _by_priority(
+    pending: list[dict[str, Any]], priority: PriorityHint | None
+) -> Iterator[dict[str, Any]]:
+    # 默认按排名顺序；用户正在查看的仓库及其相邻条目插队
+    remaining = list(pending)
+    while remaining:
+        idx = 0
+        wanted = priority() if priority is not None else None
+        if wanted:
+            positions = {str(item.get("full_name") or ""): i for i, item in enumerate(remaining)}
+            for name in wanted:
+                if name in positions:
+                    idx = positions[name]
+                    break
+        yield remaining.pop(idx)
+
+
+def _notify(progress: ProgressCallback | None, event: str, data: dict[str, Any]) -> None:
+    if progress is None:
+        return
+    try:
+        progress(event, data)
+    except Exception as e:
+        logger.debug(f"Trending 进度回调失败: {event} ({e})")
+
+
 def normalize_since(since: str | None) -> str:
     s = (since or "").strip().lower()
     if s in VALID_SINCE_VALUES:
@@ -72,6 +121,28 @@ def daily_cache_paths(
     return md_path, json_path
 
 
+def snapshot_path(d: date | str | None = None, options: TrendingOptions | None = None) -> Path:
+    path = cache_dir() / "html"
+    path.mkdir(parents=True, exist_ok=True)
+    return path / f"{_cache_stem(d, options)}.html.gz"
+
+
+def archive_trending_html(
+    html: str, d: date | str | None = None, options: TrendingOptions | None = None
+) -> Path:
+    path = snapshot_path(d, options)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+        f.write(html)
+    tmp_path.replace(path)
+    return path
+
+
+def load_trending_snapshot(path: Path | str) -> str:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
 def daily_readme_dir(d: date | str | None = None) -> Path:
     ds = date_str(d)
     path = cache_dir() / "readme" / ds
@@ -108,16 +179,47 @@ def repo_readme_html_path(full_name: str, d: date | str | None = None) -> Path:
     return daily_readme_html_dir(d) / f"{safe}.html"
 
 
+def compressed_path(path: Path | str) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + ".gz")
+
+
+def cached_file_exists(path: Path | str) -> bool:
+    p = Path(path)
+    return p.exists() or compressed_path(p).exists()
+
+
+def read_cache_text(path: Path | str) -> str | None:
+    # 冷数据可能已被缓存维护压缩为同名 .gz，这里对调用方透明
+    p = Path(path)
+    try:
+        return p.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+    try:
+        with gzip.open(compressed_path(p), "rt", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
 def _load_cached_payload_from_path(json_path: Path) -> dict[str, Any] | None:
     if not json_path.exists():
         return None
     try:
         payload = json.loads(json_path.read_text(encoding="utf-8"))
-        if isinstance(payload, dict):
-            return payload
     except Exception as e:
         logger.warning(f"Failed to load trending cache: {json_path} ({e})")
-    return None
+        return None
+    if not isinstance(payload, dict):
+        return None
+    version = payload.get("schema_version")
+    if not isinstance(version, int) or version < SCHEMA_VERSION:
+        from github_trending.cache_migration import upgrade_cached_payload
+
+        # 旧版本缓存就地升级，避免因版本号变化重新抓取和总结
+        return upgrade_cached_payload(payload, json_path) or payload
+    return payload
 
 
 def load_cached_payload(
@@ -176,6 +278,14 @@ def _atomic_write_json(path: Path, data: dict[str, Any]) -> None:
     _atomic_write_text(path, text + "\n")
 
 
+def _write_payload(path: Path, payload: dict[str, Any]) -> None:
+    # 正文只存在 README 文件中，payload 仅保留元数据与路径引用
+    items = payload.get("items")
+    if isinstance(items, list):
+        payload = dict(payload, items=[compact_item_dict(i) for i in items])
+    _atomic_write_json(path, payload)
+
+
 def load_cached_items(
     d: date | str | None = None, options: TrendingOptions | None = None
 ) -> list[dict[str, Any]] | None:
@@ -213,11 +323,17 @@ def summaries_complete(d: date | str | None = None, options: TrendingOptions | N
     return True
 
 
-def load_latest_cached_items() -> list[dict[str, Any]] | None:
-    candidates = sorted(cache_dir().glob("*.json"), reverse=True)
+def load_latest_cached_items(options: TrendingOptions | None = None) -> list[dict[str, Any]] | None:
+    pattern = "*.json"
+    if options is not None:
+        # 只取同一周期 / 语言的最近一次缓存
+        pattern = "????-??-??__" + _cache_stem(None, options).split("__", 1)[1] + ".json"
+    candidates = sorted(cache_dir().glob(pattern), reverse=True)
     for json_path in candidates:
         try:
-            payload = json.loads(json_path.read_text(encoding="utf-8"))
+            payload = _load_cached_payload_from_path(json_path)
+            if not payload:
+                continue
             version = payload.get("schema_version")
             if not isinstance(version, int) or version < SCHEMA_VERSION:
                 continue
@@ -229,7 +345,25 @@ def load_latest_cached_items() -> list[dict[str, Any]] | None:
     return None
 
 
-def build_repo_markdown(item: dict[str, Any]) -> str:
+def load_cached_item_models(
+    d: date | str | None = None, options: TrendingOptions | None = None
+) -> list[TrendingItem] | None:
+    items = load_cached_items(d, options)
+    if items is None:
+        return None
+    return [TrendingItem.from_dict(i) for i in items if isinstance(i, dict)]
+
+
+def load_latest_cached_item_models(
+    options: TrendingOptions | None = None,
+) -> list[TrendingItem] | None:
+    items = load_latest_cached_items(options)
+    if items is None:
+        return None
+    return [TrendingItem.from_dict(i) for i in items if isinstance(i, dict)]
+
+
+def build_repo_markdown(item: dict[str, Any], readme_md: str | None = None) -> str:
     full_name = str(item.get("full_name") or "")
     url = str(item.get("url") or "")
     description = str(item.get("description") or "")
@@ -237,7 +371,10 @@ def build_repo_markdown(item: dict[str, Any]) -> str:
     stars = item.get("stars")
     forks = item.get("forks")
     stars_today = item.get("stars_today")
-    readme_md = item.get("readme_md")
+    if readme_md is None:
+        readme_md = item.get("readme_md")
+    if readme_md is None and item.get("readme_path"):
+        readme_md = read_cache_text(str(item.get("readme_path")))
 
     lines: list[str] = []
     if full_name:
@@ -408,57 +545,20 @@ def parse_trending_html(html: str) -> list[dict[str, Any]]:
             "forks": forks,
             "stars_today": stars_today,
             "description": description,
-            "readme_md": None,
-            "readme_html": None,
             "readme_source": "none",
         }
-        item["readme"] = build_repo_markdown(item)
         items.append(item)
     return items
 
 
 def _build_github_session() -> requests.Session:
-    session = requests.Session()
-    headers = {
-        "User-Agent": "miniDeskKit/0.1",
-    }
+    from utils.http_client import get_session
+
+    headers = {"User-Agent": "miniDeskKit/0.1"}
     token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    session.headers.update(headers)
-    return session
-
-
-def fetch_repo_readme_md(
-    session: requests.Session,
-    full_name: str,
-    timeout_s: int = 12,
-    max_chars: int = 1_000_000,
-) -> str | None:
-    if not full_name:
-        return None
-    api_url = f"https://api.github.com/repos/{full_name}/readme"
-    resp = session.get(
-        api_url,
-        headers={"Accept": "application/vnd.github.v3.raw"},
-        timeout=timeout_s,
-    )
-    if resp.status_code == 404:
-        logger.info(f"README 不存在: {full_name}")
-        return None
-    if resp.status_code in {403, 429}:
-        remaining = resp.headers.get("X-RateLimit-Remaining")
-        if remaining == "0":
-            raise RuntimeError("GitHub API 限流，请稍后再试或设置 GITHUB_TOKEN")
-        logger.warning(
-            f"README 获取被限制: {full_name}, status={resp.status_code}, remaining={remaining}"
-        )
-        return None
-    resp.raise_for_status()
-    text = resp.text or ""
-    if len(text) > max_chars:
-        return text[:max_chars] + "\n\n---\n\n_README 过大，已截断显示_"
-    return text
+    return get_session("github_api", headers)
 
 
 def render_markdown_to_html(
@@ -470,7 +570,7 @@ def render_markdown_to_html(
 ) -> str | None:
     if not markdown_text.strip():
         return None
-    api_url = "https://api.github.com/markdown"
+    api_url = f"{api_base_url()}/markdown"
     payload = {"text": markdown_text, "mode": "gfm", "context": context}
     resp = session.post(
         api_url,
@@ -482,10 +582,9 @@ def render_markdown_to_html(
         remaining = resp.headers.get("X-RateLimit-Remaining")
         if remaining == "0":
             raise RuntimeError("GitHub API 限流，请稍后再试或设置 GITHUB_TOKEN")
-        logger.warning(
+        raise RuntimeError(
             f"README 渲染被限制: {context}, status={resp.status_code}, remaining={remaining}"
         )
-        return None
     resp.raise_for_status()
     html = resp.text or ""
     if len(html) > max_chars:
@@ -493,7 +592,7 @@ def render_markdown_to_html(
     return html
 
 
-def build_repo_html(item: dict[str, Any]) -> str:
+def build_repo_html(item: dict[str, Any], readme_html: str | None = None) -> str:
     full_name = str(item.get("full_name") or "")
     url = str(item.get("url") or "")
     description = str(item.get("description") or "")
@@ -501,7 +600,8 @@ def build_repo_html(item: dict[str, Any]) -> str:
     stars = item.get("stars")
     forks = item.get("forks")
     stars_today = item.get("stars_today")
-    readme_html = item.get("readme_html")
+    if readme_html is None:
+        readme_html = item.get("readme_html")
 
     parts: list[str] = []
     if full_name:
@@ -537,7 +637,11 @@ def enrich_items_with_readme(items: list[dict[str, Any]], timeout_s: int = 12) -
     raise RuntimeError("enrich_items_with_readme 已废弃，请使用 fetch_and_cache_daily 内的两阶段流程")
 
 
-def fetch_trending(options: TrendingOptions, timeout_s: int = 12) -> list[dict[str, Any]]:
+def fetch_trending(
+    options: TrendingOptions,
+    timeout_s: int = 12,
+    d: date | str | None = None,
+) -> list[dict[str, Any]]:
     params: dict[str, str] = {}
     since = normalize_since(options.since)
     if since:
@@ -550,7 +654,9 @@ def fetch_trending(options: TrendingOptions, timeout_s: int = 12) -> list[dict[s
         "User-Agent": "miniDeskKit/0.1 (+https://github.com)",
         "Accept": "text/html,application/xhtml+xml",
     }
-    resp = requests.get(
+    from utils.http_client import get_session
+
+    resp = get_session("github").get(
         TRENDING_URL,
         params=params,
         headers=headers,
@@ -560,6 +666,11 @@ def fetch_trending(options: TrendingOptions, timeout_s: int = 12) -> list[dict[s
     logger.info(
         f"Trending 页面响应成功: status={resp.status_code}, bytes={len(resp.text or '')}"
     )
+    try:
+        # 保留原始页面，解析器修复或新增字段后可离线重新解析
+        archive_trending_html(resp.text, d, options)
+    except Exception as e:
+        logger.warning(f"保存 Trending 页面快照失败: {e}")
     items = parse_trending_html(resp.text)
     if not items:
         raise RuntimeError("Parsed trending items is empty")
@@ -567,40 +678,246 @@ def fetch_trending(options: TrendingOptions, timeout_s: int = 12) -> list[dict[s
     return items
 
 
-def _all_summaries_done(items: list[dict[str, Any]]) -> bool:
+def _all_summaries_done(items: list[dict[str, Any]], ds: str | None = None) -> bool:
     done_states = {"openai", "heuristic", "missing", "error"}
     for item in items:
         state = str(item.get("readme_source") or "none")
         if state not in done_states:
             return False
-    return True
+    if ds is None:
+        return True
+    from github_trending.job_queue import has_open_jobs
+
+    # error 只有在任务队列中不再重试时才算完成；摘要已生成但渲染待重试也算未完成
+    names = [str(i.get("full_name") or "") for i in items]
+    return not has_open_jobs(ds, [n for n in names if n])
 
 
 def fetch_all_raw_readmes(
     items: list[dict[str, Any]],
     d: date | str | None,
     timeout_s: int = 12,
+    progress: ProgressCallback | None = None,
+    should_cancel: CancelCheck | None = None,
+    priority: PriorityHint | None = None,
+    on_focused: Callable[[dict[str, Any]], None] | None = None,
 ) -> None:
-    session = _build_github_session()
-    logger.info(f"开始获取原始 README: count={len(items)}")
+    """on_focused：用户正在查看的仓库获取到原始 README 后立即调用，不等整批获取结束"""
+    from github_trending import job_queue
+
+    ds = date_str(d)
     for item in items:
-        full_name = str(item.get("full_name") or "")
-        if not full_name:
+        if not item.get("full_name") and str(item.get("readme_source") or "none") == "none":
             item["readme_source"] = "missing"
+    fresh = [str(i["full_name"]) for i in items if str(i.get("readme_source") or "none") == "none"]
+    job_queue.ensure_jobs(ds, fresh, "fetch")
+    jobs = job_queue.jobs_for(ds, [str(i.get("full_name") or "") for i in items])
+    now = time.time()
+    pending: list[dict[str, Any]] = []
+    for item in items:
+        full_name = str(item.get("full_name") or "")
+        if str(item.get("readme_source") or "none") not in {"none", "error"}:
             continue
+        stages = jobs.get(full_name, {})
+        fetch_job = stages.get("fetch")
+        if fetch_job is not None and not fetch_job.is_open:
+            # 任务按 (日期, 仓库, 阶段) 记录，同一天的其他周期已处理过该仓库，沿用其结果
+            _adopt_fetch_result(item, d, fetch_job, stages.get("summarize"))
+        elif job_queue.is_due(fetch_job, now):
+            pending.append(item)
+    if not pending:
+        return
+    from utils.http_client import get_session
+
+    locator = ReadmeLocator(_build_github_session(), get_session("github_raw"))
+    logger.info(f"开始获取原始 README: count={len(pending)}")
+    try:
+        _fetch_pending_readmes(
+            locator, pending, d, timeout_s, progress, should_cancel, priority, on_focused
+        )
+    finally:
+        locator.save()
+        locator.log_stats()
+
+
+def _adopt_fetch_result(
+    item: dict[str, Any], d: date | str | None, fetch_job: Job, summarize_job: Job | None
+) -> None:
+    full_name = str(item.get("full_name") or "")
+    raw_path = repo_readme_path(full_name, d)
+    if fetch_job.status != "done":
+        # 获取已失败且不再重试
+        item["readme_source"] = "error"
+    elif cached_file_exists(raw_path) or (summarize_job is not None and summarize_job.status != "skipped"):
+        # 原始 README 已被清理但摘要可能还在，交给总结阶段判断
+        item["readme_raw_path"] = str(raw_path)
+        item["readme_source"] = "raw"
+    else:
+        # 获取完成但没有 README
+        item["readme_source"] = "missing"
+
+
+def _adopt_summary(
+    item: dict[str, Any], d: date | str | None, stages: dict[str, Job], summary_source: str
+) -> bool:
+    """沿用同一天其他周期已完成的总结与渲染结果；返回 False 表示仍需在本周期重新总结"""
+    full_name = str(item.get("full_name") or "")
+    summary_path = repo_readme_summary_path(full_name, d)
+    if not cached_file_exists(summary_path):
+        if stages["summarize"].status == "done":
+            return False
+        item["readme_source"] = "error"
+        return True
+    # 以总结时记录的实际来源为准；旧版本队列没有记录时才按 payload 推断
+    item["readme_source"] = stages["summarize"].result or summary_source
+    for key in BODY_FIELDS:
+        item.pop(key, None)
+    item["readme_path"] = str(summary_path)
+    html_path = repo_readme_html_path(full_name, d)
+    render_job = stages.get("render")
+    if render_job is not None and render_job.status == "done" and cached_file_exists(html_path):
+        item["readme_html_path"] = str(html_path)
+    return True
+
+
+def _fetch_pending_readmes(
+    locator: ReadmeLocator,
+    pending: list[dict[str, Any]],
+    d: date | str | None,
+    timeout_s: int,
+    progress: ProgressCallback | None,
+    should_cancel: CancelCheck | None,
+    priority: PriorityHint | None,
+    on_focused: Callable[[dict[str, Any]], None] | None = None,
+) -> None:
+    from github_trending import job_queue
+    from github_trending.blob_store import write_text as write_blob_text
+    from github_trending.search_index import index_document
+
+    ds = date_str(d)
+    for done, item in enumerate(_by_priority(pending, priority), start=1):
+        if _cancelled(should_cancel):
+            logger.info(f"获取原始 README 已取消: remaining={len(pending) - done + 1}")
+            return
+        full_name = str(item.get("full_name") or "")
         try:
-            readme_raw_md = fetch_repo_readme_md(session, full_name, timeout_s=timeout_s)
+            readme_raw_md = locator.fetch(full_name, timeout_s=timeout_s)
+        except CircuitOpenError as e:
+            # 主机不可达时不消耗重试次数，剩余条目留待恢复后处理
+            logger.warning(f"获取原始 README 暂停: {e}")
+            return
         except Exception as e:
             logger.warning(f"Fetch README failed: {full_name} ({e})")
+            job_queue.fail(ds, full_name, "fetch", str(e))
             item["readme_source"] = "error"
-            continue
-        if not readme_raw_md:
+            readme_raw_md = None
+        if readme_raw_md:
+            raw_path = repo_readme_path(full_name, d)
+            raw_text = readme_raw_md.strip() + "\n"
+            write_blob_text(raw_path, raw_text)
+            item["readme_raw_path"] = str(raw_path)
+            item["readme_source"] = "raw"
+            job_queue.complete(ds, full_name, "fetch")
+            job_queue.ensure_jobs(ds, [full_name], "summarize")
+            index_document(full_name, d, "readme", raw_path, raw_text)
+        elif item.get("readme_source") != "error":
             item["readme_source"] = "missing"
-            continue
-        raw_path = repo_readme_path(full_name, d)
-        _atomic_write_text(raw_path, readme_raw_md.strip() + "\n")
-        item["readme_raw_path"] = str(raw_path)
-        item["readme_source"] = "raw"
+            job_queue.complete(ds, full_name, "fetch")
+            job_queue.skip(ds, full_name, ("summarize", "render"))
+        _notify(
+            progress,
+            "readme_fetched",
+            {"item": compact_item_dict(item), "done": done, "total": len(pending)},
+        )
+        if (
+            on_focused is not None
+            and item.get("readme_source") == "raw"
+            and priority is not None
+            and full_name in priority()[:1]
+        ):
+            on_focused(item)
+
+
+def _summarize_one(
+    item: dict[str, Any], d: date | str | None, new_summaries: list[tuple[str, str, str, str]]
+) -> str | None:
+    from github_trending import job_queue
+    from github_trending.blob_store import write_text as write_blob_text
+    from github_trending.search_index import index_document
+    from utils.openai_llm import heuristic_summarize_markdown, summarize_readme_markdown
+
+    ds = date_str(d)
+    full_name = str(item.get("full_name") or "")
+    raw_path = item.get("readme_raw_path")
+    raw_text = read_cache_text(raw_path) if isinstance(raw_path, str) and raw_path else None
+    if raw_text is None:
+        # 原始 README 已被清理，只能重新获取
+        logger.warning(f"读取原始 README 失败: {full_name} ({raw_path})")
+        item.pop("readme_raw_path", None)
+        item["readme_source"] = "none"
+        job_queue.ensure_jobs(ds, [full_name], "fetch")
+        job_queue.fail(ds, full_name, "fetch", "原始 README 缺失")
+        return None
+    try:
+        readme_md, summary_source = summarize_readme_markdown(raw_text, full_name, fallback=False)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        if job_queue.fail(ds, full_name, "summarize", str(e)):
+            item["readme_source"] = "error"
+            return None
+        # 重试用尽时退回启发式摘要，不再留空
+        readme_md, summary_source = heuristic_summarize_markdown(raw_text), "heuristic"
+    job_queue.complete(ds, full_name, "summarize", summary_source)
+
+    item["readme_source"] = summary_source
+    for key in BODY_FIELDS:
+        item.pop(key, None)
+    if isinstance(readme_md, str) and readme_md.strip():
+        summary_path = repo_readme_summary_path(full_name, d)
+        summary_text = readme_md.strip() + "\n"
+        write_blob_text(summary_path, summary_text)
+        item["readme_path"] = str(summary_path)
+        index_document(full_name, d, "summary", summary_path, summary_text)
+        new_summaries.append((full_name, ds, str(summary_path), summary_text))
+        job_queue.ensure_jobs(ds, [full_name], "render")
+        return summary_text
+    job_queue.skip(ds, full_name, ("render",))
+    return None
+
+
+def _render_one(
+    session: requests.Session,
+    item: dict[str, Any],
+    d: date | str | None,
+    summary_text: str | None,
+    timeout_s: int,
+) -> bool:
+    from github_trending import job_queue
+    from github_trending.blob_store import write_text as write_blob_text
+
+    ds = date_str(d)
+    full_name = str(item.get("full_name") or "")
+    if summary_text is None:
+        summary_text = item.get("readme_path") and read_cache_text(item["readme_path"])
+    if not summary_text:
+        job_queue.skip(ds, full_name, ("render",))
+        return False
+    try:
+        readme_html = render_markdown_to_html(
+            session, summary_text, context=full_name, timeout_s=timeout_s
+        )
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        if job_queue.fail(ds, full_name, "render", str(e)):
+            return False
+        readme_html = None
+    html_path = repo_readme_html_path(full_name, d)
+    write_blob_text(html_path, build_repo_html(item, readme_html).strip() + "\n")
+    item["readme_html_path"] = str(html_path)
+    job_queue.complete(ds, full_name, "render")
+    return readme_html is not None
 
 
 def summarize_all_readmes_from_raw(
@@ -611,65 +928,64 @@ def summarize_all_readmes_from_raw(
     cache_json_path: Path | None = None,
     cache_payload: dict[str, Any] | None = None,
     persist_every: int = 5,
+    progress: ProgressCallback | None = None,
+    should_cancel: CancelCheck | None = None,
+    priority: PriorityHint | None = None,
 ) -> None:
-    from utils.openai_llm import summarize_readme_markdown
+    """总结与渲染分为两个任务阶段：渲染失败只重试渲染，不会重新调用模型总结。"""
+    from github_trending import job_queue
+    from github_trending.similarity_index import index_summaries
 
+    ds = date_str(d)
+    job_queue.ensure_jobs(
+        ds, [str(i.get("full_name") or "") for i in items if i.get("readme_source") == "raw"], "summarize"
+    )
+    jobs = job_queue.jobs_for(ds, [str(i.get("full_name") or "") for i in items])
+    # 模型未启用时生成的是启发式摘要，与缓存迁移时的推断一致；仅在任务没有记录来源时使用
+    summary_source = "openai" if (cache_payload or {}).get("openai_enabled") else "heuristic"
+    now = time.time()
+    pending: list[dict[str, Any]] = []
+    for item in items:
+        stages = jobs.get(str(item.get("full_name") or ""), {})
+        summarize_job = stages.get("summarize")
+        if item.get("readme_source") == "raw" and summarize_job is not None and not summarize_job.is_open:
+            # 同一天的其他周期已总结过该仓库
+            if not _adopt_summary(item, d, stages, summary_source):
+                pending.append(item)
+                continue
+        if job_queue.is_due(summarize_job, now) or job_queue.is_due(stages.get("render"), now):
+            pending.append(item)
+    if not pending:
+        return
     session = _build_github_session()
-    logger.info(f"开始总结 README: count={len(items)}")
+    logger.info(f"开始总结 README: count={len(pending)}")
+    total = len(pending)
     updated_count = 0
-    for item in items:
+    new_summaries: list[tuple[str, str, str, str]] = []
+    for item in _by_priority(pending, priority):
         full_name = str(item.get("full_name") or "")
-        state = str(item.get("readme_source") or "none")
-        if state != "raw":
-            continue
-        raw_path = item.get("readme_raw_path")
-        if not isinstance(raw_path, str) or not raw_path:
-            item["readme_source"] = "missing"
-            continue
+        if _cancelled(should_cancel):
+            logger.info(f"总结 README 已取消: remaining={total - updated_count}")
+            break
+        summary_text = None
         try:
-            raw_text = Path(raw_path).read_text(encoding="utf-8")
-        except Exception as e:
-            logger.warning(f"读取原始 README 失败: {full_name} ({e})")
-            item["readme_source"] = "error"
-            continue
-
-        try:
-            readme_md, summary_source = summarize_readme_markdown(raw_text or "", full_name)
-            readme_html = (
-                render_markdown_to_html(
-                    session,
-                    readme_md or "",
-                    context=full_name,
-                    timeout_s=timeout_s,
-                )
-                if readme_md
-                else None
-            )
-        except Exception as e:
-            logger.warning(f"总结 README 失败: {full_name} ({e})")
-            item["readme_md"] = None
-            item["readme_html"] = None
-            item["readme_source"] = "error"
-            continue
-
-        item["readme_md"] = readme_md
-        item["readme_source"] = summary_source
-        item["readme_html"] = readme_html
-        item["readme"] = build_repo_markdown(item)
-        item["readme_html_page"] = build_repo_html(item)
-        if isinstance(readme_md, str) and readme_md.strip() and full_name:
-            _atomic_write_text(
-                repo_readme_summary_path(full_name, d), readme_md.strip() + "\n"
-            )
-            item["readme_path"] = str(repo_readme_summary_path(full_name, d))
-        html_page = item.get("readme_html_page")
-        if isinstance(html_page, str) and html_page.strip() and full_name:
-            _atomic_write_text(repo_readme_html_path(full_name, d), html_page.strip() + "\n")
-            item["readme_html_path"] = str(repo_readme_html_path(full_name, d))
+            if item.get("readme_source") in {"raw", "error"}:
+                summary_text = _summarize_one(item, d, new_summaries)
+                if summary_text is None:
+                    continue
+            rendered = _render_one(session, item, d, summary_text, timeout_s)
+        except CircuitOpenError as e:
+            logger.warning(f"总结 README 暂停: {e}")
+            break
         logger.info(
-            f"README 总结完成: {full_name}, source={item.get('readme_source')}, md={bool(readme_md)}, html={bool(readme_html)}"
+            f"README 总结完成: {full_name}, source={item.get('readme_source')}, html={rendered}"
         )
         updated_count += 1
+        _notify(
+            progress,
+            "summary_ready",
+            {"item": compact_item_dict(item), "done": updated_count, "total": total},
+        )
         if (
             cache_json_path is not None
             and cache_payload is not None
@@ -677,17 +993,34 @@ def summarize_all_readmes_from_raw(
             and updated_count % persist_every == 0
         ):
             cache_payload["items"] = items
-            cache_payload["summaries_complete"] = _all_summaries_done(items)
-            _atomic_write_json(cache_json_path, cache_payload)
+            cache_payload["summaries_complete"] = _all_summaries_done(items, date_str(d))
+            _write_payload(cache_json_path, cache_payload)
+    if new_summaries:
+        index_summaries(new_summaries)
 
 
 def fetch_and_cache_daily(
     d: date | str | None = None,
     options: TrendingOptions | None = None,
+    progress: ProgressCallback | None = None,
+    should_cancel: CancelCheck | None = None,
+    priority: PriorityHint | None = None,
 ) -> tuple[list[dict[str, Any]], bool]:
+    """抓取并缓存一个周期的 Trending。
+
+    should_cancel 返回 True 时在条目之间停下，已完成的部分照常写入缓存后抛出 PipelineCancelled，
+    下次调用从未完成的条目继续。
+    """
     if options is None:
         options = TrendingOptions()
     options = TrendingOptions(since=normalize_since(options.since), language=options.language)
+
+    def summarize_focused(item: dict[str, Any]) -> None:
+        # 用户正在查看的仓库走完 获取 → 总结 → 渲染 后再继续整批获取
+        summarize_all_readmes_from_raw(
+            [item], d=d, options=options, progress=progress, should_cancel=should_cancel
+        )
+
     if d is not None and date_str(d) != date_str():
         if has_success_cache(d, options):
             cached = load_cached_items(d, options)
@@ -709,12 +1042,24 @@ def fetch_and_cache_daily(
                 f"今日缓存存在但总结未完成，继续总结: date={date_str(d)}, since={options.since}, count={len(cached)}"
             )
             payload = load_cached_payload(d, options) or {}
+            _notify(progress, "list_parsed", {"items": [compact_item_dict(i) for i in cached]})
+            fetch_all_raw_readmes(
+                cached,
+                d=d,
+                progress=progress,
+                should_cancel=should_cancel,
+                priority=priority,
+                on_focused=summarize_focused,
+            )
             summarize_all_readmes_from_raw(
                 cached,
                 d=d,
                 options=options,
                 cache_json_path=json_path,
                 cache_payload=payload,
+                progress=progress,
+                should_cancel=should_cancel,
+                priority=priority,
             )
             md_text = build_daily_markdown(d, options, cached)
             payload.update(
@@ -723,16 +1068,21 @@ def fetch_and_cache_daily(
                     "date": date_str(d),
                     "since": options.since,
                     "language": options.language,
-                    "summaries_complete": _all_summaries_done(cached),
+                    "summaries_complete": _all_summaries_done(cached, date_str(d)),
                     "items": cached,
                 }
             )
             _atomic_write_text(md_path, md_text)
-            _atomic_write_json(json_path, payload)
+            _write_payload(json_path, payload)
+            if not payload["summaries_complete"] and _cancelled(should_cancel):
+                raise PipelineCancelled(options.since)
             return cached, True
 
+    if _cancelled(should_cancel):
+        raise PipelineCancelled(options.since)
     logger.info(f"开始抓取 Trending 并写入缓存: date={date_str(d)}")
-    items = fetch_trending(options)
+    items = fetch_trending(options, d=d)
+    _notify(progress, "list_parsed", {"items": [compact_item_dict(i) for i in items]})
 
     try:
         from utils.openai_llm import get_openai_settings
@@ -744,7 +1094,14 @@ def fetch_and_cache_daily(
         openai_enabled = False
         openai_model = None
 
-    fetch_all_raw_readmes(items, d=d)
+    fetch_all_raw_readmes(
+        items,
+        d=d,
+        progress=progress,
+        should_cancel=should_cancel,
+        priority=priority,
+        on_focused=summarize_focused,
+    )
 
     payload: dict[str, Any] = {
         "schema_version": SCHEMA_VERSION,
@@ -757,22 +1114,33 @@ def fetch_and_cache_daily(
         "items": items,
     }
     _atomic_write_text(md_path, build_daily_markdown(d, options, items))
-    _atomic_write_json(json_path, payload)
+    _write_payload(json_path, payload)
+
+    from github_trending.trending_history import record_payload
+
+    record_payload(payload)
 
+    if _cancelled(should_cancel):
+        raise PipelineCancelled(options.since)
     summarize_all_readmes_from_raw(
         items,
         d=d,
         options=options,
         cache_json_path=json_path,
         cache_payload=payload,
+        progress=progress,
+        should_cancel=should_cancel,
+        priority=priority,
     )
-    payload["summaries_complete"] = _all_summaries_done(items)
+    payload["summaries_complete"] = _all_summaries_done(items, date_str(d))
     md_text = build_daily_markdown(d, options, items)
     _atomic_write_text(md_path, md_text)
-    _atomic_write_json(json_path, payload)
+    _write_payload(json_path, payload)
     logger.info(
         f"Trending 缓存写入完成: md={md_path}, json={json_path}, count={len(items)}, summaries_complete={payload['summaries_complete']}"
     )
+    if not payload["summaries_complete"] and _cancelled(should_cancel):
+        raise PipelineCancelled(options.since)
     return items, True
 
 
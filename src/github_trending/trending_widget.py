@@ -1,37 +1,53 @@
 from pathlib import Path
 
-from PySide6.QtCore import QPoint, Qt, QSize, QRect, Signal
+from PySide6.QtCore import QPoint, Qt, QSize, QRect, QTimer, Signal
 from PySide6.QtGui import QFont, QPixmap, QGuiApplication
 from PySide6.QtWidgets import (
+    QApplication,
     QComboBox,
     QFrame,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QListWidget,
     QListWidgetItem,
+    QPushButton,
     QTextBrowser,
     QVBoxLayout,
     QWidget,
 )
 
+from github_trending.trending_item import TrendingItem
 from github_trending.trending_service import (
     TrendingOptions,
+    date_str,
     has_success_cache_all_periods,
-    load_cached_items,
-    load_latest_cached_items,
+    load_cached_item_models,
+    load_latest_cached_item_models,
+    read_cache_text,
     summaries_complete,
 )
-from github_trending.trending_worker import TrendingWorker
+from github_trending.cache_maintenance import CachePolicy, maintenance_due
+from github_trending.job_queue import describe as describe_job
+from github_trending.search_index import search
+from github_trending.similarity_index import similar_repos
+from github_trending.trending_worker import (
+    CacheMaintenanceWorker,
+    SearchIndexWorker,
+    TrendingWorker,
+)
 from utils.config_manager import ConfigManager
 from utils.logger import logger
 
 
 class GithubTrendingPopup(QWidget):
     period_changed = Signal(str)
+    repo_focused = Signal(list)
 
     def __init__(self):
         super().__init__()
         self.items = []
+        self.period_items = []
         self.since = "daily"
         self.setup_window()
         self.setup_ui()
@@ -66,8 +82,25 @@ class GithubTrendingPopup(QWidget):
         self.period_combo.setCurrentIndex(0)
         self.period_combo.currentIndexChanged.connect(self.on_period_changed)
         filter_layout.addWidget(self.period_combo, 1)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索 README / 摘要")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.on_search_text_changed)
+        filter_layout.addWidget(self.search_edit, 2)
+
+        self.similar_button = QPushButton("相似")
+        self.similar_button.setCheckable(True)
+        self.similar_button.setToolTip("查找与当前仓库相似的历史仓库")
+        self.similar_button.toggled.connect(self.on_similar_toggled)
+        filter_layout.addWidget(self.similar_button)
         layout.addLayout(filter_layout)
 
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.run_search)
+
         content_layout = QHBoxLayout()
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(10)
@@ -136,16 +169,108 @@ class GithubTrendingPopup(QWidget):
         since = self.period_combo.currentData()
         if isinstance(since, str) and since:
             self.since = since
+            self.similar_button.setChecked(False)
             self.period_changed.emit(since)
 
+    def on_search_text_changed(self, _text: str):
+        self.similar_button.setChecked(False)
+        self.search_timer.start()
+
+    def on_similar_toggled(self, checked: bool):
+        if not checked:
+            self.run_search()
+            return
+        row = self.repo_list.currentRow()
+        if row < 0 or row >= len(self.items):
+            self.similar_button.setChecked(False)
+            return
+        full_name = self.items[row].full_name
+        try:
+            hits = similar_repos(full_name)
+        except Exception as e:
+            logger.warning(f"GitHub Trending: 相似仓库查询失败 repo={full_name} ({e})")
+            hits = []
+        results = [
+            TrendingItem(
+                hit.full_name,
+                url=f"https://github.com/{hit.full_name}",
+                description=f"{hit.date} · 相似度 {hit.score:.2f}",
+                readme_path=hit.path,
+            )
+            for hit in hits
+        ]
+        if not results:
+            tip = f"暂无与 {full_name} 相似的仓库（需要配置 OPENAI_API_KEY 以计算 embedding）"
+            results.append(
+                TrendingItem(
+                    "无相似仓库",
+                    description=tip,
+                    readme_page=f"# 无相似仓库\n\n{tip}\n",
+                )
+            )
+        self._show_items(results)
+
+    def run_search(self):
+        query = self.search_edit.text().strip()
+        if not query:
+            self._show_items(self.period_items)
+            return
+        try:
+            hits = search(query)
+        except Exception as e:
+            logger.warning(f"GitHub Trending: 搜索失败 query={query!r} ({e})")
+            hits = []
+        results = []
+        for hit in hits:
+            kind = "摘要" if hit.kind == "summary" else "README"
+            results.append(
+                TrendingItem(
+                    hit.full_name,
+                    url=f"https://github.com/{hit.full_name}",
+                    description=f"{hit.date} · {kind}",
+                    readme_path=hit.path if hit.kind == "summary" else None,
+                    readme_raw_path=hit.path if hit.kind == "readme" else None,
+                )
+            )
+        if not results:
+            tip = f"未找到与“{query}”相关的 README 或摘要"
+            results.append(
+                TrendingItem(
+                    "无搜索结果",
+                    description=tip,
+                    readme_page=f"# 无搜索结果\n\n{tip}\n",
+                )
+            )
+        self._show_items(results)
+
     def set_items(self, items):
+        self.period_items = [TrendingItem.coerce(item) for item in items or []]
+        if self.search_edit.text().strip() or self.similar_button.isChecked():
+            return
+        self._show_items(self.period_items)
+
+    def update_item(self, item: TrendingItem):
+        # 单个仓库的 README / 摘要就绪时原地替换，不打断当前选中与滚动位置
+        for idx, old in enumerate(self.period_items):
+            if old.full_name == item.full_name:
+                self.period_items[idx] = item
+                break
+        else:
+            return
+        if self.search_edit.text().strip() or self.similar_button.isChecked():
+            return
+        for row, old in enumerate(self.items):
+            if old.full_name == item.full_name:
+                self.items[row] = item
+                if row == self.repo_list.currentRow():
+                    self.on_repo_changed(row)
+                return
+
+    def _show_items(self, items):
         self.items = list(items or [])
         self.repo_list.clear()
         for item in self.items:
-            full_name = item.get("full_name") or ""
-            name = item.get("name") or ""
-            text = name or (full_name.split("/")[-1] if "/" in full_name else full_name) or "unknown"
-            self.repo_list.addItem(QListWidgetItem(text))
+            self.repo_list.addItem(QListWidgetItem(item.display_name))
         if self.items:
             self.repo_list.setCurrentRow(0)
         else:
@@ -158,37 +283,42 @@ class GithubTrendingPopup(QWidget):
 
         item = self.items[row]
         self.readme_view.setMarkdown(self._build_display_markdown(item))
+        if self.search_edit.text().strip() or self.similar_button.isChecked():
+            return
+        # 当前仓库优先，其次是向下浏览时马上会看到的相邻条目
+        neighbours = [row, row + 1, row - 1, row + 2]
+        self.repo_focused.emit(
+            [self.items[i].full_name for i in neighbours if 0 <= i < len(self.items)]
+        )
 
     def _load_text(self, path_str: str) -> str | None:
         try:
-            p = Path(path_str)
-            if not p.exists():
-                return None
-            return p.read_text(encoding="utf-8")
+            return read_cache_text(path_str)
         except Exception:
             return None
 
-    def _build_display_markdown(self, item: dict) -> str:
-        full_name = str(item.get("full_name") or "")
-        url = str(item.get("url") or "")
-        description = str(item.get("description") or "")
-        language = str(item.get("language") or "")
-        stars = item.get("stars")
-        forks = item.get("forks")
-        stars_today = item.get("stars_today")
-
-        readme_content: str | None = None
-        summary_path = item.get("readme_path")
-        if isinstance(summary_path, str) and summary_path:
-            readme_content = self._load_text(summary_path)
-        if not (isinstance(readme_content, str) and readme_content.strip()):
-            readme_md = item.get("readme_md")
-            if isinstance(readme_md, str) and readme_md.strip():
-                readme_content = readme_md
+    def _job_status(self, full_name: str) -> str | None:
+        if not full_name:
+            return None
+        try:
+            return describe_job(date_str(), full_name)
+        except Exception:
+            return None
+
+    def _build_display_markdown(self, item: TrendingItem) -> str:
+        full_name = item.full_name
+        url = item.url
+        description = item.description
+        language = item.language
+        stars = item.stars
+        forks = item.forks
+        stars_today = item.stars_today
+
+        readme_content = item.load_summary()
 
         if not (isinstance(readme_content, str) and readme_content.strip()):
-            raw_path = item.get("readme_raw_path")
-            if isinstance(raw_path, str) and raw_path:
+            raw_path = item.readme_raw_path
+            if raw_path:
                 try:
                     raw_p = Path(raw_path)
                     date_dir = raw_p.parent.name
@@ -201,9 +331,8 @@ class GithubTrendingPopup(QWidget):
                     readme_content = self._load_text(raw_path)
 
         if not (isinstance(readme_content, str) and readme_content.strip()):
-            legacy = item.get("readme")
-            if isinstance(legacy, str) and legacy.strip():
-                return legacy
+            if item.readme_page:
+                return item.readme_page
             readme_content = ""
 
         lines: list[str] = []
@@ -235,7 +364,11 @@ class GithubTrendingPopup(QWidget):
             lines.append(readme_content.strip())
             lines.append("")
         else:
-            lines.append("_README 未获取到（可能是无 README / 触发了 GitHub API 限流 / 网络错误）_")
+            status = self._job_status(full_name)
+            if status:
+                lines.append(f"_{status}_")
+            else:
+                lines.append("_README 未获取到（可能是无 README / 触发了 GitHub API 限流 / 网络错误）_")
             lines.append("")
         return "\n".join(lines).rstrip() + "\n"
 
@@ -250,11 +383,19 @@ class GithubTrendingWidget(QWidget):
         self.config_manager = ConfigManager()
         self.popup = GithubTrendingPopup()
         self.popup.period_changed.connect(self.on_popup_period_changed)
+        self.popup.repo_focused.connect(self.on_repo_focused)
         self.popup_visible = False
         self.worker = None
         self.options = TrendingOptions(since=self.popup.since)
         self.setup_ui()
         self.load_cached_or_placeholder_data()
+        self.index_worker = SearchIndexWorker()
+        self.index_worker.start()
+        self.maintenance_worker = None
+        self.start_cache_maintenance()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_worker)
 
     def setup_ui(self):
         layout = QHBoxLayout(self)
@@ -268,6 +409,13 @@ class GithubTrendingWidget(QWidget):
         layout.addWidget(self.trigger)
         self.update_trigger_icon()
 
+    def start_cache_maintenance(self):
+        if not maintenance_due():
+            return
+        policy = CachePolicy.from_config(self.config_manager.get_github_trending_config())
+        self.maintenance_worker = CacheMaintenanceWorker(policy)
+        self.maintenance_worker.start()
+
     def update_trigger_icon(self):
         icon_path = Path(__file__).resolve().parent / "github.png"
         pixmap = QPixmap(str(icon_path))
@@ -284,26 +432,24 @@ class GithubTrendingWidget(QWidget):
         self.trigger.setPixmap(scaled)
 
     def load_cached_or_placeholder_data(self):
-        items = load_cached_items(options=self.options) or load_latest_cached_items()
+        items = load_cached_item_models(options=self.options) or load_latest_cached_item_models()
         if items:
             self.popup.set_items(items)
             return
 
         self.popup.set_items([self._placeholder_item()])
 
-    def _placeholder_item(self, message: str | None = None) -> dict:
+    def _placeholder_item(self, message: str | None = None) -> TrendingItem:
         since = self.options.since
         period_map = {"daily": "Today", "weekly": "This week", "monthly": "This month"}
         period = period_map.get(since, since)
         tip = message or "尚未缓存 Trending 数据，首次打开时将自动抓取。"
-        return {
-            "full_name": "GitHub Trending",
-            "url": "https://github.com/trending",
-            "language": "",
-            "stars": "",
-            "description": tip,
-            "readme": f"# GitHub Trending ({period})\n\n{tip}\n",
-        }
+        return TrendingItem(
+            "GitHub Trending",
+            url="https://github.com/trending",
+            description=tip,
+            readme_page=f"# GitHub Trending ({period})\n\n{tip}\n",
+        )
 
     def trigger_mouse_press_event(self, event):
         if event.button() == Qt.LeftButton:
@@ -339,7 +485,10 @@ class GithubTrendingWidget(QWidget):
         self.refresh_if_needed()
 
     def refresh_if_needed(self):
-        cached = load_cached_items(options=self.options)
+        # 先展示最近一次缓存，网络不可用时也不必等待抓取失败
+        cached = load_cached_item_models(options=self.options) or load_latest_cached_item_models(
+            self.options
+        )
         if cached is not None:
             self.popup.set_items(cached)
 
@@ -353,38 +502,75 @@ class GithubTrendingWidget(QWidget):
             logger.info("GitHub Trending: 今日缓存已全部存在且总结完成，跳过抓取")
             return
         if self.worker and self.worker.isRunning():
-            logger.info("GitHub Trending: 抓取线程运行中，跳过重复启动")
+            self.worker.prioritize(self.options.since)
             return
 
         logger.info("GitHub Trending: 今日缓存不完整或总结未完成，开始后台处理（daily/weekly/monthly）")
-        self.worker = TrendingWorker(options=self.options)
+        trending_config = self.config_manager.get_github_trending_config()
+        self.worker = TrendingWorker(
+            options=self.options,
+            use_process=bool(trending_config.get("run_in_process", False)),
+        )
+        self.worker.list_parsed.connect(self.on_list_parsed)
+        self.worker.readme_fetched.connect(self.on_item_progress)
+        self.worker.summary_ready.connect(self.on_item_progress)
         self.worker.items_ready.connect(self.on_items_ready)
         self.worker.error_occurred.connect(self.on_fetch_error)
+        self.worker.finished.connect(lambda: self.trigger.setToolTip("GitHub Trending"))
         self.worker.start()
 
-    def on_items_ready(self, items, updated: bool):
-        sender = self.sender()
-        sender_options = getattr(sender, "options", None)
-        if isinstance(sender_options, TrendingOptions) and sender_options != self.options:
-            self.refresh_if_needed()
+    def stop_worker(self):
+        # 先全部请求停止再逐个等待，几个线程并行收尾
+        workers = [
+            w
+            for w in (self.worker, self.index_worker, self.maintenance_worker)
+            if w and w.isRunning()
+        ]
+        for worker in workers:
+            worker.stop()
+        for worker in workers:
+            worker.wait()
+
+    def _apply_period_items(self, items):
+        current = [i.full_name for i in self.popup.period_items]
+        if current == [i.full_name for i in items]:
+            for item in items:
+                self.popup.update_item(item)
+        else:
+            self.popup.set_items(items)
+
+    def on_list_parsed(self, since: str, items):
+        self.trigger.setToolTip(f"GitHub Trending ({since}): 列表已更新，{len(items)} 个仓库")
+        if since == self.options.since and items:
+            self._apply_period_items(items)
+
+    def on_item_progress(self, since: str, item: TrendingItem):
+        stage = {"raw": "README 已获取", "missing": "无 README", "error": "处理失败"}.get(
+            item.readme_source, "摘要已生成"
+        )
+        self.trigger.setToolTip(f"GitHub Trending ({since}): {stage} {item.full_name}")
+        if since == self.options.since:
+            self.popup.update_item(item)
+
+    def on_repo_focused(self, full_names: list):
+        if self.worker and self.worker.isRunning():
+            self.worker.focus(self.options.since, full_names)
+
+    def on_items_ready(self, since: str, items, updated: bool):
+        if since != self.options.since:
             return
         logger.info(
-            f"GitHub Trending: UI 刷新 items={len(items)}, updated={updated}, since={self.options.since}"
+            f"GitHub Trending: UI 刷新 items={len(items)}, updated={updated}, since={since}"
         )
-        self.popup.set_items(items)
+        self._apply_period_items(items)
 
     def on_fetch_error(self, message: str):
-        sender = self.sender()
-        sender_options = getattr(sender, "options", None)
-        if isinstance(sender_options, TrendingOptions) and sender_options != self.options:
-            self.refresh_if_needed()
-            return
         logger.error(f"GitHub Trending: {message}")
         if (
             self.popup.items
             and not (
                 len(self.popup.items) == 1
-                and (self.popup.items[0].get("full_name") or "") == "GitHub Trending"
+                and self.popup.items[0].full_name == "GitHub Trending"
             )
         ):
             return
@@ -392,7 +578,9 @@ class GithubTrendingWidget(QWidget):
 
     def on_popup_period_changed(self, since: str):
         self.options = TrendingOptions(since=since)
-        cached = load_cached_items(options=self.options)
+        cached = load_cached_item_models(options=self.options) or load_latest_cached_item_models(
+            self.options
+        )
         if cached is not None:
             self.popup.set_items(cached)
         else:
@@ -442,6 +630,7 @@ class GithubTrendingWidget(QWidget):
 
     def closeEvent(self, event):
         self.hide_popup()
+        self.stop_worker()
         if event:
             event.accept()
 
@@ -1,47 +1,273 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import deque
+
 from PySide6.QtCore import QThread, Signal
 
 from utils.logger import logger
 
+from github_trending.trending_item import TrendingItem
 from github_trending.trending_service import (
+    PipelineCancelled,
     TrendingOptions,
+    date_str,
     fetch_and_cache_daily,
-    load_cached_items,
+    load_cached_item_models,
 )
 
 
+PERIODS = ("daily", "weekly", "monthly")
+# 失败任务在该时间内到期重试时保持线程等待，否则留给下次打开弹窗时处理
+RETRY_WAIT_MAX_S = 600
+
+
 class TrendingWorker(QThread):
-    items_ready = Signal(list, bool)
+    list_parsed = Signal(str, list)
+    readme_fetched = Signal(str, object)
+    summary_ready = Signal(str, object)
+    items_ready = Signal(str, list, bool)
     error_occurred = Signal(str)
 
-    def __init__(self, options: TrendingOptions | None = None):
+    def __init__(self, options: TrendingOptions | None = None, use_process: bool = False):
         super().__init__()
         self.options = options or TrendingOptions()
+        self.use_process = use_process
+        self._lock = threading.Lock()
+        self._queue: deque[str] = deque(
+            [self.options.since] + [s for s in PERIODS if s != self.options.since]
+        )
+        self._current: str | None = None
+        self._preempted = False
+        self._focus: tuple[str, list[str]] | None = None
+        self._pipeline = None
+        self._retry_rounds = 0
+
+    def prioritize(self, since: str):
+        """把 since 提到队首；正在处理其他周期时在当前条目后让出，未完成部分放回队列"""
+        with self._lock:
+            self.options = TrendingOptions(since=since, language=self.options.language)
+            if since in self._queue:
+                self._queue.remove(since)
+                self._queue.appendleft(since)
+            if self._current is not None and self._current != since and since in self._queue:
+                self._preempted = True
+                pipeline = self._pipeline
+            else:
+                pipeline = None
+        if pipeline is not None:
+            pipeline.cancel()
+
+    def focus(self, since: str, full_names: list[str]):
+        """用户正在查看的仓库（及相邻条目）优先获取与总结"""
+        self._focus = (since, list(full_names))
+        pipeline = self._pipeline
+        if pipeline is not None:
+            pipeline.focus(since, full_names)
+
+    def _priority(self, since: str) -> list[str]:
+        focus = self._focus
+        return focus[1] if focus is not None and focus[0] == since else []
+
+    def stop(self):
+        """请求停止：当前条目处理完后退出，已完成的部分保留在缓存中"""
+        self.requestInterruption()
+        pipeline = self._pipeline
+        if pipeline is not None:
+            pipeline.cancel()
+
+    def _should_cancel(self) -> bool:
+        return self._preempted or self.isInterruptionRequested()
+
+    def _requeue(self, since: str):
+        # 被抢占的周期排在新优先周期之后，之后从中断处继续
+        with self._lock:
+            self._preempted = False
+            self._current = None
+            if since not in self._queue:
+                self._queue.insert(1 if self._queue else 0, since)
+        logger.info(f"GitHub Trending: 切换到 {self.options.since}，{since} 的剩余工作放回队列")
+
+    def _take(self) -> str | None:
+        with self._lock:
+            self._current = self._queue[0] if self._queue else None
+            return self._current
+
+    def _done(self, since: str):
+        with self._lock:
+            if since in self._queue:
+                self._queue.remove(since)
+            self._current = None
+
+    def _wait_for_retry(self) -> bool:
+        from github_trending.job_queue import MAX_ATTEMPTS, next_retry_at
+        from utils.http_client import circuit_retry_at
+
+        at = next_retry_at(date_str())
+        if at is None:
+            return False
+        probe_at = circuit_retry_at()
+        if probe_at is not None:
+            # 有主机熔断时等到可以探测再继续；离线等待不计入重试轮数
+            at = max(at, probe_at)
+        elif self._retry_rounds >= MAX_ATTEMPTS:
+            return False
+        else:
+            self._retry_rounds += 1
+        delay = at - time.time()
+        if delay > RETRY_WAIT_MAX_S:
+            logger.info(f"GitHub Trending: 失败任务将在 {delay:.0f}s 后重试，本次不再等待")
+            return False
+        logger.info(f"GitHub Trending: 等待 {max(0.0, delay):.0f}s 后重试失败的任务")
+        while time.time() < at:
+            if self.isInterruptionRequested():
+                return False
+            self.msleep(500)
+        with self._lock:
+            self._queue.extend(p for p in PERIODS if p not in self._queue)
+        return True
+
+    def _emit_progress(self, since: str, event: str, data: dict):
+        if event == "list_parsed":
+            self.list_parsed.emit(since, [TrendingItem.from_dict(i) for i in data.get("items") or []])
+        elif event == "readme_fetched":
+            self.readme_fetched.emit(since, TrendingItem.from_dict(data["item"]))
+        elif event == "summary_ready":
+            self.summary_ready.emit(since, TrendingItem.from_dict(data["item"]))
+
+    def _period_finished(self, since: str, items, updated: bool):
+        self._done(since)
+        options = TrendingOptions(since=since, language=self.options.language)
+        models = load_cached_item_models(options=options) or [
+            TrendingItem.from_dict(i) for i in items or []
+        ]
+        logger.info(f"GitHub Trending 周期完成: since={since}, count={len(models)}, updated={updated}")
+        self.items_ready.emit(since, models, updated)
+
+    def _period_failed(self, since: str, message: str):
+        self._done(since)
+        if since == self.options.since:
+            msg = f"获取 GitHub Trending 失败: {message}"
+            logger.error(msg)
+            self.error_occurred.emit(msg)
+        else:
+            logger.warning(f"预取 GitHub Trending 失败: since={since} ({message})")
 
     def run(self):
+        logger.info(
+            f"开始获取 GitHub Trending: since={self.options.since}, language={self.options.language}, "
+            f"process={self.use_process}"
+        )
         try:
-            logger.info(
-                f"开始获取 GitHub Trending: since={self.options.since}, language={self.options.language}"
-            )
-            items, updated_any = fetch_and_cache_daily(options=self.options)
-            for since in ("daily", "weekly", "monthly"):
-                if since == self.options.since:
-                    continue
-                try:
-                    _, updated = fetch_and_cache_daily(
-                        options=TrendingOptions(since=since, language=self.options.language)
-                    )
-                    updated_any = updated_any or updated
-                except Exception as e:
-                    logger.warning(f"预取 GitHub Trending 失败: since={since} ({e})")
-
-            items = load_cached_items(options=self.options) or items or []
-            logger.info(
-                f"获取 GitHub Trending 完成: count={len(items)}, updated={updated_any}"
-            )
-            self.items_ready.emit(items, updated_any)
+            if self.use_process:
+                self._run_in_process()
+            else:
+                self._run_in_thread()
         except Exception as e:
             msg = f"获取 GitHub Trending 失败: {e}"
             logger.error(msg)
             self.error_occurred.emit(msg)
+        if self.isInterruptionRequested():
+            logger.info(f"GitHub Trending 抓取已停止: pending={list(self._queue)}")
+
+    def _run_in_thread(self):
+        while not self.isInterruptionRequested():
+            since = self._take()
+            if since is None:
+                if self._wait_for_retry():
+                    continue
+                return
+            try:
+                items, updated = fetch_and_cache_daily(
+                    options=TrendingOptions(since=since, language=self.options.language),
+                    progress=lambda event, data, since=since: self._emit_progress(since, event, data),
+                    should_cancel=self._should_cancel,
+                    priority=lambda since=since: self._priority(since),
+                )
+            except PipelineCancelled:
+                if self.isInterruptionRequested():
+                    return
+                self._requeue(since)
+                continue
+            except Exception as e:
+                self._period_failed(since, str(e))
+                continue
+            self._period_finished(since, items, updated)
+
+    def _run_in_process(self):
+        from github_trending.pipeline_process import PipelineProcess
+
+        # 子进程按队列顺序处理；被抢占时结束子进程，按新顺序重新启动
+        while not self.isInterruptionRequested():
+            with self._lock:
+                periods = list(self._queue)
+                self._current = periods[0] if periods else None
+            if not periods:
+                if self._wait_for_retry():
+                    continue
+                return
+            with self._lock:
+                self._pipeline = PipelineProcess(periods, self.options.language)
+            try:
+                self._pipeline.start()
+                if self._focus is not None:
+                    self._pipeline.focus(*self._focus)
+                for kind, since, data in self._pipeline.messages():
+                    if kind == "progress":
+                        with self._lock:
+                            self._current = since
+                        self._emit_progress(since, data.pop("event"), data)
+                    elif kind == "period_done":
+                        self._period_finished(since, None, data["updated"])
+                    elif kind == "error":
+                        self._period_failed(since or self._current or self.options.since, data["message"])
+                    elif kind == "cancelled" and not self.isInterruptionRequested():
+                        self._requeue(since)
+                    if kind in {"period_done", "error"}:
+                        with self._lock:
+                            self._current = self._queue[0] if self._queue else None
+            finally:
+                pipeline, self._pipeline = self._pipeline, None
+                pipeline.join()
+
+
+class SearchIndexWorker(QThread):
+    indexed = Signal(int)
+
+    def run(self):
+        try:
+            from github_trending.search_index import index_cache
+            from github_trending.similarity_index import index_cache_summaries
+
+            added = index_cache(self.isInterruptionRequested)
+            index_cache_summaries(self.isInterruptionRequested)
+            self.indexed.emit(added)
+        except Exception as e:
+            logger.warning(f"更新 Trending 搜索索引失败: {e}")
+
+    def stop(self):
+        """请求停止：当前文件（或 embedding 批次）写入后退出"""
+        self.requestInterruption()
+
+
+class CacheMaintenanceWorker(QThread):
+    maintenance_done = Signal(object)
+
+    def __init__(self, policy=None):
+        super().__init__()
+        self.policy = policy
+
+    def run(self):
+        try:
+            from github_trending.cache_maintenance import run_maintenance
+
+            self.maintenance_done.emit(
+                run_maintenance(self.policy, should_cancel=self.isInterruptionRequested)
+            )
+        except Exception as e:
+            logger.warning(f"Trending 缓存维护失败: {e}")
+
+    def stop(self):
+        """请求停止：当前步骤（压缩时为当前文件）完成后退出，下次启动重新执行"""
+        self.requestInterruption()
@@ -140,6 +140,9 @@ class MainWindow(QWidget):
     def quit_app(self):
         """退出应用"""
         logger.info("退出应用")
+        from utils.http_client import log_host_stats
+
+        log_host_stats()
         if hasattr(self, "tray_icon"):
             self.tray_icon.hide()
         self.close()
@@ -148,6 +151,10 @@ class MainWindow(QWidget):
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # 打包后的可执行文件以 spawn 方式启动 Trending 子进程时需要
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -507,7 +507,8 @@ class SettingsDialog(QDialog):
         self.config_manager.config["window"] = window_config
         self.config_manager.config["progress_bars"] = progress_config
         self.config_manager.config["labels"] = label_config
-        self.config_manager.config["system_monitor"] = system_config
+        # 合并而不是替换，保留对话框中没有的项（如自适应采样参数）
+        self.config_manager.config.setdefault("system_monitor", {}).update(system_config)
         self.config_manager.config["minutely_weather"] = weather_config
         self.config_manager.config["logging"] = logging_config
 
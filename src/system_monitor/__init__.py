@@ -1,9 +1,15 @@
 from system_monitor.status_widgets import CPULabel as CPULabel
 from system_monitor.status_widgets import DiskLabel as DiskLabel
+from system_monitor.status_widgets import DiskIOLabel as DiskIOLabel
+from system_monitor.status_widgets import NetworkLabel as NetworkLabel
 from system_monitor.status_widgets import MemoryLabel as MemoryLabel
+from system_monitor.cpu_heat_strip import CpuHeatStrip as CpuHeatStrip
 from system_monitor.progress_bars import CPUProgressBar as CPUProgressBar
 from system_monitor.progress_bars import DiskProgressBar as DiskProgressBar
+from system_monitor.progress_bars import DiskIOProgressBar as DiskIOProgressBar
+from system_monitor.progress_bars import NetworkProgressBar as NetworkProgressBar
 from system_monitor.progress_bars import MemoryProgressBar as MemoryProgressBar
+from system_monitor.sparkline import Sparkline as Sparkline
 from system_monitor.system_info_worker import SystemInfoWorker as SystemInfoWorker
 from system_monitor.system_monitor_widget import (
     SystemMonitorWidget as SystemMonitorWidget,
@@ -17,9 +23,15 @@ __all__ = [
     "CPULabel",
     "MemoryLabel",
     "DiskLabel",
+    "DiskIOLabel",
+    "NetworkLabel",
     "CPUProgressBar",
     "MemoryProgressBar",
     "DiskProgressBar",
+    "DiskIOProgressBar",
+    "NetworkProgressBar",
+    "CpuHeatStrip",
+    "Sparkline",
     "SystemInfoWorker",
     "SystemMonitorWidget",
     "StyleManager",
@@ -0,0 +1,269 @@
+import os
+import time
+
+import psutil
+
+from utils.logger import logger
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PROC_CGROUP = "/proc/self/cgroup"
+# 配额可能被 docker update / systemctl set-property 修改，按该间隔重新读取
+LIMIT_REFRESH_S = 30
+SCOPE_METRICS = ("cpu", "memory")
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path):
+    value = _read(path)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_keyed(path):
+    """解析 cpu.stat / memory.stat 这类“键 值”格式的文件"""
+    text = _read(path)
+    if text is None:
+        return {}
+    result = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        try:
+            result[key] = int(value)
+        except ValueError:
+            continue
+    return result
+
+
+def parse_pressure(text):
+    """解析 PSI 文件，返回 {"some": avg10, "full": avg10}（百分比）"""
+    result = {}
+    for line in (text or "").splitlines():
+        kind, *fields = line.split()
+        for field in fields:
+            name, _, value = field.partition("=")
+            if name == "avg10":
+                result[kind] = float(value)
+    return result
+
+
+class CgroupSource:
+    """读取当前进程所在 cgroup 的配额与用量，同时支持 v1 与 v2（含 v1/v2 混合挂载）。
+
+    dirs 为各控制器对应的目录：v2 下 cpu / memory / pressure 都指向同一目录，
+    v1 下分别位于 cpu、cpuacct、memory 层级，压力（PSI）只在 v2 层级存在。
+    限额取当前目录及所有上级目录中最小的一个，systemd slice 的限制通常设在上级。
+    """
+
+    def __init__(self, version, dirs, mounts):
+        self.version = version
+        self.dirs = dirs
+        self._mounts = mounts  # 控制器 -> 层级挂载点，向上查找限额时到此为止
+
+    def _ancestors(self, controller):
+        path = self.dirs.get(controller)
+        top = self._mounts.get(controller)
+        while path:
+            yield path
+            if path == top or not path.startswith(top + "/"):
+                return
+            path = os.path.dirname(path)
+
+    def cpu_limit(self):
+        """可用的 CPU 核数：CFS 配额、cpuset 与主机核数中最小的一个"""
+        if hasattr(os, "sched_getaffinity"):
+            cores = float(len(os.sched_getaffinity(0)))
+        else:
+            cores = float(os.cpu_count() or 1)
+        for path in self._ancestors("cpu"):
+            if self.version == 2:
+                quota, _, period = (_read(os.path.join(path, "cpu.max")) or "max").partition(" ")
+                quota = None if quota == "max" else int(quota)
+                period = int(period or 100000)
+            else:
+                quota = _read_int(os.path.join(path, "cpu.cfs_quota_us"))
+                period = _read_int(os.path.join(path, "cpu.cfs_period_us")) or 100000
+            if quota is not None and quota > 0:
+                cores = min(cores, quota / period)
+        return cores
+
+    def memory_limit(self):
+        """生效的内存上限（字节），不超过主机物理内存"""
+        limit = psutil.virtual_memory().total
+        name = "memory.max" if self.version == 2 else "memory.limit_in_bytes"
+        for path in self._ancestors("memory"):
+            # v2 未限制时为 max，v1 未限制时为接近 2^63 的值，都按无限制处理
+            value = _read_int(os.path.join(path, name))
+            if value is not None and value > 0:
+                limit = min(limit, value)
+        return limit
+
+    def cpu_stat(self):
+        """返回 (累计 CPU 时间秒, 调度周期数, 被限流的周期数, 累计限流秒)"""
+        if self.version == 2:
+            stat = _read_keyed(os.path.join(self.dirs["cpu"], "cpu.stat"))
+            return (
+                stat.get("usage_usec", 0) / 1e6,
+                stat.get("nr_periods", 0),
+                stat.get("nr_throttled", 0),
+                stat.get("throttled_usec", 0) / 1e6,
+            )
+        stat = _read_keyed(os.path.join(self.dirs["cpu"], "cpu.stat"))
+        usage = _read_int(os.path.join(self.dirs.get("cpuacct", self.dirs["cpu"]), "cpuacct.usage")) or 0
+        return (
+            usage / 1e9,
+            stat.get("nr_periods", 0),
+            stat.get("nr_throttled", 0),
+            stat.get("throttled_time", 0) / 1e9,
+        )
+
+    def memory_usage(self):
+        """已用内存（字节），与 docker stats 一致地扣除可回收的非活跃文件页缓存"""
+        path = self.dirs["memory"]
+        stat = _read_keyed(os.path.join(path, "memory.stat"))
+        if self.version == 2:
+            used = _read_int(os.path.join(path, "memory.current")) or 0
+            inactive = stat.get("inactive_file", 0)
+        else:
+            used = _read_int(os.path.join(path, "memory.usage_in_bytes")) or 0
+            inactive = stat.get("total_inactive_file", 0)
+        return max(0, used - inactive)
+
+    def pressure(self, resource):
+        """cpu / memory 的 PSI；cgroup 没有 PSI（v1 或内核未开启）时返回空字典"""
+        path = self.dirs.get("pressure")
+        if path is None:
+            return {}
+        return parse_pressure(_read(os.path.join(path, f"{resource}.pressure")))
+
+
+def _resolve(mount, path):
+    # 容器内通常有 cgroup 命名空间，路径为 /；没有命名空间时该路径可能未挂载进来，回退到挂载点
+    full = os.path.normpath(os.path.join(mount, path.lstrip("/")))
+    return full if os.path.isdir(full) else mount
+
+
+def detect_cgroup(root=CGROUP_ROOT, proc_cgroup=PROC_CGROUP):
+    """根据 /proc/self/cgroup 确定当前进程的 cgroup 目录；不是 Linux 或未挂载 cgroup 时返回 None"""
+    text = _read(proc_cgroup)
+    if not text or not os.path.isdir(root):
+        return None
+    v1 = {}
+    unified = None
+    for line in text.splitlines():
+        _, controllers, path = line.split(":", 2)
+        if controllers == "":
+            unified = path
+        for controller in controllers.split(","):
+            v1[controller] = path
+
+    if os.path.exists(os.path.join(root, "cgroup.controllers")):
+        # 纯 v2
+        path = _resolve(root, unified or "/")
+        dirs = {"cpu": path, "memory": path, "pressure": path}
+        return CgroupSource(2, dirs, dict.fromkeys(dirs, root))
+
+    dirs = {}
+    mounts = {}
+    for controller in ("cpu", "cpuacct", "memory"):
+        mount = os.path.join(root, controller)
+        if controller in v1 and os.path.isdir(mount):
+            dirs[controller] = _resolve(mount, v1[controller])
+            mounts[controller] = mount
+    if "cpu" not in dirs or "memory" not in dirs:
+        return None
+    # 混合模式下 v2 层级挂载在 unified，只用于读取 PSI
+    unified_root = os.path.join(root, "unified")
+    if unified is not None and os.path.isdir(unified_root):
+        dirs["pressure"] = _resolve(unified_root, unified)
+        mounts["pressure"] = unified_root
+    return CgroupSource(1, dirs, mounts)
+
+
+class CgroupSampler:
+    """按 cgroup 配额计算 CPU 与内存占用：CPU 为 CPU 时间增量 / (经过时间 × 可用核数)，内存为已用 / 生效上限"""
+
+    def __init__(self, source, metrics):
+        self.source = source
+        self.metrics = set(metrics)
+        self._prev_cpu = None
+        self._limits_at = 0.0
+        self._cpu_limit = None
+        self._memory_limit = None
+
+    def _refresh_limits(self):
+        now = time.monotonic()
+        if self._cpu_limit is None or now - self._limits_at >= LIMIT_REFRESH_S:
+            self._cpu_limit = self.source.cpu_limit()
+            self._memory_limit = self.source.memory_limit()
+            self._limits_at = now
+
+    def sample_cpu(self):
+        """返回 {percent, limit, throttled_percent, throttled_ms, pressure}；首次调用只记录基线并返回 None"""
+        self._refresh_limits()
+        now = time.monotonic()
+        usage, periods, throttled, throttled_s = self.source.cpu_stat()
+        prev = self._prev_cpu
+        self._prev_cpu = (now, usage, periods, throttled, throttled_s)
+        if prev is None or now <= prev[0]:
+            return None
+        elapsed = now - prev[0]
+        d_periods = periods - prev[2]
+        return {
+            "percent": min(100.0, max(0.0, (usage - prev[1]) / (elapsed * self._cpu_limit) * 100)),
+            "limit": self._cpu_limit,
+            # 本次采样区间内被限流的调度周期占比
+            "throttled_percent": (throttled - prev[3]) / d_periods * 100 if d_periods > 0 else 0.0,
+            "throttled_ms": max(0.0, throttled_s - prev[4]) * 1000,
+            "pressure": self.source.pressure("cpu"),
+        }
+
+    def sample_memory(self):
+        """返回 {percent, used, limit, pressure}"""
+        self._refresh_limits()
+        used = self.source.memory_usage()
+        return {
+            "percent": min(100.0, used / self._memory_limit * 100) if self._memory_limit else 0.0,
+            "used": used,
+            "limit": self._memory_limit,
+            "pressure": self.source.pressure("memory"),
+        }
+
+
+def create_cgroup_sampler(scope_config=None):
+    """scope_config 中每个指标取 host / cgroup / auto（有生效的配额时按 cgroup 统计）；
+    没有指标需要按 cgroup 统计时返回 None"""
+    scope_config = scope_config or {}
+    scopes = {name: scope_config.get(name, "auto") for name in SCOPE_METRICS}
+    if all(scope == "host" for scope in scopes.values()):
+        return None
+    try:
+        source = detect_cgroup()
+    except Exception as e:
+        logger.warning(f"读取 cgroup 信息失败: {e}")
+        source = None
+    if source is None:
+        if "cgroup" in scopes.values():
+            logger.warning("未找到 cgroup，CPU 与内存按主机统计")
+        return None
+
+    limited = {
+        "cpu": source.cpu_limit() < (os.cpu_count() or 1),
+        "memory": source.memory_limit() < psutil.virtual_memory().total,
+    }
+    metrics = [
+        name for name, scope in scopes.items() if scope == "cgroup" or (scope == "auto" and limited[name])
+    ]
+    if not metrics:
+        return None
+    logger.info(f"按 cgroup v{source.version} 配额统计: {metrics}")
+    return CgroupSampler(source, metrics)
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# guest / guest_nice 在 Linux 上已计入 user / nice，计算总时间时排除，与 psutil.cpu_percent 一致
+_EXCLUDED_FIELDS = ("guest", "guest_nice")
+_IDLE_FIELDS = ("idle", "iowait")
+BREAKDOWN_FIELDS = ("user", "system", "iowait", "steal")
+
+
+@dataclass(frozen=True)
+class CpuBreakdown:
+    total: float
+    per_core: np.ndarray  # float32，每个核心的占用百分比
+    times: dict  # user / system / iowait / steal 占全部核心时间的百分比；平台没有的字段不出现
+
+
+class CpuTimesSampler:
+    """每次调用只从数据源取一次各核心的 CPU 时间，用数组运算得到各核心占用和时间分类，开销与核心数基本无关"""
+
+    def __init__(self, source=None):
+        from system_monitor.metric_sources import PsutilSource
+
+        self.source = source or PsutilSource()
+        self._prev = None
+        self._fields = None
+        self._busy_mask = None
+        self._total_mask = None
+        self._breakdown_index = {}
+
+    def _init_fields(self, fields):
+        self._fields = fields
+        self._total_mask = np.array([f not in _EXCLUDED_FIELDS for f in fields])
+        self._busy_mask = self._total_mask & np.array([f not in _IDLE_FIELDS for f in fields])
+        self._breakdown_index = {}
+        for name in BREAKDOWN_FIELDS:
+            if name in fields:
+                self._breakdown_index[name] = [fields.index(name)]
+        # nice 计入 user，softirq / irq 计入 system
+        for name, extra in (("user", "nice"), ("system", "irq"), ("system", "softirq")):
+            if name in self._breakdown_index and extra in fields:
+                self._breakdown_index[name].append(fields.index(extra))
+
+    def sample(self):
+        """返回与上次采样之间的 CpuBreakdown；首次调用或核心数变化时只记录基线并返回 None"""
+        fields, current = self.source.cpu_times()
+        if not len(current):
+            return None
+        prev = self._prev
+        self._prev = current
+        if fields != self._fields:
+            self._init_fields(fields)
+            return None
+        if prev is None or prev.shape != current.shape:
+            # 核心上线 / 下线时重新建立基线
+            return None
+
+        # 计数器偶尔回退（如虚拟机迁移）时按 0 处理
+        delta = np.maximum(current - prev, 0.0)
+        total = delta[:, self._total_mask].sum(axis=1)
+        busy = delta[:, self._busy_mask].sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_core = np.where(total > 0, busy / total * 100.0, 0.0).astype(np.float32)
+
+        all_total = float(total.sum())
+        if all_total <= 0:
+            return CpuBreakdown(0.0, per_core, {})
+        column_sums = delta.sum(axis=0)
+        breakdown = {
+            name: float(column_sums[idx].sum() / all_total * 100.0)
+            for name, idx in self._breakdown_index.items()
+        }
+        return CpuBreakdown(float(busy.sum() / all_total * 100.0), per_core, breakdown)
@@ -0,0 +1,64 @@
+import math
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+
+class CpuHeatStrip(QWidget):
+    """各核心占用的热力条：每个核心一个色块，核心多时自动换行，适配窄窗口"""
+
+    def __init__(self, config=None):
+        super().__init__()
+        config = config or {}
+        self.cell_height = config.get("cell_height", 4)
+        self.min_cell_width = config.get("min_cell_width", 4)
+        self.gap = config.get("gap", 1)
+        self.values = None
+        self._rows = 1
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(self.cell_height)
+
+    def set_values(self, values):
+        self.values = values
+        rows = self._layout(len(values))[1] if values is not None and len(values) else 1
+        if rows != self._rows:
+            self._rows = rows
+            self.setFixedHeight(rows * self.cell_height + (rows - 1) * self.gap)
+        self.update()
+
+    def _layout(self, count):
+        width = max(1, self.width() or self.minimumWidth() or 44)
+        columns = max(1, min(count, (width + self.gap) // (self.min_cell_width + self.gap)))
+        return columns, math.ceil(count / columns)
+
+    @staticmethod
+    def color_for(percent):
+        # 0% 绿色 → 50% 黄色 → 100% 红色
+        p = min(max(float(percent), 0.0), 100.0) / 100.0
+        hue = (1.0 - p) * 120.0 / 360.0
+        return QColor.fromHsvF(hue, 0.85, 0.9)
+
+    def paintEvent(self, event):
+        values = self.values
+        if values is None or not len(values):
+            return
+        count = len(values)
+        columns, _ = self._layout(count)
+        cell_w = (self.width() - (columns - 1) * self.gap) / columns
+        painter = QPainter(self)
+        for i in range(count):
+            row, col = divmod(i, columns)
+            rect = QRectF(
+                col * (cell_w + self.gap),
+                row * (self.cell_height + self.gap),
+                cell_w,
+                self.cell_height,
+            )
+            painter.fillRect(rect, self.color_for(values[i]))
+        painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.values is not None:
+            self.set_values(self.values)
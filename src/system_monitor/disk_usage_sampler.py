@@ -0,0 +1,145 @@
+import queue
+import threading
+from concurrent.futures import Future, wait
+
+import psutil
+
+from utils.logger import logger
+
+
+class _DaemonPool:
+    """固定数量的守护线程；卡在网络挂载上的调用不会阻止程序退出（ThreadPoolExecutor 退出时会等待线程）。
+
+    某个调用被判定为卡住时可以补充一个线程顶替它，顶替的线程数另有上限；
+    被顶替的线程等那次调用返回后直接退出，线程总数回到 max_workers。
+    """
+
+    def __init__(self, max_workers, name, max_spare=8):
+        self._name = name
+        self._jobs = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._replaced = set()  # 已有线程顶替的 Future
+        self._max_spare = max_spare
+        self._spawned = 0
+        self._threads = 0
+        for _ in range(max(1, max_workers)):
+            self._spawn()
+
+    def _spawn(self):
+        self._spawned += 1
+        self._threads += 1
+        threading.Thread(target=self._work, name=f"{self._name}-{self._spawned}", daemon=True).start()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            with self._lock:
+                if future in self._replaced:
+                    self._replaced.discard(future)
+                    self._threads -= 1
+                    return
+
+    def submit(self, fn, *args):
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def replace(self, future):
+        """future 所在的线程被卡住时补充一个线程；超过顶替上限时返回 False"""
+        with self._lock:
+            if future in self._replaced:
+                return True
+            if len(self._replaced) >= self._max_spare:
+                return False
+            self._replaced.add(future)
+            self._spawn()
+            return True
+
+    def saturated(self):
+        """顶替名额已用完，再有调用卡住时线程池容量就会减少"""
+        with self._lock:
+            return len(self._replaced) >= self._max_spare
+
+    def shutdown(self):
+        with self._lock:
+            threads = self._threads
+        for _ in range(threads):
+            self._jobs.put(None)
+
+
+def _usage_percent(mount):
+    usage = psutil.disk_usage(mount)
+    return (usage.used / usage.total) * 100 if usage.total else 0.0
+
+
+class DiskUsageSampler:
+    """在有界线程池中并发获取各挂载点的使用率，整体等待不超过 timeout_ms。
+
+    超时仍在执行的挂载点标记为 stale，并补充线程顶替，卡住的挂载点不会占满线程池；
+    之后的采样不再重复提交，也不再等待它，直到那次调用返回（挂载恢复）。
+    顶替名额用尽时，排在卡住的调用之后、等满超时仍未开始的挂载点同样标记为 stale。
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.timeout_s = config.get("timeout_ms", 1000) / 1000
+        max_workers = config.get("max_workers", 4)
+        self._pool = _DaemonPool(
+            max_workers, "disk-usage", config.get("max_spare_workers", 2 * max_workers)
+        )
+        self._inflight = {}
+        self._last = {}
+        self.stale = set()
+
+    def sample(self, mounts):
+        """返回 {挂载点: 使用率}；还没有成功取到过的挂载点为 None，stale 的挂载点沿用最后一次成功的值"""
+        for mount in mounts:
+            if mount not in self._inflight:
+                self._inflight[mount] = self._pool.submit(_usage_percent, mount)
+        # 已知无响应的挂载点不参与等待，否则每次采样都要耗满超时
+        pending = [self._inflight[m] for m in mounts if m not in self.stale]
+        wait(pending, timeout=self.timeout_s)
+
+        for mount in mounts:
+            future = self._inflight[mount]
+            if future.done():
+                del self._inflight[mount]
+                try:
+                    self._last[mount] = future.result()
+                except Exception:
+                    self._last[mount] = 0  # 磁盘不可用时设为0
+                if mount in self.stale:
+                    self.stale.discard(mount)
+                    logger.info(f"磁盘恢复响应: {mount}")
+            elif future.running():
+                # 曾因排队被标记为 stale 的调用开始执行后也可能卡住，重复调用不会多补线程
+                self._pool.replace(future)
+                if mount not in self.stale:
+                    self.stale.add(mount)
+                    logger.warning(f"磁盘无响应，暂停采样直到恢复: {mount}")
+        if self._pool.saturated():
+            # 顶替名额用完后线程可能都卡在无响应的挂载点上，等满超时仍未开始的调用同样跳过
+            for mount in mounts:
+                if mount in self._inflight and not self._inflight[mount].running():
+                    self.stale.add(mount)
+        result = {mount: self._last.get(mount) for mount in mounts}
+        # 已卸载的挂载点不再跟踪；仍在执行的调用结束后结果被丢弃
+        for mount in set(self._inflight) - set(mounts):
+            if self._inflight[mount].done() or self._inflight[mount].cancel():
+                del self._inflight[mount]
+        self.stale &= set(mounts)
+        return result
+
+    def close(self):
+        for future in self._inflight.values():
+            future.cancel()
+        self._pool.shutdown()
@@ -0,0 +1,133 @@
+import functools
+import os
+import re
+import sys
+import time
+
+import psutil
+
+
+SYS_CLASS_BLOCK = "/sys/class/block"
+# 默认忽略的虚拟设备
+DEFAULT_DISK_EXCLUDE = r"^(loop|ram|zram|dm-|sr)\d*"
+DEFAULT_NIC_EXCLUDE = r"^(lo|docker|veth|br-|virbr)"
+
+
+def format_rate(bps):
+    """字节/秒 → 紧凑文本，如 980B、12K、3.4M"""
+    for unit, size in (("G", 1 << 30), ("M", 1 << 20), ("K", 1 << 10)):
+        if bps >= size:
+            value = bps / size
+            return f"{value:.1f}{unit}" if value < 10 else f"{value:.0f}{unit}"
+    return f"{bps:.0f}B"
+
+
+def _sysfs_path(name, entry):
+    # sysfs 中设备名里的 / 写作 !（如 cciss/c0d0）
+    return os.path.join(SYS_CLASS_BLOCK, name.replace("/", "!"), entry)
+
+
+@functools.lru_cache(maxsize=256)
+def _is_partition(name):
+    return os.path.exists(_sysfs_path(name, "partition"))
+
+
+@functools.lru_cache(maxsize=256)
+def _is_stacked(name):
+    # md RAID、LVM / dm-crypt 等建立在其他块设备之上，slaves 中列出下层设备
+    try:
+        return bool(os.listdir(_sysfs_path(name, "slaves")))
+    except OSError:
+        return False
+
+
+def _physical_disks(names):
+    """只保留物理整盘，避免汇总时重复计算。
+
+    Linux 同时列出 sda 和 sda1 / nvme0n1 和 nvme0n1p1，md0 与它的成员盘 sda、sdb，
+    dm-0 与它下层的磁盘；分区和叠加设备的 I/O 都已计入下层整盘，与默认排除 dm- 的做法一致。
+    按 sysfs 判断，不按名称推断（nvme0n10、md10 也可能是独立的整盘）；
+    Windows 的 PhysicalDriveN 和 macOS 的 diskN 都是整盘，不需要过滤。
+    """
+    if not sys.platform.startswith("linux"):
+        return set(names)
+    return {n for n in names if not _is_partition(n) and not _is_stacked(n)}
+
+
+class CounterRates:
+    """把累计计数器转换为两次采样之间的速率；新出现的设备从下一次采样开始计算，消失的设备直接丢弃"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._prev = {}
+        self._prev_time = None
+
+    def update(self, counters, now=None):
+        now = time.monotonic() if now is None else now
+        prev, prev_time = self._prev, self._prev_time
+        self._prev = {name: tuple(getattr(c, f) for f in self.fields) for name, c in counters.items()}
+        self._prev_time = now
+        if prev_time is None or now <= prev_time:
+            return {}
+        elapsed = now - prev_time
+        rates = {}
+        for name, values in self._prev.items():
+            old = prev.get(name)
+            if old is None:
+                continue
+            # 计数器回绕或设备重置时差值为负，本次按 0 处理
+            rates[name] = {
+                f: max(0, v - o) / elapsed for f, v, o in zip(self.fields, values, old)
+            }
+        return rates
+
+
+class IORateSampler:
+    """磁盘读写字节数 / IOPS 与网卡收发速率"""
+
+    DISK_FIELDS = ("read_bytes", "write_bytes", "read_count", "write_count")
+    NIC_FIELDS = ("bytes_recv", "bytes_sent")
+
+    def __init__(self, config=None, source=None):
+        config = config or {}
+        self.source = source
+        self.disks = set(config.get("disks") or [])
+        self.nics = set(config.get("nics") or [])
+        self.disk_exclude = re.compile(config.get("disk_exclude", DEFAULT_DISK_EXCLUDE))
+        self.nic_exclude = re.compile(config.get("nic_exclude", DEFAULT_NIC_EXCLUDE))
+        self._disk = CounterRates(self.DISK_FIELDS)
+        self._nic = CounterRates(self.NIC_FIELDS)
+
+    def _wanted(self, name, explicit, exclude):
+        return name in explicit if explicit else not exclude.match(name)
+
+    def sample(self, now=None):
+        """返回 {"disk_io": {设备: {...}}, "net_io": {网卡: {...}}}；首次采样为空"""
+        now = time.monotonic() if now is None else now
+        if self.source is not None:
+            disks = self.source.disk_io_counters()
+        else:
+            disks = psutil.disk_io_counters(perdisk=True) or {}
+        nics = psutil.net_io_counters(pernic=True) or {}
+        wanted_disks = {k for k in disks if self._wanted(k, self.disks, self.disk_exclude)}
+        if not self.disks:
+            wanted_disks = _physical_disks(wanted_disks)
+        disk_rates = self._disk.update({k: disks[k] for k in wanted_disks}, now)
+        nic_rates = self._nic.update(
+            {k: v for k, v in nics.items() if self._wanted(k, self.nics, self.nic_exclude)}, now
+        )
+        return {
+            "disk_io": {
+                name: {
+                    "read_bps": r["read_bytes"],
+                    "write_bps": r["write_bytes"],
+                    "read_iops": r["read_count"],
+                    "write_iops": r["write_count"],
+                }
+                for name, r in disk_rates.items()
+            },
+            "net_io": {
+                name: {"rx_bps": r["bytes_recv"], "tx_bps": r["bytes_sent"]}
+                for name, r in nic_rates.items()
+            },
+        }
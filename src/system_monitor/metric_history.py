@@ -0,0 +1,68 @@
+from array import array
+
+
+class RingBuffer:
+    """定长环形缓冲区，数据存放在预分配的 array 中，追加时不创建新的 Python 对象，内存占用与运行时长无关"""
+
+    def __init__(self, capacity, typecode="f"):
+        if capacity <= 0:
+            raise ValueError("capacity 必须大于 0")
+        self.capacity = capacity
+        self._data = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._head = 0  # 下一个写入位置
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def last(self, default=0.0):
+        if not self._count:
+            return default
+        return self._data[self._head - 1]
+
+    def ordered(self):
+        """按时间从旧到新返回数据（array 拷贝）"""
+        if self._count < self.capacity:
+            return self._data[: self._count]
+        return self._data[self._head :] + self._data[: self._head]
+
+    def buckets(self, count):
+        """把数据按时间分成 count 段，每段取最大值；点数多于像素时短暂的峰值不会被平均掉"""
+        data = self.ordered()
+        n = len(data)
+        if n <= count:
+            return data
+        return array(
+            data.typecode,
+            (max(data[i * n // count : (i + 1) * n // count]) for i in range(count)),
+        )
+
+
+class MetricHistory:
+    """按指标名保存各自的环形缓冲区"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buffers = {}
+
+    def buffer(self, name):
+        buf = self._buffers.get(name)
+        if buf is None:
+            buf = self._buffers[name] = RingBuffer(self.capacity)
+        return buf
+
+    def append(self, name, value):
+        self.buffer(name).append(value)
+
+    def names(self):
+        return list(self._buffers)
@@ -0,0 +1,133 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+class TimerWheel:
+    """哈希时间轮：按 tick_ms 划分槽位，到期的键在同一 tick 内一起取出。
+
+    调度和取出都是 O(1)（不计同槽位中尚未到期的条目）；长时间未推进时直接扫描全部槽位。
+    """
+
+    def __init__(self, tick_ms=50, slots=256):
+        self.tick_ms = tick_ms
+        self._slots = [[] for _ in range(slots)]
+        self._due = {}  # key -> 到期 tick
+        self._tick = self._now_tick()
+
+    def _now_tick(self, now=None):
+        return int((time.monotonic() if now is None else now) * 1000 // self.tick_ms)
+
+    def __len__(self):
+        return len(self._due)
+
+    def schedule(self, key, delay_ms, now=None):
+        # 向上取整，保证不会早于 delay_ms 到期
+        due = self._now_tick(now) + max(0, -(-int(delay_ms) // self.tick_ms))
+        self._due[key] = due
+        self._slots[due % len(self._slots)].append((key, due))
+
+    def cancel(self, key):
+        # 槽位中的旧条目在取出时按 _due 校验后丢弃
+        self._due.pop(key, None)
+
+    def advance(self, now=None):
+        """返回到当前 tick 为止到期的键"""
+        now_tick = self._now_tick(now)
+        n = len(self._slots)
+        if now_tick - self._tick >= n:
+            indexes = range(n)
+        else:
+            indexes = [t % n for t in range(self._tick, now_tick + 1)]
+        fired = []
+        for i in indexes:
+            slot = self._slots[i]
+            keep = []
+            for key, due in slot:
+                if self._due.get(key) != due:
+                    continue  # 已取消或已重新调度
+                if due <= now_tick:
+                    del self._due[key]
+                    fired.append(key)
+                else:
+                    keep.append((key, due))
+            self._slots[i] = keep
+        # 当前 tick 的槽位下次还会再扫描一次，本 tick 内新调度的 0 延迟条目不会漏掉
+        self._tick = now_tick
+        return fired
+
+    def next_delay_ms(self, now=None):
+        """距最近一个到期键的毫秒数；没有任何键时返回 None"""
+        if not self._due:
+            return None
+        now_ms = (time.monotonic() if now is None else now) * 1000
+        return max(0.0, min(self._due.values()) * self.tick_ms - now_ms)
+
+
+@dataclass
+class MetricCollector:
+    name: str
+    collect: Callable[[dict], None]  # 把采样结果写入本帧的快照
+    interval_ms: int = 0  # 0 表示跟随自适应采样间隔
+
+
+class MetricScheduler:
+    """各采集器按自己的间隔运行，共用一个时间轮；同一帧内到期的采集器一起执行，结果合并为一次更新"""
+
+    def __init__(self, collectors, tick_ms=50):
+        self.collectors = {c.name: c for c in collectors}
+        self.wheel = TimerWheel(tick_ms)
+        self.adaptive_interval = 2000
+        self.paused = False
+        self.schedule_all()
+
+    def schedule_all(self, delay_ms=0):
+        """所有采集器在 delay_ms 后执行（启动、恢复显示时立即采样一次）"""
+        self.paused = False
+        for name in self.collectors:
+            self.wheel.schedule(name, delay_ms)
+
+    def pause(self):
+        self.paused = True
+        for name in self.collectors:
+            self.wheel.cancel(name)
+
+    def interval_of(self, collector):
+        return collector.interval_ms or self.adaptive_interval
+
+    def set_adaptive_interval(self, interval_ms):
+        """interval_ms 为 None 时暂停全部采集，直到 schedule_all 恢复"""
+        if interval_ms is None:
+            self.pause()
+        else:
+            self.adaptive_interval = interval_ms
+
+    def run_due(self, frame, on_error=None):
+        """执行到期的采集器，返回本帧执行过的采集器名称；调用方更新间隔后再 reschedule"""
+        ran = []
+        for name in self.wheel.advance():
+            collector = self.collectors.get(name)
+            if collector is None:
+                continue
+            try:
+                collector.collect(frame)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(name, e)
+            ran.append(name)
+        return ran
+
+    def reschedule(self, names):
+        if self.paused:
+            return
+        for name in names:
+            self.wheel.schedule(name, self.interval_of(self.collectors[name]))
+
+    def hasten_adaptive(self):
+        """悬停等情况下让跟随自适应间隔的采集器立即执行"""
+        for c in self.collectors.values():
+            if not c.interval_ms:
+                self.wheel.schedule(c.name, 0)
+
+    def next_delay_ms(self):
+        return self.wheel.next_delay_ms()
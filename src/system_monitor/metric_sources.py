@@ -0,0 +1,202 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import psutil
+
+from utils.logger import logger
+
+
+# 与 psutil.disk_io_counters 中用到的字段一致，供 IORateSampler 按属性读取
+DiskCounters = namedtuple("DiskCounters", "read_count write_count read_bytes write_bytes")
+# /proc/stat 中 cpuN 行的列顺序，与 psutil 在 Linux 上的 cpu_times 字段一致
+PROC_CPU_FIELDS = (
+    "user",
+    "nice",
+    "system",
+    "idle",
+    "iowait",
+    "irq",
+    "softirq",
+    "steal",
+    "guest",
+    "guest_nice",
+)
+SECTOR_SIZE = 512
+# /proc/stat 中的 CPU 时间以 USER_HZ 为单位，换算为秒后与 psutil 一致
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class PsutilSource:
+    """通过 psutil 获取原始计数器，所有平台可用"""
+
+    name = "psutil"
+
+    def cpu_times(self):
+        """返回 (字段名, shape 为 (核心数, 字段数) 的数组)，单位为秒"""
+        times = psutil.cpu_times(percpu=True)
+        return times[0]._fields, np.array(times, dtype=np.float64)
+
+    def memory_percent(self):
+        return psutil.virtual_memory().percent
+
+    def disk_io_counters(self):
+        return psutil.disk_io_counters(perdisk=True) or {}
+
+    def close(self):
+        pass
+
+
+class _ProcFile:
+    """保持打开的 /proc 文件，每次用 preadv 从偏移 0 读入预分配的缓冲区，不重复 open / close"""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buf = bytearray(size)
+
+    def read(self):
+        while True:
+            n = os.preadv(self.fd, [self.buf], 0)
+            if n < len(self.buf):
+                return bytes(memoryview(self.buf)[:n])
+            # 内容比缓冲区大（如新增设备），扩容后重读
+            self.buf = bytearray(len(self.buf) * 2)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProcSource:
+    """Linux 快速路径：直接解析 /proc/stat、/proc/meminfo、/proc/diskstats
+
+    cpu_times 的结果写入两块预分配的数组，轮流使用：调用方保留的上一次结果在下一次调用后仍然有效，
+    再下一次调用时被覆盖。核心数变化时重新分配。
+    """
+
+    name = "proc"
+
+    def __init__(self):
+        ncpu = os.cpu_count() or 1
+        self._stat = _ProcFile("/proc/stat", 4096 + ncpu * 256)
+        self._meminfo = _ProcFile("/proc/meminfo", 8192)
+        self._diskstats = _ProcFile("/proc/diskstats", 16384)
+        self._cpu_buffers = [np.empty((ncpu, len(PROC_CPU_FIELDS))) for _ in range(2)]
+        self._cpu_turn = 0
+
+    def _cpu_buffer(self, shape):
+        self._cpu_turn ^= 1
+        buf = self._cpu_buffers[self._cpu_turn]
+        if buf.shape != shape:
+            buf = self._cpu_buffers[self._cpu_turn] = np.empty(shape)
+        return buf
+
+    def cpu_times(self):
+        data = self._stat.read()
+        start = data.index(b"\ncpu0") + 1
+        end = data.index(b"\n", data.rindex(b"\ncpu") + 1)
+        # 去掉 "cpu" 前缀后整块交给 numpy 解析，第一列是核心编号
+        block = data[start:end].replace(b"cpu", b"")
+        rows = block.count(b"\n") + 1
+        parsed = np.fromstring(block, dtype=np.float64, sep=" ").reshape(rows, -1)
+        values = self._cpu_buffer((rows, parsed.shape[1] - 1))
+        np.divide(parsed[:, 1:], CLOCK_TICKS, out=values)
+        return PROC_CPU_FIELDS[: values.shape[1]], values
+
+    def memory_percent(self):
+        data = self._meminfo.read()
+        total = _meminfo_kb(data, b"MemTotal:")
+        if not total:
+            return 0.0
+        available = _meminfo_kb(data, b"MemAvailable:")
+        if available is None:
+            # 3.14 之前的内核及部分容器没有 MemAvailable，按 psutil 的回退方式估算
+            available = sum(
+                _meminfo_kb(data, key) or 0 for key in (b"MemFree:", b"Buffers:", b"Cached:")
+            )
+        return (total - available) / total * 100
+
+    def disk_io_counters(self):
+        counters = {}
+        for line in self._diskstats.read().splitlines():
+            parts = line.split()
+            if len(parts) < 10:
+                continue
+            counters[parts[2].decode()] = DiskCounters(
+                int(parts[3]),
+                int(parts[7]),
+                int(parts[5]) * SECTOR_SIZE,
+                int(parts[9]) * SECTOR_SIZE,
+            )
+        return counters
+
+    def close(self):
+        for f in (self._stat, self._meminfo, self._diskstats):
+            f.close()
+
+
+def _meminfo_kb(data, key):
+    """key 须在行首（避免 Cached: 匹配到 SwapCached:）；没有该字段时返回 None"""
+    if data.startswith(key):
+        i = 0
+    else:
+        i = data.find(b"\n" + key) + 1
+        if i == 0:
+            return None
+    return int(data[i + len(key) : data.index(b"kB", i)])
+
+
+def create_source(kind="auto"):
+    """kind: auto（Linux 上优先 /proc）/ proc / psutil；/proc 不可用时回退到 psutil"""
+    if kind in ("auto", "proc") and sys.platform.startswith("linux"):
+        try:
+            source = ProcSource()
+            source.cpu_times()
+            source.memory_percent()
+            return source
+        except Exception as e:
+            logger.warning(f"/proc 采集不可用，回退到 psutil: {e}")
+    return PsutilSource()
+
+
+def bench(iterations=2000):
+    """每个数据源采集一次 CPU / 内存 / 磁盘计数器的平均耗时（微秒）"""
+    sources = [PsutilSource()]
+    if sys.platform.startswith("linux"):
+        sources.append(ProcSource())
+    results = {}
+    for source in sources:
+        for _ in range(10):
+            source.cpu_times(), source.memory_percent(), source.disk_io_counters()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            source.cpu_times()
+            source.memory_percent()
+            source.disk_io_counters()
+        results[source.name] = (time.perf_counter() - start) / iterations * 1e6
+        source.close()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="系统监控数据源")
+    parser.add_argument("--bench", action="store_true", help="对比 psutil 与 /proc 每次采集的耗时")
+    parser.add_argument("--iterations", type=int, default=2000, help="每个数据源的采集次数")
+    args = parser.parse_args()
+
+    if args.bench:
+        results = bench(args.iterations)
+        print(f"cpu={os.cpu_count()}, iterations={args.iterations}")
+        for name, us in results.items():
+            print(f"{name}: {us:.1f} us/tick")
+        if "proc" in results:
+            print(f"speedup={results['psutil'] / max(results['proc'], 1e-9):.1f}x")
+    else:
+        source = create_source()
+        fields, times = source.cpu_times()
+        print(f"source={source.name}, cpus={len(times)}, fields={fields}")
+        print(f"memory={source.memory_percent():.1f}%, disks={sorted(source.disk_io_counters())}")
@@ -0,0 +1,215 @@
+import os
+import re
+import select
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import psutil
+
+from utils.logger import logger
+
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+# 伪文件系统 / 只读镜像 / 容器层，不是用户关心的“磁盘”
+DEFAULT_EXCLUDE_FSTYPES = (
+    "autofs",
+    "binfmt_misc",
+    "bpf",
+    "cgroup",
+    "cgroup2",
+    "configfs",
+    "debugfs",
+    "devpts",
+    "devtmpfs",
+    "efivarfs",
+    "fuse.gvfsd-fuse",
+    "fuse.portal",
+    "fusectl",
+    "hugetlbfs",
+    "mqueue",
+    "nsfs",
+    "overlay",
+    "proc",
+    "pstore",
+    "ramfs",
+    "rpc_pipefs",
+    "securityfs",
+    "selinuxfs",
+    "squashfs",
+    "sysfs",
+    "tmpfs",
+    "tracefs",
+)
+# /run 本身及其下大多是 tmpfs / nsfs，已按文件系统类型排除；不能整体排除 /run，
+# udisks2 把可移动磁盘自动挂载在 /run/media/<用户>/ 下，只排除运行时目录中已知的挂载点
+DEFAULT_EXCLUDE_MOUNTPOINTS = (
+    "/proc",
+    "/sys",
+    "/dev",
+    "/run/user",
+    "/run/credentials",
+    "/run/snapd",
+    "/run/docker",
+    "/run/containerd",
+    "/run/netns",
+    "/snap",
+    "/var/lib/docker",
+    "/boot/efi",
+)
+NETWORK_FSTYPES = ("nfs", "nfs4", "cifs", "smbfs", "smb3", "sshfs", "fuse.sshfs", "9p", "ceph", "glusterfs")
+
+
+@dataclass(frozen=True)
+class Mount:
+    device: str
+    mountpoint: str
+    fstype: str
+    dev_id: str = ""  # Linux 为 major:minor，用于合并 bind mount
+
+    @property
+    def is_network(self):
+        return self.fstype in NETWORK_FSTYPES
+
+
+def _unescape(field):
+    # mountinfo 中空格、制表符、换行和反斜杠以 \040 这样的八进制形式转义
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def parse_mountinfo(text):
+    mounts = []
+    for line in text.splitlines():
+        pre, sep, post = line.partition(" - ")
+        if not sep:
+            continue
+        fields = pre.split()
+        tail = post.split()
+        if len(fields) < 5 or len(tail) < 2:
+            continue
+        mounts.append(Mount(_unescape(tail[1]), _unescape(fields[4]), tail[0], fields[2]))
+    return mounts
+
+
+def display_name(mount):
+    """界面上显示的短名称：Windows 盘符显示为“C盘”，Linux 挂载点取最后一级目录"""
+    if len(mount) >= 2 and mount[1] == ":":
+        return f"{mount[0].upper()}盘"
+    if mount in ("/", ""):
+        return "根"
+    return os.path.basename(mount.rstrip("/")) or mount
+
+
+class MountTable:
+    """读取并缓存挂载表；只有挂载表变化时才重新读取。
+
+    Linux 上 /proc/self/mountinfo 在挂载变化时会对 poll 报告 POLLPRI，检查变化不需要重新读文件；
+    其他平台按 poll_interval 秒重新调用 psutil.disk_partitions 比较。
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        # 配置中的规则追加在内置规则之后
+        self.exclude_fstypes = set(DEFAULT_EXCLUDE_FSTYPES) | set(config.get("exclude_fstypes", []))
+        self.exclude_mountpoints = DEFAULT_EXCLUDE_MOUNTPOINTS + tuple(
+            config.get("exclude_mountpoints", [])
+        )
+        self.include_network = config.get("include_network", True)
+        self.poll_interval = config.get("poll_interval", 30)
+        self._lock = threading.Lock()
+        self._mounts = None
+        self._file = None
+        self._poller = None
+        self._checked_at = 0.0
+
+    def _include(self, m):
+        if m.fstype in self.exclude_fstypes:
+            return False
+        if m.is_network and not self.include_network:
+            return False
+        return not any(
+            m.mountpoint == p or m.mountpoint.startswith(p.rstrip("/") + "/")
+            for p in self.exclude_mountpoints
+        )
+
+    def _read_linux(self):
+        if self._file is None:
+            self._file = open(MOUNTINFO_PATH, "rb")
+            self._poller = select.poll()
+            self._poller.register(self._file.fileno(), select.POLLPRI | select.POLLERR)
+            # 打开后首次 poll 不代表变化，先消耗掉
+            self._poller.poll(0)
+        self._file.seek(0)
+        return parse_mountinfo(self._file.read().decode("utf-8", errors="replace"))
+
+    def _read(self):
+        if sys.platform.startswith("linux") and os.path.exists(MOUNTINFO_PATH):
+            mounts = self._read_linux()
+        else:
+            mounts = [
+                Mount(p.device, p.mountpoint, p.fstype)
+                for p in psutil.disk_partitions(all=False)
+                # 光驱等可移动介质没有插入光盘时 disk_usage 会失败或阻塞
+                if "cdrom" not in p.opts
+            ]
+        result = []
+        seen = set()
+        for m in mounts:
+            if not self._include(m):
+                continue
+            # 同一设备 bind mount 到多处时只保留第一个挂载点
+            key = m.dev_id or m.mountpoint
+            if key in seen:
+                continue
+            seen.add(key)
+            result.append(m)
+        self._checked_at = time.monotonic()
+        return result
+
+    def _changed(self):
+        if self._poller is not None:
+            return bool(self._poller.poll(0))
+        return time.monotonic() - self._checked_at >= self.poll_interval
+
+    def mounts(self):
+        """当前挂载点（已过滤）；挂载表未变化时直接返回缓存"""
+        with self._lock:
+            if self._mounts is None or self._changed():
+                previous = self._mounts
+                self._mounts = self._read()
+                if previous is not None and previous != self._mounts:
+                    logger.info(f"挂载表变化: {[m.mountpoint for m in self._mounts]}")
+            return list(self._mounts)
+
+    def mountpoints(self):
+        """可直接传给 psutil.disk_usage 的路径；Windows 盘符去掉结尾的反斜杠（如 C:）"""
+        return [
+            m.mountpoint.rstrip("\\") if sys.platform == "win32" else m.mountpoint
+            for m in self.mounts()
+        ]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = self._poller = None
+
+
+_default_table = None
+_default_lock = threading.Lock()
+
+
+def default_mount_table(config=None):
+    """进程内共享的挂载表；首次调用时的配置生效"""
+    global _default_table
+    with _default_lock:
+        if _default_table is None:
+            _default_table = MountTable(config)
+        return _default_table
+
+
+def discover_mounts(config=None):
+    mounts = default_mount_table(config).mountpoints()
+    logger.info(f"当前可用的磁盘：{mounts}")
+    return mounts
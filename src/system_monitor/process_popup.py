@@ -0,0 +1,167 @@
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtGui import QGuiApplication
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QFrame,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from system_monitor.io_rates import format_rate
+from system_monitor.process_worker import ProcessWorker
+from utils.logger import logger
+
+
+COLUMNS = ("进程", "PID", "CPU", "内存", "IO")
+# 可点击表头排序的列；排序在采样时完成，取的是该指标最高的 N 个进程
+SORT_COLUMNS = {2: "cpu", 3: "memory", 4: "io"}
+
+
+class ProcessPopup(QWidget):
+    """占用最高的进程列表；采样线程随弹窗显示启动、隐藏停止"""
+
+    def __init__(self, config=None):
+        super().__init__()
+        config = config or {}
+        self.limit = config.get("limit", 10)
+        self.worker = ProcessWorker(config.get("interval", 2000), self.limit, config.get("sort", "cpu"))
+        self.worker.processes_updated.connect(self.update_processes)
+        self.worker.error_occurred.connect(self.handle_error)
+        self.setup_window()
+        self.setup_ui()
+
+    def setup_window(self):
+        self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+    def setup_ui(self):
+        root_layout = QHBoxLayout(self)
+        root_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.frame = QFrame()
+        self.frame.setObjectName("popupFrame")
+        root_layout.addWidget(self.frame)
+
+        layout = QVBoxLayout(self.frame)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(8)
+
+        header_layout = QHBoxLayout()
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        header_layout.addWidget(QLabel(f"占用最高的 {self.limit} 个进程"), 1)
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItem("按 CPU", "cpu")
+        self.sort_combo.addItem("按内存", "memory")
+        self.sort_combo.addItem("按 IO", "io")
+        self.sort_combo.setCurrentIndex(max(0, self.sort_combo.findData(self.worker.sampler.sort_key)))
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_changed)
+        header_layout.addWidget(self.sort_combo)
+        layout.addLayout(header_layout)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setFocusPolicy(Qt.NoFocus)
+        self.table.setShowGrid(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.sectionClicked.connect(self.on_header_clicked)
+        self.update_sort_indicator()
+        layout.addWidget(self.table, 1)
+
+        self.setStyleSheet(
+            """
+            QFrame#popupFrame {
+                background-color: rgba(225, 240, 249, 230);
+                border-radius: 6px;
+            }
+            QTableWidget {
+                background: transparent;
+                border: 1px solid rgba(0, 0, 0, 25);
+                border-radius: 4px;
+            }
+            QHeaderView::section {
+                background: transparent;
+                border: none;
+                border-bottom: 1px solid rgba(0, 0, 0, 25);
+                padding: 2px 6px;
+            }
+            """
+        )
+
+        self.setFixedSize(420, 120 + self.limit * 24)
+
+    def update_processes(self, rows):
+        """原地更新表格内容，不重建单元格"""
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            values = (
+                row.name,
+                str(row.pid),
+                f"{row.cpu:.1f}%",
+                format_rate(row.rss),
+                f"{format_rate(row.io_bps)}/s",
+            )
+            for column, text in enumerate(values):
+                item = self.table.item(i, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(i, column, item)
+                item.setText(text)
+
+    def on_sort_changed(self, _index):
+        sort_key = self.sort_combo.currentData()
+        if sort_key:
+            self.worker.set_sort_key(sort_key)
+            self.update_sort_indicator()
+
+    def on_header_clicked(self, column):
+        sort_key = SORT_COLUMNS.get(column)
+        if sort_key is None:
+            # 进程名 / PID 列不参与排序，恢复当前排序列的指示
+            self.update_sort_indicator()
+            return
+        self.sort_combo.setCurrentIndex(self.sort_combo.findData(sort_key))
+
+    def update_sort_indicator(self):
+        sort_key = self.worker.sampler.sort_key
+        column = next(c for c, k in SORT_COLUMNS.items() if k == sort_key)
+        self.table.horizontalHeader().setSortIndicator(column, Qt.DescendingOrder)
+
+    def handle_error(self, error_msg):
+        logger.warning(f"进程列表采样失败: {error_msg}")
+
+    def show_near(self, anchor: QPoint):
+        """在 anchor 附近显示，超出屏幕时向内收"""
+        screen = QGuiApplication.screenAt(anchor) or QGuiApplication.primaryScreen()
+        available = screen.availableGeometry()
+        x = max(available.left(), min(anchor.x(), available.right() - self.width() + 1))
+        y = max(available.top(), min(anchor.y(), available.bottom() - self.height() + 1))
+        self.move(QPoint(x, y))
+        self.show()
+
+    def showEvent(self, event):
+        self.worker.resume()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.worker.stop()
+        super().hideEvent(event)
+
+    def close_worker(self):
+        self.worker.stop()
+        self.worker.wait()
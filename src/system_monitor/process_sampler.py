@@ -0,0 +1,90 @@
+import heapq
+import time
+from dataclasses import dataclass
+
+import psutil
+
+
+# 每个进程一次取齐，as_dict 内部使用 oneshot，同一进程的属性只读一次 /proc/<pid>/stat 等文件
+PROCESS_ATTRS = ["name", "cpu_percent", "memory_info", "io_counters"]
+SORT_KEYS = ("cpu", "memory", "io")
+
+
+@dataclass(frozen=True)
+class ProcessRow:
+    pid: int
+    name: str
+    cpu: float  # 与 top 一致，多核进程可超过 100%
+    rss: int
+    io_bps: float  # 读写字节速率之和；无权限读取时为 0
+
+
+class ProcessSampler:
+    """增量采样占用最高的 N 个进程。
+
+    psutil.Process 对象在多次采样之间复用：cpu_percent 依赖对象内保存的上次 CPU 时间，
+    复用后不需要额外等待即可得到区间内的占用；只为新出现的 pid 创建对象，已退出的直接丢弃。
+    取前 N 个时用 heapq.nlargest（O(n log N)），不对全部进程排序。
+    """
+
+    def __init__(self, limit=10, sort_key="cpu"):
+        self.limit = limit
+        self.sort_key = sort_key if sort_key in SORT_KEYS else "cpu"
+        self._procs = {}  # pid -> Process
+        self._io = {}  # pid -> (采样时间, 累计读写字节)
+
+    def _handles(self):
+        pids = set(psutil.pids())
+        for pid in set(self._procs) - pids:
+            del self._procs[pid]
+            self._io.pop(pid, None)
+        for pid in pids - set(self._procs):
+            try:
+                self._procs[pid] = psutil.Process(pid)
+            except psutil.Error:
+                continue
+        return list(self._procs.items())
+
+    def sample(self):
+        """返回按 sort_key 排序的前 limit 个 ProcessRow；新出现的进程首次采样时 CPU 与 IO 为 0"""
+        rows = []
+        now = time.monotonic()
+        for pid, proc in self._handles():
+            try:
+                # Process 对象缓存了创建时间，as_dict 取到的也是缓存值；
+                # is_running 会重新读取创建时间比较，pid 被新进程复用时返回 False
+                if not proc.is_running():
+                    self._io.pop(pid, None)
+                    proc = self._procs[pid] = psutil.Process(pid)
+                info = proc.as_dict(PROCESS_ATTRS, ad_value=None)
+            except psutil.Error:
+                # 进程在两次采样之间退出
+                self._procs.pop(pid, None)
+                self._io.pop(pid, None)
+                continue
+            rows.append(self._row(pid, info, now))
+
+        key = {
+            "cpu": lambda r: r.cpu,
+            "memory": lambda r: r.rss,
+            "io": lambda r: r.io_bps,
+        }[self.sort_key]
+        return heapq.nlargest(self.limit, rows, key=key)
+
+    def _row(self, pid, info, now):
+        io_bps = 0.0
+        io = info["io_counters"]
+        if io is not None:
+            total = io.read_bytes + io.write_bytes
+            prev = self._io.get(pid)
+            self._io[pid] = (now, total)
+            if prev is not None and now > prev[0]:
+                io_bps = max(0, total - prev[1]) / (now - prev[0])
+        memory = info["memory_info"]
+        return ProcessRow(
+            pid,
+            info["name"] or str(pid),
+            info["cpu_percent"] or 0.0,
+            memory.rss if memory is not None else 0,
+            io_bps,
+        )
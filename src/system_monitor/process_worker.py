@@ -0,0 +1,54 @@
+import threading
+
+from PySide6.QtCore import QThread, Signal
+
+from system_monitor.process_sampler import ProcessSampler
+from utils.logger import logger
+
+
+class ProcessWorker(QThread):
+    """进程列表采样线程；只在弹窗显示期间运行"""
+
+    # [ProcessRow]
+    processes_updated = Signal(list)
+    error_occurred = Signal(str)
+
+    def __init__(self, interval=2000, limit=10, sort_key="cpu"):
+        super().__init__()
+        self._running = False
+        self.interval = interval
+        # 采样器跨多次显示保留，进程对象与 CPU 基线不必重新建立
+        self.sampler = ProcessSampler(limit, sort_key)
+        self._wake = threading.Event()
+
+    def run(self):
+        while self._running:
+            try:
+                self.processes_updated.emit(self.sampler.sample())
+            except Exception as e:
+                self.error_occurred.emit(str(e))
+            self._wake.wait(self.interval / 1000)
+            self._wake.clear()
+        logger.info("关闭 Process Worker 线程")
+
+    def resume(self):
+        """开始（或继续）采样"""
+        if self.isRunning() and not self._running:
+            # 上次隐藏时的最后一轮采样尚未结束
+            self.wait()
+        self._running = True
+        if not self.isRunning():
+            self.start()
+
+    def refresh(self):
+        """立即采样一次（如切换排序方式）"""
+        self._wake.set()
+
+    def set_sort_key(self, sort_key):
+        self.sampler.sort_key = sort_key
+        self.refresh()
+
+    def stop(self):
+        """停止线程"""
+        self._running = False
+        self._wake.set()
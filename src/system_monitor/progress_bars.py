@@ -37,3 +37,17 @@ class MemoryProgressBar(SystemProgressBar):
 
     def __init__(self, config):
         super().__init__(config.get("colors", {}).get("memory", "#2196F3"), config)
+
+
+class DiskIOProgressBar(SystemProgressBar):
+    """磁盘读写速率进度条"""
+
+    def __init__(self, config):
+        super().__init__(config.get("colors", {}).get("disk_io", "#9C27B0"), config)
+
+
+class NetworkProgressBar(SystemProgressBar):
+    """网络收发速率进度条"""
+
+    def __init__(self, config):
+        super().__init__(config.get("colors", {}).get("network", "#FF9800"), config)
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SamplingSettings:
+    """自适应采样参数，时间单位为毫秒，阈值单位为百分点"""
+
+    enabled: bool = True
+    base_interval: int = 2000
+    min_interval: int = 500
+    idle_interval: int = 8000
+    hidden_interval: int = 0  # 0 表示窗口隐藏时暂停采样
+    change_threshold: float = 5.0
+    idle_threshold: float = 1.0
+    idle_samples: int = 3
+    growth: float = 1.5
+
+    @classmethod
+    def from_config(cls, config, base_interval=2000):
+        config = config or {}
+        defaults = cls()
+        return cls(
+            enabled=bool(config.get("enabled", defaults.enabled)),
+            base_interval=int(base_interval),
+            min_interval=int(config.get("min_interval", defaults.min_interval)),
+            idle_interval=int(config.get("idle_interval", defaults.idle_interval)),
+            hidden_interval=int(config.get("hidden_interval", defaults.hidden_interval)),
+            change_threshold=float(config.get("change_threshold", defaults.change_threshold)),
+            idle_threshold=float(config.get("idle_threshold", defaults.idle_threshold)),
+            idle_samples=int(config.get("idle_samples", defaults.idle_samples)),
+            growth=max(1.0, float(config.get("growth", defaults.growth))),
+        )
+
+
+class SamplingPolicy:
+    """根据负载变化、悬停与可见性决定下一次采样的间隔。
+
+    数值变化剧烈或鼠标悬停时立即切到最短间隔；连续几次几乎不变时逐步放慢到空闲间隔；
+    变慢时每次最多乘以 growth，避免间隔突变。
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.visible = True
+        self.hovered = False
+        self._interval = float(settings.base_interval)
+        self._last = None
+        self._quiet = 0
+
+    def set_visible(self, visible):
+        if visible and not self.visible:
+            # 重新显示时从正常间隔开始，而不是沿用隐藏前的空闲间隔
+            self._interval = float(self.settings.base_interval)
+            self._quiet = 0
+        self.visible = visible
+
+    def set_hovered(self, hovered):
+        self.hovered = hovered
+
+    def _target(self, delta):
+        s = self.settings
+        if self.hovered or delta >= s.change_threshold:
+            self._quiet = 0
+            return s.min_interval
+        if delta <= s.idle_threshold:
+            self._quiet += 1
+        else:
+            self._quiet = 0
+        if self._quiet >= s.idle_samples:
+            return max(s.idle_interval, s.base_interval)
+        return s.base_interval
+
+    def next_interval(self, *values):
+        """记录本次采样值，返回距下次采样的毫秒数；返回 None 表示暂停直到被唤醒"""
+        s = self.settings
+        if not s.enabled:
+            return s.base_interval
+        if not self.visible:
+            return s.hidden_interval or None
+        delta = 0.0
+        if self._last is not None and len(self._last) == len(values):
+            delta = max((abs(a - b) for a, b in zip(values, self._last)), default=0.0)
+        self._last = values
+        target = self._target(delta)
+        if target <= self._interval:
+            self._interval = float(target)
+        else:
+            self._interval = min(float(target), self._interval * s.growth)
+        return int(self._interval)
@@ -0,0 +1,56 @@
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+
+class Sparkline(QWidget):
+    """迷你折线图：显示一个指标在环形缓冲区中的历史（0-100）"""
+
+    def __init__(self, buffer, color, config=None):
+        super().__init__()
+        config = config or {}
+        self.buffer = buffer
+        self.color = QColor(color)
+        self.maximum = float(config.get("maximum", 100))
+        self.setFixedHeight(config.get("height", 14))
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_color(self, color):
+        self.color = QColor(color)
+        self.update()
+
+    def paintEvent(self, event):
+        w = self.width()
+        h = self.height()
+        values = self.buffer.buckets(max(1, w))
+        n = len(values)
+        if n < 2:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        # 最新的数据靠右对齐，历史不足时左侧留空
+        slots = max(2, min(self.buffer.capacity, w))
+        step = (w - 1) / (slots - 1)
+        x0 = (w - 1) - step * (n - 1)
+        scale = (h - 1) / self.maximum if self.maximum > 0 else 0
+
+        line = QPainterPath()
+        for i, v in enumerate(values):
+            point = QPointF(x0 + i * step, (h - 1) - min(max(v, 0.0), self.maximum) * scale)
+            if i == 0:
+                line.moveTo(point)
+            else:
+                line.lineTo(point)
+
+        area = QPainterPath(line)
+        area.lineTo(QPointF(x0 + (n - 1) * step, h))
+        area.lineTo(QPointF(x0, h))
+        area.closeSubpath()
+        fill = QColor(self.color)
+        fill.setAlpha(60)
+        painter.fillPath(area, fill)
+
+        painter.setPen(QPen(self.color, 1))
+        painter.drawPath(line)
+        painter.end()
@@ -29,3 +29,13 @@ class MemoryLabel(StatusLabel):
 class DiskLabel(StatusLabel):
     def __init__(self, disk_name, config=None):
         super().__init__(f"{disk_name}: 0%", config)
+
+
+class DiskIOLabel(StatusLabel):
+    def __init__(self, config=None):
+        super().__init__("IO: 0B", config)
+
+
+class NetworkLabel(StatusLabel):
+    def __init__(self, config=None):
+        super().__init__("网络: 0B", config)
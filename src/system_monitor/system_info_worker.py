@@ -1,54 +1,165 @@
-import psutil
+import threading
+
 from PySide6.QtCore import QThread, Signal
 
+from system_monitor.cgroup_source import create_cgroup_sampler
+from system_monitor.cpu_breakdown import CpuTimesSampler
+from system_monitor.disk_usage_sampler import DiskUsageSampler
+from system_monitor.io_rates import IORateSampler
+from system_monitor.metric_scheduler import MetricCollector, MetricScheduler
+from system_monitor.metric_sources import create_source
+from system_monitor.mount_discovery import default_mount_table
+from system_monitor.sampling_policy import SamplingPolicy, SamplingSettings
 from utils.logger import logger
-from utils.utils import Utils
 
 
 class SystemInfoWorker(QThread):
     """系统信息获取工作线程"""
 
-    # cpu_percent, memory_percent, disk_percent_dict
-    system_percent_updated = Signal(float, float, dict)
+    # cpu_percent, memory_percent, disk_percent_dict（还没取到过的挂载点为 None）, extra_info
+    # extra_info: cpu_per_core (numpy float32 数组) / cpu_times（user、system 等百分比）
+    #             disk_io {设备: read_bps/write_bps/read_iops/write_iops} / net_io {网卡: rx_bps/tx_bps}
+    #             cgroup_cpu {percent/limit/throttled_percent/throttled_ms/pressure} /
+    #             cgroup_memory {percent/used/limit/pressure}（对应指标按 cgroup 配额统计时）
+    #             disk_stale [无响应的挂载点] / updated [本次更新的采集器：cpu、memory、io、disk_usage]
+    system_percent_updated = Signal(float, float, dict, dict)
     error_occurred = Signal(str)
 
-    def __init__(self, update_interval=2000, monitored_disks=None):
+    def __init__(
+        self,
+        update_interval=2000,
+        monitored_disks=None,
+        sampling_config=None,
+        io_config=None,
+        mount_config=None,
+        disk_usage_config=None,
+        schedule_config=None,
+        source="auto",
+        scope_config=None,
+    ):
         super().__init__()
         self._running = True
         self.update_interval = update_interval
-        self.monitored_disks = (
-            monitored_disks if monitored_disks else Utils.get_all_available_drives()
-        )
+        # 未指定磁盘时跟随挂载表，挂载表变化后下一次采样即生效
+        self.mount_table = None if monitored_disks else default_mount_table(mount_config)
+        self.monitored_disks = monitored_disks or self.mount_table.mountpoints()
+        # Linux 上默认直接读 /proc，其他平台使用 psutil
+        self.source = create_source(source)
+        self.cpu_sampler = CpuTimesSampler(self.source)
+        # 在容器或受限的 systemd slice 中，CPU / 内存占用按 cgroup 配额而不是整机计算
+        self.cgroup_sampler = create_cgroup_sampler(scope_config)
+        # 磁盘使用率在独立线程池中获取，卡住的网络挂载不会拖住 CPU / 内存的更新
+        self.disk_sampler = DiskUsageSampler(disk_usage_config)
+        self.io_sampler = IORateSampler(io_config, self.source) if (io_config or {}).get("enabled", True) else None
+        self.policy = SamplingPolicy(SamplingSettings.from_config(sampling_config, update_interval))
+        self.scheduler = MetricScheduler(self._collectors(schedule_config or {}))
+        self.scheduler.adaptive_interval = update_interval
+        # 最近一次的完整快照；每帧只更新到期的采集器对应的部分
+        self._frame = {"cpu_percent": 0.0, "memory_percent": 0.0, "disk_info": {}, "extra_info": {}}
+        # 用 Event 代替 msleep，悬停、显示和停止时可以立即唤醒
+        self._wake = threading.Event()
+        self._resume = False
+        self._hasten = False
+
+    def _collectors(self, schedule_config):
+        # 间隔为 0 的采集器跟随自适应采样间隔；磁盘使用率变化慢，默认 30 秒一次
+        collectors = [
+            MetricCollector("cpu", self._collect_cpu, schedule_config.get("cpu", 0)),
+            MetricCollector("memory", self._collect_memory, schedule_config.get("memory", 0)),
+            MetricCollector(
+                "disk_usage", self._collect_disk_usage, schedule_config.get("disk_usage", 30000)
+            ),
+        ]
+        if self.io_sampler is not None:
+            collectors.append(MetricCollector("io", self._collect_io, schedule_config.get("io", 0)))
+        return collectors
+
+    def _collect_cpu(self, frame):
+        # 总占用由各核心的时间增量汇总，每次只调用一次 cpu_times
+        cpu = self.cpu_sampler.sample()
+        if cpu is not None:
+            frame["cpu_percent"] = cpu.total
+            frame["extra_info"]["cpu_per_core"] = cpu.per_core
+            frame["extra_info"]["cpu_times"] = cpu.times
+        if self._cgroup_scoped("cpu"):
+            usage = self.cgroup_sampler.sample_cpu()
+            if usage is not None:
+                frame["cpu_percent"] = usage["percent"]
+                frame["extra_info"]["cgroup_cpu"] = usage
+
+    def _collect_memory(self, frame):
+        if self._cgroup_scoped("memory"):
+            usage = self.cgroup_sampler.sample_memory()
+            frame["memory_percent"] = usage["percent"]
+            frame["extra_info"]["cgroup_memory"] = usage
+        else:
+            frame["memory_percent"] = self.source.memory_percent()
+
+    def _cgroup_scoped(self, metric):
+        return self.cgroup_sampler is not None and metric in self.cgroup_sampler.metrics
+
+    def _collect_io(self, frame):
+        frame["extra_info"].update(self.io_sampler.sample())
+
+    def _collect_disk_usage(self, frame):
+        if self.mount_table is not None:
+            self.monitored_disks = self.mount_table.mountpoints()
+        frame["disk_info"] = self.disk_sampler.sample(self.monitored_disks)
+        frame["extra_info"]["disk_stale"] = sorted(self.disk_sampler.stale)
+
+    def _collector_failed(self, name, error):
+        self.error_occurred.emit(f"{name}: {error}")
+
+    def _apply_requests(self):
+        # 调度器只在工作线程中操作，界面线程通过标志位请求
+        if self._resume:
+            self._resume = False
+            self.scheduler.schedule_all()
+        if self._hasten:
+            self._hasten = False
+            self.scheduler.hasten_adaptive()
 
     def run(self):
-        """在线程中获取系统信息"""
+        """在线程中获取系统信息；同一帧内到期的采集器合并为一次信号"""
+        frame = self._frame
         while self._running:
-            try:
-                self.msleep(100)  # 短暂休眠
-                if not self._running:
-                    break
-
-                # 获取CPU、内存、磁盘百分比信息
-                cpu_percent = psutil.cpu_percent(interval=None)
-                memory = psutil.virtual_memory()
-                disk_info = {}
-                for disk in self.monitored_disks:
-                    try:
-                        disk_usage = psutil.disk_usage(disk)
-                        percent = (disk_usage.used / disk_usage.total) * 100
-                        disk_info[disk] = percent
-                    except Exception:
-                        disk_info[disk] = 0  # 磁盘不可用时设为0
-                self.system_percent_updated.emit(cpu_percent, memory.percent, disk_info)
-
-            except Exception as e:
-                self.error_occurred.emit(str(e))
-
-            # 休眠指定时间
-            self.msleep(self.update_interval)
+            self._apply_requests()
+            ran = self.scheduler.run_due(frame, self._collector_failed)
+            if ran:
+                if "cpu" in ran or "memory" in ran:
+                    self.scheduler.set_adaptive_interval(
+                        self.policy.next_interval(frame["cpu_percent"], frame["memory_percent"])
+                    )
+                self.scheduler.reschedule(ran)
+                self.system_percent_updated.emit(
+                    frame["cpu_percent"],
+                    frame["memory_percent"],
+                    dict(frame["disk_info"]),
+                    dict(frame["extra_info"], updated=ran),
+                )
+            delay = self.scheduler.next_delay_ms()
+            self._wake.wait(None if delay is None else delay / 1000)
+            self._wake.clear()
 
+        self.disk_sampler.close()
+        self.source.close()
         logger.info("关闭 System Info Worker 线程")
 
+    def set_visible(self, visible):
+        """窗口显示/隐藏；隐藏时按 hidden_interval 降频或暂停，重新显示时立即采样"""
+        self.policy.set_visible(visible)
+        if visible:
+            self._resume = True
+            self._wake.set()
+
+    def set_hovered(self, hovered):
+        """鼠标悬停时加快采样"""
+        self.policy.set_hovered(hovered)
+        if hovered:
+            self._hasten = True
+            self._wake.set()
+
     def stop(self):
         """停止线程"""
         self._running = False
+        self._wake.set()
@@ -1,15 +1,28 @@
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QVBoxLayout, QWidget
 
+from system_monitor.cpu_heat_strip import CpuHeatStrip
+from system_monitor.metric_history import MetricHistory
+from system_monitor.mount_discovery import discover_mounts, display_name
+from system_monitor.io_rates import format_rate
+from system_monitor.process_popup import ProcessPopup
 from system_monitor.progress_bars import (
     CPUProgressBar,
+    DiskIOProgressBar,
     DiskProgressBar,
     MemoryProgressBar,
+    NetworkProgressBar,
+)
+from system_monitor.sparkline import Sparkline
+from system_monitor.status_widgets import (
+    CPULabel,
+    DiskIOLabel,
+    DiskLabel,
+    MemoryLabel,
+    NetworkLabel,
 )
-from system_monitor.status_widgets import CPULabel, DiskLabel, MemoryLabel
 from system_monitor.system_info_worker import SystemInfoWorker
 from utils.config_manager import ConfigManager
-from utils.utils import Utils
 
 
 class SystemMonitorWidget(QWidget):
@@ -19,11 +32,19 @@ class SystemMonitorWidget(QWidget):
         self.progress_config = self.config_manager.get_progress_bar_config()
         self.label_config = self.config_manager.get_label_config()
         self.system_config = self.config_manager.get_system_monitor_config()
-        self.monitored_disks = self.system_config.get(
-            "monitored_disks", Utils.get_all_available_drives()
-        )
+        # 未配置磁盘时跟随挂载表；只在确实需要时才探测，避免启动时重复扫描
+        self.configured_disks = self.system_config.get("monitored_disks") or []
+        self.mount_config = self.system_config.get("mount_discovery", {})
+        self.monitored_disks = self.configured_disks or discover_mounts(self.mount_config)
         self.disk_labels = {}
         self.disk_progress_bars = {}
+        self.disk_rows = {}
+        self.io_config = self.system_config.get("io", {})
+        self.chart_config = self.system_config.get("chart", {})
+        self.history = MetricHistory(self.chart_config.get("history_size", 120))
+        self.sparklines = {}
+        # 首次双击时再创建，平时不占用采样线程
+        self.process_popup = None
 
         self.worker = None
         self.setup_layout()
@@ -44,33 +65,104 @@ class SystemMonitorWidget(QWidget):
         self.cpu_progress = CPUProgressBar(self.progress_config)
         self.cpu_progress.setMaximum(100)
 
+        self.cpu_heat_strip = None
+        if self.system_config.get("per_core", {}).get("show_heat_strip", True):
+            self.cpu_heat_strip = CpuHeatStrip(self.system_config.get("per_core", {}))
+
         # 内存组件
         self.memory_label = MemoryLabel(self.label_config)
         self.memory_progress = MemoryProgressBar(self.progress_config)
         self.memory_progress.setMaximum(100)
 
-        # 磁盘组件
-        for disk in self.monitored_disks:
-            disk_name = f"{disk[:-1]}盘"
-            disk_label = DiskLabel(disk_name, self.label_config)
-            disk_progress = DiskProgressBar(disk, self.progress_config)
-            disk_progress.setMaximum(100)
-            self.disk_labels[disk] = disk_label
-            self.disk_progress_bars[disk] = disk_progress
+        # 磁盘读写 / 网络速率组件
+        self.disk_io_label = self.disk_io_progress = None
+        self.network_label = self.network_progress = None
+        if self.io_config.get("enabled", True):
+            self.disk_io_label = DiskIOLabel(self.label_config)
+            self.disk_io_progress = DiskIOProgressBar(self.progress_config)
+            self.disk_io_progress.setMaximum(100)
+            self.network_label = NetworkLabel(self.label_config)
+            self.network_progress = NetworkProgressBar(self.progress_config)
+            self.network_progress.setMaximum(100)
 
         # 添加到布局
-        self.layout.addWidget(self.cpu_label)
-        self.layout.addWidget(self.cpu_progress)
-        self.layout.addWidget(self.memory_label)
-        self.layout.addWidget(self.memory_progress)
+        self.add_metric("cpu", self.cpu_label, self.cpu_progress)
+        if self.cpu_heat_strip is not None:
+            self.layout.addWidget(self.cpu_heat_strip)
+        self.add_metric("memory", self.memory_label, self.memory_progress)
+        # 磁盘组件
+        self.disk_layout = QVBoxLayout()
+        self.disk_layout.setContentsMargins(0, 0, 0, 0)
+        self.disk_layout.setSpacing(2)
+        self.layout.addLayout(self.disk_layout)
         for disk in sorted(self.monitored_disks):
-            self.layout.addWidget(self.disk_labels[disk])
-            self.layout.addWidget(self.disk_progress_bars[disk])
+            self.add_disk(disk)
+        if self.disk_io_label is not None:
+            self.add_metric("disk_io", self.disk_io_label, self.disk_io_progress, default_color="#9C27B0")
+            self.add_metric("network", self.network_label, self.network_progress, default_color="#FF9800")
+
+    def add_metric(
+        self, name, label, progress, color_key=None, default_color="#4CAF50", layout=None
+    ):
+        """添加一组标签 / 进度条，按配置在进度条下方或代替进度条显示历史折线"""
+        layout = layout or self.layout
+        layout.addWidget(label)
+        show_sparkline = self.chart_config.get("show_sparkline", True)
+        if not (show_sparkline and self.chart_config.get("hide_progress_bars", False)):
+            layout.addWidget(progress)
+        else:
+            progress.hide()
+        if show_sparkline:
+            color = self.progress_config.get("colors", {}).get(
+                color_key or name, default_color
+            )
+            sparkline = Sparkline(self.history.buffer(name), color, self.chart_config)
+            self.sparklines[name] = sparkline
+            layout.addWidget(sparkline)
+
+    def add_disk(self, disk):
+        """添加一个磁盘的标签 / 进度条；挂载表变化时也会调用"""
+        row = QWidget()
+        row_layout = QVBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row_layout.setSpacing(2)
+        disk_label = DiskLabel(display_name(disk), self.label_config)
+        disk_label.setToolTip(disk)
+        disk_progress = DiskProgressBar(disk, self.progress_config)
+        disk_progress.setMaximum(100)
+        self.disk_labels[disk] = disk_label
+        self.disk_progress_bars[disk] = disk_progress
+        self.disk_rows[disk] = row
+        self.add_metric(disk, disk_label, disk_progress, "disk", layout=row_layout)
+        self.disk_layout.addWidget(row)
+
+    def sync_disks(self, disks):
+        """按最新的挂载点增加新磁盘、隐藏已卸载的磁盘"""
+        for disk in disks:
+            if disk not in self.disk_rows:
+                self.add_disk(disk)
+        for disk, row in self.disk_rows.items():
+            row.setVisible(disk in disks)
+
+    def record_sample(self, name, value):
+        """记录一次采样并刷新对应的折线"""
+        self.history.append(name, value)
+        sparkline = self.sparklines.get(name)
+        if sparkline is not None:
+            sparkline.update()
 
     def setup_worker(self):
         """设置工作线程"""
         self.worker = SystemInfoWorker(
-            self.system_config.get("update_interval", 2000), self.monitored_disks
+            self.system_config.get("update_interval", 2000),
+            self.configured_disks,
+            self.system_config.get("adaptive_sampling", {}),
+            self.io_config,
+            self.mount_config,
+            self.system_config.get("disk_usage", {}),
+            self.system_config.get("schedules", {}),
+            self.system_config.get("source", "auto"),
+            self.system_config.get("scope", {}),
         )
         self.worker.system_percent_updated.connect(self.update_all_system_info)
         self.worker.error_occurred.connect(self.handle_error)
@@ -80,36 +172,166 @@ class SystemMonitorWidget(QWidget):
         """更新初始信息"""
         pass
 
-    def update_all_system_info(self, cpu_percent, memory_percent, disk_info):
+    def update_all_system_info(self, cpu_percent, memory_percent, disk_info, extra_info=None):
         """更新所有系统信息"""
-        # 更新CPU信息
-        self.cpu_progress.setValue(int(cpu_percent))
-        self.cpu_label.setText(f"CPU:{cpu_percent:.0f}%")
+        extra_info = extra_info or {}
+        # 各指标按自己的间隔采样，只刷新本次更新过的部分，折线也只记录真实的采样
+        updated = set(extra_info.get("updated", ("cpu", "memory", "io", "disk_usage")))
+        if "cpu" in updated:
+            # 更新CPU信息
+            self.cpu_progress.setValue(int(cpu_percent))
+            self.cpu_label.setText(f"CPU:{cpu_percent:.0f}%")
+            self.record_sample("cpu", cpu_percent)
+            self.update_cpu_detail(extra_info)
+        if "io" in updated:
+            self.update_io_rates(extra_info)
 
-        # 更新内存信息
-        self.memory_progress.setValue(int(memory_percent))
-        self.memory_label.setText(f"内存:{memory_percent:.0f}%")
+        if "memory" in updated:
+            # 更新内存信息
+            self.memory_progress.setValue(int(memory_percent))
+            self.memory_label.setText(f"内存:{memory_percent:.0f}%")
+            self.record_sample("memory", memory_percent)
+            self.update_memory_detail(extra_info)
 
+        if "disk_usage" not in updated:
+            return
         # 更新磁盘信息
+        if not self.configured_disks and disk_info.keys() != self.disk_rows.keys():
+            self.sync_disks(disk_info)
+        stale = set(extra_info.get("disk_stale", ()))
         for disk, percent in disk_info.items():
             if disk in self.disk_labels and disk in self.disk_progress_bars:
+                if disk in stale or percent is None:
+                    # 无响应或还没取到过的挂载点保留进度条上次的值，折线不记录
+                    self.disk_labels[disk].setText(f"{display_name(disk)}:--")
+                    self.disk_labels[disk].setToolTip(f"{disk}（{'无响应' if disk in stale else '获取中'}）")
+                    continue
                 self.disk_progress_bars[disk].setValue(int(percent))
-                disk_name = f"{disk[:-1]}盘"
-                self.disk_labels[disk].setText(f"{disk_name}:{percent:.0f}%")
+                self.disk_labels[disk].setText(f"{display_name(disk)}:{percent:.0f}%")
+                self.disk_labels[disk].setToolTip(disk)
+                self.record_sample(disk, percent)
+
+    def update_cpu_detail(self, extra_info):
+        """更新各核心热力条与 CPU 时间分类提示"""
+        per_core = extra_info.get("cpu_per_core")
+        if per_core is None:
+            return
+        if self.cpu_heat_strip is not None:
+            self.cpu_heat_strip.set_values(per_core)
+        names = {"user": "用户", "system": "系统", "iowait": "IO等待", "steal": "被抢占"}
+        lines = [
+            f"{names[k]}: {v:.1f}%" for k, v in extra_info.get("cpu_times", {}).items() if k in names
+        ]
+        busiest = int(per_core.argmax())
+        lines.append(f"核心数: {len(per_core)}，最忙: #{busiest} {per_core[busiest]:.0f}%")
+        cgroup = extra_info.get("cgroup_cpu")
+        if cgroup is not None:
+            lines.append(f"配额: {cgroup['limit']:.2g} 核（占用按配额计算）")
+            lines.append(f"限流: {cgroup['throttled_percent']:.0f}% 周期，{cgroup['throttled_ms']:.0f}ms")
+            lines.extend(self._pressure_lines(cgroup["pressure"]))
+        tooltip = "\n".join(lines)
+        self.cpu_label.setToolTip(tooltip)
+        if self.cpu_heat_strip is not None:
+            self.cpu_heat_strip.setToolTip(tooltip)
+
+    def update_memory_detail(self, extra_info):
+        """内存按 cgroup 上限统计时，在提示中显示用量、上限与内存压力"""
+        cgroup = extra_info.get("cgroup_memory")
+        if cgroup is None:
+            return
+        gb = 1 << 30
+        lines = [f"已用: {cgroup['used'] / gb:.2f}GB / 上限 {cgroup['limit'] / gb:.2f}GB"]
+        lines.extend(self._pressure_lines(cgroup["pressure"]))
+        self.memory_label.setToolTip("\n".join(lines))
+
+    @staticmethod
+    def _pressure_lines(pressure):
+        # PSI avg10：过去 10 秒内有任务（some）/ 全部任务（full）因资源不足而等待的时间占比
+        names = {"some": "部分等待", "full": "全部等待"}
+        return [f"压力({names[k]}): {v:.1f}%" for k, v in pressure.items() if k in names]
+
+    def update_io_rates(self, extra_info):
+        """更新磁盘读写与网络收发速率；进度条按配置的满量程显示"""
+        if self.disk_io_label is None or "disk_io" not in extra_info:
+            return
+        disk_io = extra_info["disk_io"]
+        net_io = extra_info.get("net_io", {})
+        disk_bps = sum(r["read_bps"] + r["write_bps"] for r in disk_io.values())
+        net_bps = sum(r["rx_bps"] + r["tx_bps"] for r in net_io.values())
+        disk_scale = self.io_config.get("disk_full_scale_mb", 200) * (1 << 20)
+        net_scale = self.io_config.get("net_full_scale_mb", 12.5) * (1 << 20)
+        disk_percent = min(100.0, disk_bps / disk_scale * 100)
+        net_percent = min(100.0, net_bps / net_scale * 100)
+
+        self.disk_io_progress.setValue(int(disk_percent))
+        self.disk_io_label.setText(f"IO:{format_rate(disk_bps)}")
+        self.disk_io_label.setToolTip(
+            "\n".join(
+                f"{name}: 读 {format_rate(r['read_bps'])}/s {r['read_iops']:.0f}次 "
+                f"写 {format_rate(r['write_bps'])}/s {r['write_iops']:.0f}次"
+                for name, r in sorted(disk_io.items())
+            )
+        )
+        self.record_sample("disk_io", disk_percent)
+
+        self.network_progress.setValue(int(net_percent))
+        self.network_label.setText(f"网:{format_rate(net_bps)}")
+        self.network_label.setToolTip(
+            "\n".join(
+                f"{name}: ↓{format_rate(r['rx_bps'])}/s ↑{format_rate(r['tx_bps'])}/s"
+                for name, r in sorted(net_io.items())
+            )
+        )
+        self.record_sample("network", net_percent)
 
     def handle_error(self, error_msg):
         """处理错误"""
         print(f"系统信息获取错误: {error_msg}")
 
+    def enterEvent(self, event):
+        """鼠标进入时加快采样"""
+        if self.worker:
+            self.worker.set_hovered(True)
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        """鼠标离开"""
+        if self.worker:
+            self.worker.set_hovered(False)
+        super().leaveEvent(event)
+
+    def showEvent(self, event):
+        """窗口显示时恢复采样"""
+        if self.worker:
+            self.worker.set_visible(True)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """窗口隐藏（如托盘切换）时降频或暂停采样"""
+        if self.worker:
+            self.worker.set_visible(False)
+        super().hideEvent(event)
+
     def mouseDoubleClickEvent(self, event):
         """鼠标双击事件"""
         if event.button() == Qt.LeftButton:
-            Utils.open_task_manager()
+            self.toggle_process_popup(event.globalPosition().toPoint())
         super().mouseDoubleClickEvent(event)
 
+    def toggle_process_popup(self, anchor):
+        """显示 / 隐藏进程列表"""
+        if self.process_popup is None:
+            self.process_popup = ProcessPopup(self.system_config.get("processes", {}))
+        if self.process_popup.isVisible():
+            self.process_popup.hide()
+        else:
+            self.process_popup.show_near(anchor)
+
     def closeEvent(self, event):
         """窗口关闭事件"""
         if self.worker:
             self.worker.stop()
             self.worker.wait()
+        if self.process_popup is not None:
+            self.process_popup.close_worker()
         event.accept()
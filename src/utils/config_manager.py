@@ -39,7 +39,13 @@ class ConfigManager:
                 "border_radius": 2,
                 "background_alpha": 100,
                 "chunk_radius": 1,
-                "colors": {"cpu": "#FF5722", "memory": "#2196F3", "disk": "#4CAF50"},
+                "colors": {
+                    "cpu": "#FF5722",
+                    "memory": "#2196F3",
+                    "disk": "#4CAF50",
+                    "disk_io": "#9C27B0",
+                    "network": "#FF9800",
+                },
             },
             "labels": {
                 "font_size": 10,
@@ -49,10 +55,60 @@ class ConfigManager:
             },
             "system_monitor": {
                 "update_interval": 2000,  # 毫秒
-                "monitored_disks": [
-                    "C:",
-                    "D:",
-                ],  # 要监控的磁盘列表，如果为空则自动检测所有磁盘
+                "monitored_disks": [],  # 要监控的磁盘列表（如 C: 或 /home），为空则按挂载表自动检测
+                "mount_discovery": {
+                    "include_network": True,  # 是否包含 NFS / SMB 等网络挂载
+                    "exclude_fstypes": [],  # 追加排除的文件系统类型，内置规则已排除 proc / tmpfs / overlay 等
+                    "exclude_mountpoints": [],  # 追加排除的挂载点前缀
+                    "poll_interval": 30,  # 非 Linux 平台重新读取分区表的间隔，秒
+                },
+                "adaptive_sampling": {
+                    "enabled": True,
+                    "min_interval": 500,  # 数值变化剧烈或鼠标悬停时的采样间隔
+                    "idle_interval": 8000,  # 连续几次几乎不变时逐步放慢到该间隔
+                    "hidden_interval": 0,  # 窗口隐藏时的采样间隔，0 表示暂停
+                    "change_threshold": 5.0,  # CPU/内存两次采样相差超过该百分点视为剧烈变化
+                    "idle_threshold": 1.0,
+                },
+                "per_core": {
+                    "show_heat_strip": True,  # 在 CPU 进度条下方显示各核心占用
+                    "cell_height": 4,
+                    "min_cell_width": 4,  # 核心多时按该宽度换行
+                },
+                "source": "auto",  # 数据来源：auto（Linux 上直接读 /proc）/ proc / psutil
+                "scope": {  # 占用的统计范围：host（整机）/ cgroup（容器配额）/ auto（有生效的配额时按 cgroup）
+                    "cpu": "auto",
+                    "memory": "auto",
+                },
+                "processes": {  # 双击打开的进程列表
+                    "limit": 10,  # 显示占用最高的进程数
+                    "interval": 2000,  # 弹窗显示期间的刷新间隔，毫秒
+                    "sort": "cpu",  # 默认排序：cpu / memory / io
+                },
+                "schedules": {  # 各指标的采样间隔（毫秒），0 表示跟随自适应采样间隔
+                    "cpu": 0,
+                    "memory": 0,
+                    "io": 0,
+                    "disk_usage": 30000,  # 磁盘使用率变化慢，不必频繁采样
+                },
+                "disk_usage": {
+                    "max_workers": 4,  # 并发获取磁盘使用率的线程数
+                    "max_spare_workers": 8,  # 顶替卡在无响应挂载点上的线程的上限
+                    "timeout_ms": 1000,  # 每次采样等待磁盘结果的上限，超时的挂载点标记为无响应
+                },
+                "io": {
+                    "enabled": True,  # 显示磁盘读写与网络收发速率
+                    "disks": [],  # 为空时统计全部物理磁盘（忽略 loop / ram 等虚拟设备、分区，以及 md / LVM 等叠加设备）
+                    "nics": [],  # 为空时统计全部网卡（忽略 lo / docker / veth 等）
+                    "disk_full_scale_mb": 200,  # 进度条满格对应的速率，MB/s
+                    "net_full_scale_mb": 12.5,
+                },
+                "chart": {
+                    "show_sparkline": True,  # 在进度条下方显示最近的历史折线
+                    "hide_progress_bars": False,  # 只显示折线，不显示进度条
+                    "history_size": 120,  # 每个指标保留的采样点数
+                    "height": 14,
+                },
             },
             "logging": {
                 "level": "INFO",  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -67,6 +123,23 @@ class ConfigManager:
                 "location": "",
                 "update_interval": 300000,  # 更新间隔，单位毫秒 (例如5分钟)
             },
+            "http": {
+                "connect_timeout_s": 5,  # 连接超时；调用方给出的超时作为读超时
+                "read_timeout_s": 20,
+                "retries": 2,  # 连接失败 / 5xx 的自动重试次数（指数退避）
+                "pool_maxsize": 8,  # 每个主机保持的 keep-alive 连接数
+                "breaker_failures": 3,  # 连续失败次数达到后熔断，期间请求立即失败
+                "breaker_cooldown_s": 15,  # 熔断后首次探测的等待时间，探测失败时加倍
+                "breaker_max_cooldown_s": 300,
+            },
+            "github_trending": {
+                "run_in_process": False,  # 在子进程中抓取与解析，避免刷新时界面卡顿
+                "cache": {
+                    "compress_after_days": 7,  # 超过该天数的原始 README / HTML 压缩存储
+                    "max_age_days": 180,  # 超过该天数删除原始 README / HTML，保留摘要与 JSON
+                    "max_size_mb": 1024,  # 按日期缓存的总大小上限，超出时从最早的日期开始清理原始 README / HTML，保留摘要与 JSON
+                },
+            },
         }
 
     def save_config(self):
@@ -111,6 +184,10 @@ class ConfigManager:
         """获取分钟级天气组件配置"""
         return self.config.get("minutely_weather", {})
 
+    def get_github_trending_config(self):
+        """获取 GitHub Trending 组件配置"""
+        return self.config.get("github_trending", {})
+
     def set_window_config(self, key, value):
         """设置窗口配置"""
         if "window" not in self.config:
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.logger import logger
+
+
+@dataclass(frozen=True)
+class HttpSettings:
+    connect_timeout_s: float = 5.0
+    read_timeout_s: float = 20.0
+    retries: int = 2
+    backoff_factor: float = 0.5
+    pool_connections: int = 16
+    pool_maxsize: int = 8
+    breaker_failures: int = 3
+    breaker_cooldown_s: float = 15.0
+    breaker_max_cooldown_s: float = 300.0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> "HttpSettings":
+        config = config or {}
+        defaults = cls()
+        return cls(
+            connect_timeout_s=float(config.get("connect_timeout_s", defaults.connect_timeout_s)),
+            read_timeout_s=float(config.get("read_timeout_s", defaults.read_timeout_s)),
+            retries=int(config.get("retries", defaults.retries)),
+            backoff_factor=float(config.get("backoff_factor", defaults.backoff_factor)),
+            pool_connections=int(config.get("pool_connections", defaults.pool_connections)),
+            pool_maxsize=int(config.get("pool_maxsize", defaults.pool_maxsize)),
+            breaker_failures=int(config.get("breaker_failures", defaults.breaker_failures)),
+            breaker_cooldown_s=float(config.get("breaker_cooldown_s", defaults.breaker_cooldown_s)),
+            breaker_max_cooldown_s=float(
+                config.get("breaker_max_cooldown_s", defaults.breaker_max_cooldown_s)
+            ),
+        )
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """主机熔断中，请求未发出即失败；继承 ConnectionError 以便沿用各调用方的网络异常处理"""
+
+    def __init__(self, host: str, retry_at: float):
+        self.host = host
+        self.retry_at = retry_at
+        wait = max(0.0, retry_at - time.time())
+        super().__init__(f"{host} 暂时不可用（熔断中，{wait:.0f}s 后重试）")
+
+
+class CircuitBreaker:
+    """closed → 连续失败达到阈值后 open（快速失败）→ 冷却结束后 half-open 只放行一个探测请求；
+    探测成功恢复 closed，失败则以加倍的冷却时间重新 open。"""
+
+    def __init__(self, host: str, settings: HttpSettings):
+        self.host = host
+        self.settings = settings
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown_s = settings.breaker_cooldown_s
+        self.retry_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.time()
+            if self.state == "open" and now >= self.retry_at:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._probing:
+                self._probing = True
+                logger.info(f"HTTP 熔断探测: host={self.host}")
+                return
+            raise CircuitOpenError(self.host, self.retry_at)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"HTTP 熔断恢复: host={self.host}")
+            self.state = "closed"
+            self.failures = 0
+            self.cooldown_s = self.settings.breaker_cooldown_s
+            self._probing = False
+
+    def release_probe(self) -> None:
+        # 非网络原因的异常不能说明主机状态，只让出探测名额
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open":
+                self.cooldown_s = min(self.cooldown_s * 2, self.settings.breaker_max_cooldown_s)
+            elif self.failures < self.settings.breaker_failures:
+                return
+            self.state = "open"
+            self._probing = False
+            self.retry_at = time.time() + self.cooldown_s
+        logger.warning(
+            f"HTTP 熔断打开: host={self.host}, failures={self.failures}, cooldown={self.cooldown_s:.0f}s"
+        )
+
+
+@dataclass(frozen=True)
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+
+    @property
+    def latency_ms_avg(self) -> float:
+        return self.latency_ms_total / self.requests if self.requests else 0.0
+
+
+class PooledAdapter(HTTPAdapter):
+    """所有 Session 共用的连接池：按主机复用 keep-alive 连接，并统计每个主机的请求数、字节数与耗时。"""
+
+    def __init__(self, settings: HttpSettings):
+        self.settings = settings
+        self._stats: dict[str, HostStats] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._stats_lock = threading.Lock()
+        retry = Retry(
+            total=settings.retries,
+            connect=settings.retries,
+            read=settings.retries,
+            status=settings.retries,
+            backoff_factor=settings.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        super().__init__(
+            pool_connections=settings.pool_connections,
+            pool_maxsize=settings.pool_maxsize,
+            max_retries=retry,
+        )
+
+    def _timeout(self, timeout: Any) -> Any:
+        # 调用方只给一个数时视为读超时，连接超时统一取较短的配置值
+        if timeout is None:
+            return (self.settings.connect_timeout_s, self.settings.read_timeout_s)
+        if isinstance(timeout, (int, float)):
+            return (min(self.settings.connect_timeout_s, float(timeout)), float(timeout))
+        return timeout
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._stats_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, self.settings)
+            return breaker
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        host = urlsplit(request.url).netloc
+        breaker = self.breaker(host)
+        breaker.before_request()
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream=stream, timeout=self._timeout(timeout), **kwargs)
+            bytes_in = 0
+            if not stream:
+                _ = response.content
+                try:
+                    # 压缩传输时按线上字节计数
+                    bytes_in = int(response.raw.tell()) or len(response.content)
+                except Exception:
+                    bytes_in = len(response.content)
+        except requests.exceptions.RequestException:
+            # 连接失败、超时、连接中断都说明主机不可达
+            breaker.record_failure()
+            self._record(host, time.perf_counter() - start, 0, error=True)
+            raise
+        except Exception:
+            breaker.release_probe()
+            self._record(host, time.perf_counter() - start, 0, error=True)
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        self._record(host, time.perf_counter() - start, bytes_in, error=response.status_code >= 500)
+        return response
+
+    def _record(self, host: str, elapsed_s: float, bytes_in: int, error: bool) -> None:
+        ms = elapsed_s * 1000
+        with self._stats_lock:
+            s = self._stats.get(host, HostStats())
+            self._stats[host] = replace(
+                s,
+                requests=s.requests + 1,
+                errors=s.errors + int(error),
+                bytes_in=s.bytes_in + bytes_in,
+                latency_ms_total=s.latency_ms_total + ms,
+                latency_ms_max=max(s.latency_ms_max, ms),
+            )
+
+    def stats(self) -> dict[str, HostStats]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+_lock = threading.Lock()
+_adapter: PooledAdapter | None = None
+_sessions: dict[str, requests.Session] = {}
+
+
+def _get_adapter() -> PooledAdapter:
+    global _adapter
+    if _adapter is None:
+        from utils.config_manager import ConfigManager
+
+        settings = HttpSettings.from_config(ConfigManager().config.get("http", {}))
+        _adapter = PooledAdapter(settings)
+    return _adapter
+
+
+def get_session(name: str = "default", headers: dict[str, str] | None = None) -> requests.Session:
+    """按用途返回进程内共享的 Session；不同用途的默认请求头（如鉴权）互不影响，连接池共用。"""
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            adapter = _get_adapter()
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(
+                {"User-Agent": "miniDeskKit/0.1", "Accept-Encoding": "gzip, deflate"}
+            )
+            _sessions[name] = session
+        if headers:
+            session.headers.update(headers)
+        return session
+
+
+def circuit_retry_at() -> float | None:
+    """最早可以再次探测的熔断主机时间；没有熔断中的主机时返回 None"""
+    if _adapter is None:
+        return None
+    with _adapter._stats_lock:
+        breakers = list(_adapter._breakers.values())
+    times = [b.retry_at for b in breakers if b.state != "closed"]
+    return min(times) if times else None
+
+
+def host_stats() -> dict[str, HostStats]:
+    return _adapter.stats() if _adapter is not None else {}
+
+
+def log_host_stats() -> None:
+    for host, s in sorted(host_stats().items()):
+        logger.info(
+            f"HTTP 统计: host={host}, requests={s.requests}, errors={s.errors}, "
+            f"bytes={s.bytes_in / 1024:.1f}KB, avg={s.latency_ms_avg:.0f}ms, max={s.latency_ms_max:.0f}ms"
+        )
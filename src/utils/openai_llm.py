@@ -4,8 +4,7 @@ import os
 from dataclasses import dataclass
 from typing import Any
 
-import requests
-
+from utils.http_client import get_session
 from utils.logger import logger
 from utils.env_loader import load_env
 
@@ -15,6 +14,7 @@ class OpenAISettings:
     api_key: str | None
     base_url: str
     model: str
+    embedding_model: str
     max_input_chars: int
     max_output_tokens: int
 
@@ -24,12 +24,14 @@ def get_openai_settings() -> OpenAISettings:
     api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("OPENAI_KEY")
     base_url = os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
     model = os.environ.get("OPENAI_MODEL") or "gpt-4o-mini"
+    embedding_model = os.environ.get("OPENAI_EMBEDDING_MODEL") or "text-embedding-3-small"
     max_input_chars = int(os.environ.get("OPENAI_MAX_INPUT_CHARS") or "30000")
     max_output_tokens = int(os.environ.get("OPENAI_MAX_OUTPUT_TOKENS") or "600")
     return OpenAISettings(
         api_key=api_key,
         base_url=base_url.rstrip("/"),
         model=model,
+        embedding_model=embedding_model,
         max_input_chars=max_input_chars,
         max_output_tokens=max_output_tokens,
     )
@@ -57,7 +59,7 @@ def chat_completions(
         "max_tokens": settings.max_output_tokens,
     }
 
-    resp = requests.post(url, headers=headers, json=payload, timeout=timeout_s)
+    resp = get_session("openai").post(url, headers=headers, json=payload, timeout=timeout_s)
     if resp.status_code in {401, 403}:
         raise RuntimeError(f"OpenAI 鉴权失败: status={resp.status_code}")
     if resp.status_code == 429:
@@ -74,6 +76,41 @@ def chat_completions(
     return content
 
 
+def embeddings(
+    texts: list[str],
+    *,
+    model: str | None = None,
+    timeout_s: int = 30,
+) -> list[list[float]]:
+    settings = get_openai_settings()
+    if not settings.api_key:
+        raise RuntimeError("缺少 OPENAI_API_KEY")
+    if not texts:
+        return []
+
+    url = f"{settings.base_url}/embeddings"
+    headers = {
+        "Authorization": f"Bearer {settings.api_key}",
+        "Content-Type": "application/json",
+    }
+    payload: dict[str, Any] = {
+        "model": model or settings.embedding_model,
+        "input": texts,
+    }
+
+    resp = get_session("openai").post(url, headers=headers, json=payload, timeout=timeout_s)
+    if resp.status_code in {401, 403}:
+        raise RuntimeError(f"OpenAI 鉴权失败: status={resp.status_code}")
+    if resp.status_code == 429:
+        raise RuntimeError("OpenAI 触发限流(429)")
+    resp.raise_for_status()
+    data = resp.json().get("data") or []
+    if len(data) != len(texts):
+        raise RuntimeError(f"OpenAI embeddings 返回数量不符: {len(data)} != {len(texts)}")
+    data = sorted(data, key=lambda d: d.get("index", 0))
+    return [list(d.get("embedding") or []) for d in data]
+
+
 def heuristic_summarize_markdown(markdown_text: str, max_chars: int = 1600) -> str:
     text = (markdown_text or "").strip()
     if not text:
@@ -124,7 +161,9 @@ def heuristic_summarize_markdown(markdown_text: str, max_chars: int = 1600) -> s
     return "\n".join(summary).strip() + "\n"
 
 
-def summarize_readme_markdown(readme_md: str, repo_full_name: str) -> tuple[str, str]:
+def summarize_readme_markdown(
+    readme_md: str, repo_full_name: str, fallback: bool = True
+) -> tuple[str, str]:
     settings = get_openai_settings()
     truncated = (readme_md or "")[: settings.max_input_chars]
     if not truncated.strip():
@@ -156,5 +195,8 @@ def summarize_readme_markdown(readme_md: str, repo_full_name: str) -> tuple[str,
         )
         return content.strip() + "\n", "openai"
     except Exception as e:
+        if not fallback:
+            # 由调用方决定稍后重试还是回退
+            raise
         logger.warning(f"OpenAI 总结失败，回退启发式：{repo_full_name} ({e})")
         return heuristic_summarize_markdown(truncated), "heuristic"
@@ -1,7 +1,4 @@
 import psutil
-import string
-import subprocess
-from utils.logger import logger
 
 
 class Utils:
@@ -18,17 +15,7 @@ class Utils:
 
     @staticmethod
     def get_all_available_drives():
-        """获取所有可用的磁盘驱动器"""
-        available_drives = []
-        for letter in string.ascii_uppercase:
-            drive = f"{letter}:"
-            if Utils.disk_exists(drive):
-                available_drives.append(drive)
-        logger.info(f"当前可用的磁盘：{available_drives}")
-        return available_drives
+        """获取所有可用的磁盘驱动器（挂载点），结果由挂载表缓存"""
+        from system_monitor.mount_discovery import discover_mounts
 
-    @staticmethod
-    def open_task_manager():
-        """打开任务管理器"""
-        subprocess.Popen(["taskmgr.exe"])
-        logger.info("启动任务管理器")
+        return discover_mounts()
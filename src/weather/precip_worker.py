@@ -1,6 +1,7 @@
 import requests
 from PySide6.QtCore import QThread, Signal
 
+from utils.http_client import get_session
 from utils.logger import logger
 
 
@@ -28,7 +29,7 @@ class PrecipWorker(QThread):
                     api_host=self.api_host, location=self.location
                 )
                 headers = {"X-QW-Api-Key": self.api_key}
-                response = requests.get(url, headers=headers, timeout=10)
+                response = get_session("qweather").get(url, headers=headers, timeout=10)
 
                 if response.status_code == 200:
                     data = response.json()
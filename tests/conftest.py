@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # 缓存、日志与配置都写在当前目录下，测试之间互不影响
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def blob_store():
+    from github_trending import blob_store
+
+    return blob_store
+
+
+@pytest.fixture
+def cache():
+    from github_trending.trending_service import cache_dir
+
+    return cache_dir()
+
+
+def _blobs(blob_store):
+    return sorted(p.name for p in blob_store.blobs_dir().glob("*/*"))
+
+
+def test_same_text_is_stored_once(blob_store, cache):
+    a = blob_store.write_text(cache / "readme" / "2025-01-01" / "o__a.md", "same\n")
+    b = blob_store.write_text(cache / "readme" / "2025-01-02" / "o__a.md", "same\n")
+    if a.stat().st_nlink < 3:
+        pytest.skip("文件系统不支持硬链接")
+    assert os.path.samefile(a, b)
+    assert len(_blobs(blob_store)) == 1
+
+
+def test_gc_removes_only_unreferenced_blobs(blob_store, cache):
+    kept = blob_store.write_text(cache / "readme" / "2025-01-01" / "o__a.md", "kept\n")
+    gone = blob_store.write_text(cache / "readme" / "2025-01-01" / "o__b.md", "gone\n")
+    if kept.stat().st_nlink < 2:
+        pytest.skip("文件系统不支持硬链接")
+    gone.unlink()
+
+    removed, freed = blob_store.gc_blobs()
+
+    assert (removed, freed) == (1, len("gone\n"))
+    assert len(_blobs(blob_store)) == 1
+    assert kept.read_text(encoding="utf-8") == "kept\n"
+
+
+def test_copy_mode_skips_gc(blob_store, cache, monkeypatch):
+    def no_link(src, dst):
+        raise OSError("hard links not supported")
+
+    # 首次写入时 blob 已存储、硬链接失败，之后进入复制模式
+    monkeypatch.setattr(blob_store.os, "link", no_link)
+    a = blob_store.write_text(cache / "readme" / "2025-01-01" / "o__a.md", "a\n")
+    b = blob_store.write_text(cache / "readme" / "2025-01-01" / "o__b.md", "b\n")
+
+    assert blob_store.copy_mode()
+    assert a.stat().st_nlink == 1
+    assert len(_blobs(blob_store)) == 1
+    assert blob_store.gc_blobs() == (0, 0)
+    assert len(_blobs(blob_store)) == 1
+    assert (a.read_text(encoding="utf-8"), b.read_text(encoding="utf-8")) == ("a\n", "b\n")
@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+
+
+TODAY = date(2025, 6, 1)
+
+
+@pytest.fixture
+def cache():
+    from github_trending.trending_service import cache_dir
+
+    return cache_dir()
+
+
+@pytest.fixture
+def maintenance():
+    from github_trending import cache_maintenance
+
+    return cache_maintenance
+
+
+def _write(path, data=b"x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_cancelled_maintenance_stops_and_stays_due(cache, maintenance):
+    old = _write(cache / "readme" / "2024-01-01" / "o__a.md")
+    policy = maintenance.CachePolicy(max_age_days=30)
+
+    report = maintenance.run_maintenance(policy, today=TODAY, should_cancel=lambda: True)
+    assert old.exists()
+    assert report.deleted_files == 0
+    assert maintenance.maintenance_due(cache, TODAY)
+
+    maintenance.run_maintenance(policy, today=TODAY)
+    assert not old.exists()
+    assert not maintenance.maintenance_due(cache, TODAY)
+
+
+def _dated_files(cache):
+    return sorted(
+        str(p.relative_to(cache)) for p in cache.rglob("*") if p.is_file() and "blobs" not in p.parts
+    )
+
+
+def test_size_budget_evicts_regenerable_files_and_keeps_payloads(cache, maintenance):
+    big = b"r" * 4000
+    for ds in ("2025-05-01", "2025-05-02", "2025-06-01"):
+        _write(cache / "readme" / ds / "o__a.md", big)
+        _write(cache / "readme_html" / ds / "o__a.html", big)
+        _write(cache / "readme_summary" / ds / "o__a.md", b"summary")
+        _write(cache / f"{ds}__since-daily.json", b"{}")
+        _write(cache / f"{ds}__since-daily.md", b"report")
+        _write(cache / "html" / f"{ds}__since-daily.html.gz", big)
+
+    report = maintenance.MaintenanceReport()
+    maintenance.enforce_size_budget(cache, 30000, TODAY, report)
+
+    files = _dated_files(cache)
+    # 最早一天的可再生成文件被清理，第二天清理后已低于上限
+    assert "readme/2025-05-01/o__a.md" not in files
+    assert "readme_html/2025-05-01/o__a.html" not in files
+    assert "2025-05-01__since-daily.md" not in files
+    assert "html/2025-05-01__since-daily.html.gz" not in files
+    assert "readme/2025-05-02/o__a.md" in files
+    # JSON 与摘要不随容量清理
+    assert "readme_summary/2025-05-01/o__a.md" in files
+    assert "2025-05-01__since-daily.json" in files
+
+
+def test_size_budget_never_touches_today_or_payloads(cache, maintenance):
+    _write(cache / "readme_summary" / "2025-05-01" / "o__a.md", b"s" * 5000)
+    _write(cache / "2025-05-01__since-daily.json", b"j" * 5000)
+    _write(cache / "readme" / "2025-06-01" / "o__a.md", b"r" * 5000)
+
+    maintenance.enforce_size_budget(cache, 100, TODAY, maintenance.MaintenanceReport())
+
+    assert _dated_files(cache) == [
+        "2025-05-01__since-daily.json",
+        "readme/2025-06-01/o__a.md",
+        "readme_summary/2025-05-01/o__a.md",
+    ]
+
+
+def test_size_budget_counts_shared_blobs_once_freed(cache, maintenance):
+    from github_trending.blob_store import write_text
+
+    shared = "x" * 4000
+    write_text(cache / "readme" / "2025-05-01" / "o__a.md", shared)
+    write_text(cache / "readme" / "2025-05-02" / "o__a.md", shared)
+    write_text(cache / "readme" / "2025-05-03" / "o__b.md", "y" * 4000)
+    if (cache / "readme" / "2025-05-01" / "o__a.md").stat().st_nlink < 3:
+        pytest.skip("文件系统不支持硬链接")
+
+    # 共 8000 字节；删除第一天不会释放空间（blob 仍被第二天引用），需要继续删除第二天
+    maintenance.enforce_size_budget(cache, 5000, TODAY, maintenance.MaintenanceReport())
+
+    assert _dated_files(cache) == ["readme/2025-05-03/o__b.md"]
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def cache():
+    from github_trending.trending_service import cache_dir
+
+    return cache_dir()
+
+
+@pytest.fixture
+def migration():
+    from github_trending import cache_migration
+
+    return cache_migration
+
+
+def _write_payload(path, payload, report=None):
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    if report is not None:
+        path.with_suffix(".md").write_text(report, encoding="utf-8")
+    return path
+
+
+def test_language_prefers_payload_over_sanitized_stem(cache, migration):
+    path = cache / "2025-01-02__since-daily__lang-c_.json"
+    ctx = migration._context_from_path(path, {"language": "c++"})
+    assert (ctx.date, ctx.since, ctx.language) == ("2025-01-02", "daily", "c++")
+
+
+def test_language_falls_back_to_report_source_line(cache, migration):
+    path = _write_payload(
+        cache / "2025-01-02__since-weekly__lang-c_.json",
+        {"items": []},
+        "# GitHub Trending (2025-01-02, weekly)\n\n"
+        "Source: https://github.com/trending?since=weekly&language=c++\n",
+    )
+    ctx = migration._context_from_path(path, {})
+    assert (ctx.since, ctx.language) == ("weekly", "c++")
+
+
+def test_language_falls_back_to_stem_without_report(cache, migration):
+    path = cache / "2025-01-02__since-daily__lang-python.json"
+    assert migration._context_from_path(path, {}).language == "python"
+    assert migration._context_from_path(cache / "2025-01-02.json", {}).language is None
+
+
+def test_v1_payload_is_migrated_to_current_schema(cache, migration):
+    from github_trending.trending_service import SCHEMA_VERSION
+
+    path = _write_payload(
+        cache / "2025-01-02__since-daily__lang-c_.json",
+        {
+            "openai_enabled": True,
+            "items": [
+                {"full_name": "o/a", "readme_md": "# 摘要\n"},
+                {"full_name": "o/b"},
+            ],
+        },
+        "Source: https://github.com/trending?since=daily&language=c++\n",
+    )
+
+    assert migration.migrate_all() == (1, 0)
+
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    assert payload["schema_version"] == SCHEMA_VERSION
+    assert (payload["date"], payload["since"], payload["language"]) == (
+        "2025-01-02",
+        "daily",
+        "c++",
+    )
+    with_summary, without = payload["items"]
+    assert with_summary["rank"] == 1
+    assert with_summary["readme_source"] == "openai"
+    assert "readme_md" not in with_summary
+    summary = cache / "readme_summary" / "2025-01-02" / "o__a.md"
+    assert with_summary["readme_path"] == str(summary)
+    assert summary.read_text(encoding="utf-8") == "# 摘要\n"
+    assert without["readme_source"] == "none"
+
+
+def test_v5_inline_summary_is_written_to_file(cache, migration):
+    path = cache / "2025-01-02__since-daily.json"
+    payload = {
+        "schema_version": 5,
+        "date": "2025-01-02",
+        "since": "daily",
+        "language": None,
+        "items": [
+            {"full_name": "o/a", "readme_source": "openai", "readme_md": "inline\n", "readme_html": "<p/>"},
+            {"full_name": "o/b", "readme_source": "missing"},
+        ],
+    }
+
+    migrated = migration.migrate_payload(payload, path)
+
+    inline, missing = migrated["items"]
+    assert migrated["schema_version"] == 6
+    assert inline["readme_path"] == str(cache / "readme_summary" / "2025-01-02" / "o__a.md")
+    assert "readme_md" not in inline and "readme_html" not in inline
+    assert missing == {"full_name": "o/b", "readme_source": "missing"}
@@ -0,0 +1,153 @@
+import pytest
+
+
+@pytest.fixture
+def cgroup_source():
+    from system_monitor import cgroup_source
+
+    return cgroup_source
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def host(cgroup_source, monkeypatch):
+    # 主机 8 核 / 64GB，配额只来自假的 cgroup 目录
+    monkeypatch.setattr(cgroup_source.os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(
+        cgroup_source.psutil, "virtual_memory", lambda: type("vm", (), {"total": 64 << 30})()
+    )
+
+
+def test_parse_pressure(cgroup_source):
+    text = (
+        "some avg10=1.50 avg60=0.80 avg300=0.10 total=12345\n"
+        "full avg10=0.25 avg60=0.00 avg300=0.00 total=678\n"
+    )
+    assert cgroup_source.parse_pressure(text) == {"some": 1.5, "full": 0.25}
+    assert cgroup_source.parse_pressure(None) == {}
+
+
+def test_read_keyed_skips_non_integer_lines(cgroup_source, tmp_path):
+    _write(tmp_path / "cpu.stat", "usage_usec 1500000\nnr_periods 10\nbroken line\n")
+    assert cgroup_source._read_keyed(tmp_path / "cpu.stat") == {"usage_usec": 1500000, "nr_periods": 10}
+    assert cgroup_source._read_keyed(tmp_path / "missing") == {}
+
+
+def test_detect_v2(cgroup_source, host, tmp_path):
+    root = tmp_path / "cgroup"
+    _write(root / "cgroup.controllers", "cpu memory")
+    # 上级 slice 限制了内存，当前目录限制了 CPU
+    _write(root / "app.slice" / "memory.max", str(2 << 30))
+    leaf = root / "app.slice" / "app.service"
+    _write(leaf / "cpu.max", "150000 100000")
+    _write(leaf / "memory.max", "max")
+    _write(leaf / "cpu.stat", "usage_usec 2500000\nnr_periods 20\nnr_throttled 5\nthrottled_usec 40000\n")
+    _write(leaf / "memory.current", str(300 << 20))
+    _write(leaf / "memory.stat", "anon 1\ninactive_file 104857600\n")
+    _write(leaf / "memory.pressure", "some avg10=3.00 avg60=0 avg300=0 total=1\n")
+    _write(tmp_path / "self_cgroup", "0::/app.slice/app.service\n")
+
+    source = cgroup_source.detect_cgroup(str(root), str(tmp_path / "self_cgroup"))
+
+    assert source.version == 2
+    assert source.dirs["cpu"] == str(leaf)
+    assert source.cpu_limit() == pytest.approx(1.5)
+    assert source.memory_limit() == 2 << 30
+    assert source.cpu_stat() == (2.5, 20, 5, 0.04)
+    assert source.memory_usage() == 200 << 20
+    assert source.pressure("memory") == {"some": 3.0}
+    assert source.pressure("cpu") == {}
+
+
+def test_detect_v2_without_namespace_falls_back_to_root(cgroup_source, host, tmp_path):
+    root = tmp_path / "cgroup"
+    _write(root / "cgroup.controllers", "cpu memory")
+    _write(tmp_path / "self_cgroup", "0::/docker/abc\n")
+
+    source = cgroup_source.detect_cgroup(str(root), str(tmp_path / "self_cgroup"))
+
+    assert source.dirs["memory"] == str(root)
+    assert source.cpu_limit() == 8
+    assert source.memory_limit() == 64 << 30
+
+
+def test_detect_hybrid_v1(cgroup_source, host, tmp_path):
+    root = tmp_path / "cgroup"
+    cpu = root / "cpu" / "docker" / "abc"
+    memory = root / "memory" / "docker" / "abc"
+    _write(cpu / "cpu.cfs_quota_us", "50000")
+    _write(cpu / "cpu.cfs_period_us", "100000")
+    _write(cpu / "cpu.stat", "nr_periods 4\nnr_throttled 1\nthrottled_time 2000000\n")
+    _write(root / "cpuacct" / "docker" / "abc" / "cpuacct.usage", "3000000000")
+    # v1 未限制时为接近 2^63 的值
+    _write(memory / "memory.limit_in_bytes", "9223372036854771712")
+    _write(root / "memory" / "docker" / "memory.limit_in_bytes", str(1 << 30))
+    _write(memory / "memory.usage_in_bytes", str(500 << 20))
+    _write(memory / "memory.stat", "cache 1\ntotal_inactive_file 104857600\n")
+    _write(root / "unified" / "docker" / "abc" / "cpu.pressure", "some avg10=0.50 total=1\n")
+    _write(
+        tmp_path / "self_cgroup",
+        "5:memory:/docker/abc\n4:cpu,cpuacct:/docker/abc\n1:name=systemd:/docker/abc\n0::/docker/abc\n",
+    )
+
+    source = cgroup_source.detect_cgroup(str(root), str(tmp_path / "self_cgroup"))
+
+    assert source.version == 1
+    assert source.cpu_limit() == pytest.approx(0.5)
+    assert source.memory_limit() == 1 << 30
+    assert source.cpu_stat() == (3.0, 4, 1, 0.002)
+    assert source.memory_usage() == 400 << 20
+    assert source.pressure("cpu") == {"some": 0.5}
+
+
+def test_detect_returns_none_without_cgroup(cgroup_source, tmp_path):
+    assert cgroup_source.detect_cgroup(str(tmp_path / "missing"), str(tmp_path / "self_cgroup")) is None
+    root = tmp_path / "cgroup"
+    (root / "cpu").mkdir(parents=True)
+    _write(tmp_path / "self_cgroup", "4:cpu,cpuacct:/\n")
+    # v1 下缺少 memory 层级
+    assert cgroup_source.detect_cgroup(str(root), str(tmp_path / "self_cgroup")) is None
+
+
+class FakeSource:
+    version = 2
+
+    def __init__(self):
+        self.stat = (0.0, 0, 0, 0.0)
+
+    def cpu_limit(self):
+        return 2.0
+
+    def memory_limit(self):
+        return 1000
+
+    def cpu_stat(self):
+        return self.stat
+
+    def memory_usage(self):
+        return 250
+
+    def pressure(self, resource):
+        return {}
+
+
+def test_sampler_reports_usage_against_quota(cgroup_source, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cgroup_source.time, "monotonic", lambda: now[0])
+    source = FakeSource()
+    sampler = cgroup_source.CgroupSampler(source, ["cpu"])
+
+    assert sampler.sample_cpu() is None
+    # 10 秒内用了 5 秒 CPU，配额 2 核 -> 25%
+    now[0] = 10.0
+    source.stat = (5.0, 100, 10, 0.3)
+    usage = sampler.sample_cpu()
+
+    assert usage["percent"] == pytest.approx(25.0)
+    assert usage["throttled_percent"] == pytest.approx(10.0)
+    assert usage["throttled_ms"] == pytest.approx(300.0)
+    assert sampler.sample_memory()["percent"] == pytest.approx(25.0)
@@ -0,0 +1,82 @@
+import pytest
+
+
+@pytest.fixture
+def http_client():
+    from utils import http_client
+
+    return http_client
+
+
+@pytest.fixture
+def clock(http_client, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_client.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(http_client):
+    settings = http_client.HttpSettings(breaker_failures=2, breaker_cooldown_s=10, breaker_max_cooldown_s=25)
+    return http_client.CircuitBreaker("api.github.com", settings)
+
+
+def test_opens_after_consecutive_failures(http_client, breaker, clock):
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(http_client.CircuitOpenError) as exc:
+        breaker.before_request()
+    assert exc.value.retry_at == 1010.0
+
+
+def test_half_open_allows_a_single_probe(http_client, breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock[0] += 10
+
+    breaker.before_request()
+    assert breaker.state == "half-open"
+    with pytest.raises(http_client.CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert (breaker.state, breaker.failures) == ("closed", 0)
+    breaker.before_request()
+
+
+def test_failed_probe_doubles_cooldown_up_to_max(http_client, breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    for cooldown in (20, 25):
+        clock[0] = breaker.retry_at
+        breaker.before_request()
+        breaker.record_failure()
+        assert (breaker.state, breaker.cooldown_s) == ("open", cooldown)
+        assert breaker.retry_at == clock[0] + cooldown
+
+    # 探测成功后冷却时间恢复初始值
+    clock[0] = breaker.retry_at
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.cooldown_s == 10
+
+
+def test_released_probe_lets_the_next_request_probe(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.before_request()
+
+    breaker.release_probe()
+
+    breaker.before_request()
+    assert breaker.state == "half-open"
+
+
+def test_settings_from_config(http_client):
+    settings = http_client.HttpSettings.from_config({"retries": "5", "breaker_cooldown_s": 1})
+    assert (settings.retries, settings.breaker_cooldown_s) == (5, 1.0)
+    assert settings.read_timeout_s == http_client.HttpSettings().read_timeout_s
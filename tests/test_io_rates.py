@@ -0,0 +1,74 @@
+from collections import namedtuple
+
+import pytest
+
+
+Disk = namedtuple("Disk", "read_bytes write_bytes read_count write_count")
+
+
+@pytest.fixture
+def io_rates(tmp_path, monkeypatch):
+    from system_monitor import io_rates
+
+    # 模拟 sysfs：sda/sdb 为 md0 的成员盘，nvme0n1p1 为分区，dm-0 建立在 nvme0n1p1 上
+    root = tmp_path / "sys_block"
+    layout = {
+        "sda": [],
+        "sdb": [],
+        "md0": ["sda", "sdb"],
+        "md10": [],
+        "nvme0n1": [],
+        "nvme0n10": [],
+        "dm-0": ["nvme0n1p1"],
+    }
+    for name, slaves in layout.items():
+        (root / name / "slaves").mkdir(parents=True)
+        for slave in slaves:
+            (root / name / "slaves" / slave).touch()
+    (root / "nvme0n1p1").mkdir()
+    (root / "nvme0n1p1" / "partition").write_text("1\n")
+    monkeypatch.setattr(io_rates, "SYS_CLASS_BLOCK", str(root))
+    monkeypatch.setattr(io_rates.sys, "platform", "linux")
+    io_rates._is_partition.cache_clear()
+    io_rates._is_stacked.cache_clear()
+    yield io_rates
+    io_rates._is_partition.cache_clear()
+    io_rates._is_stacked.cache_clear()
+
+
+def test_only_physical_whole_disks_are_counted(io_rates):
+    names = ["sda", "sdb", "md0", "md10", "nvme0n1", "nvme0n1p1", "nvme0n10", "dm-0"]
+    assert io_rates._physical_disks(names) == {"sda", "sdb", "md10", "nvme0n1", "nvme0n10"}
+
+
+def test_raid_traffic_is_not_double_counted(io_rates):
+    class Source:
+        counters = {}
+
+        def disk_io_counters(self):
+            return self.counters
+
+    source = Source()
+    sampler = io_rates.IORateSampler({"nics": ["none"]}, source=source)
+    source.counters = {name: Disk(0, 0, 0, 0) for name in ("sda", "sdb", "md0")}
+    sampler.sample(now=0.0)
+    # md0 写入 1000 字节（RAID1），两块成员盘各写入 1000 字节
+    source.counters = {"sda": Disk(0, 1000, 0, 1), "sdb": Disk(0, 1000, 0, 1), "md0": Disk(0, 1000, 0, 1)}
+    rates = sampler.sample(now=1.0)["disk_io"]
+    assert sorted(rates) == ["sda", "sdb"]
+    assert sum(r["write_bps"] for r in rates.values()) == 2000
+
+
+def test_counter_rates(io_rates):
+    rates = io_rates.CounterRates(("read_bytes",))
+    assert rates.update({"sda": Disk(100, 0, 0, 0)}, now=0.0) == {}
+    # 计数器回退按 0 处理，新设备从下一次采样开始计算
+    assert rates.update({"sda": Disk(50, 0, 0, 0), "sdb": Disk(1, 0, 0, 0)}, now=2.0) == {
+        "sda": {"read_bytes": 0.0}
+    }
+    assert rates.update({"sda": Disk(250, 0, 0, 0)}, now=4.0) == {"sda": {"read_bytes": 100.0}}
+
+
+@pytest.mark.parametrize("bps, text", [(980, "980B"), (12 * 1024, "12K"), (3.4 * (1 << 20), "3.4M")])
+def test_format_rate(io_rates, bps, text):
+    assert io_rates.format_rate(bps) == text
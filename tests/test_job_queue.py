@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+
+DS = "2025-01-02"
+
+
+@pytest.fixture
+def job_queue():
+    from github_trending import job_queue
+
+    return job_queue
+
+
+def test_backoff_doubles_up_to_the_cap(job_queue):
+    assert [job_queue._backoff(n) for n in (1, 2, 3)] == [30, 60, 120]
+    assert job_queue._backoff(20) == job_queue.MAX_DELAY_S
+
+
+def test_fail_retries_until_max_attempts(job_queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "_deadline", lambda ds: time.time() + 10**6)
+    job_queue.ensure_jobs(DS, ["o/a"], "fetch")
+    retries = [job_queue.fail(DS, "o/a", "fetch", "boom") for _ in range(job_queue.MAX_ATTEMPTS)]
+    assert retries == [True] * (job_queue.MAX_ATTEMPTS - 1) + [False]
+    job = job_queue.jobs_for(DS)["o/a"]["fetch"]
+    assert job.status == "failed"
+    assert job.attempts == job_queue.MAX_ATTEMPTS
+    assert job.last_error == "boom"
+
+
+def test_retry_past_deadline_gives_up(job_queue, monkeypatch):
+    # 下次重试时间已超过期限，不再安排重试
+    monkeypatch.setattr(job_queue, "_deadline", lambda ds: time.time() + 10)
+    job_queue.ensure_jobs(DS, ["o/a"], "fetch")
+    assert not job_queue.fail(DS, "o/a", "fetch", "boom")
+    assert job_queue.jobs_for(DS)["o/a"]["fetch"].status == "failed"
+
+
+def test_open_jobs_expire_at_deadline(job_queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "_deadline", lambda ds: time.time() - 1)
+    job_queue.ensure_jobs(DS, ["o/a", "o/b"], "fetch")
+    job_queue.complete(DS, "o/b", "fetch")
+    jobs = job_queue.jobs_for(DS)
+    assert jobs["o/a"]["fetch"].status == "expired"
+    assert jobs["o/b"]["fetch"].status == "done"
+    assert job_queue.next_retry_at(DS) is None
+
+
+def test_connection_is_reused_per_thread(job_queue, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(job_queue, "_deadline", lambda ds: time.time() + 10**6)
+    job_queue.ensure_jobs(DS, ["o/a"], "fetch")
+    conn = job_queue._connect()
+    assert job_queue.jobs_for(DS)["o/a"]["fetch"].status == "pending"
+    assert job_queue._connect() is conn
+
+    other = []
+
+    def work():
+        job_queue.complete(DS, "o/a", "fetch")
+        other.append(job_queue._connect())
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+    # 其他线程的写入在本线程可见
+    assert job_queue.jobs_for(DS)["o/a"]["fetch"].status == "done"
+
+
+def test_result_column_is_added_to_existing_queue(job_queue, monkeypatch):
+    import sqlite3
+
+    monkeypatch.setattr(job_queue, "_deadline", lambda ds: time.time() + 10**6)
+    conn = sqlite3.connect(job_queue.queue_path())
+    conn.execute(
+        "CREATE TABLE jobs (date TEXT NOT NULL, repo TEXT NOT NULL, stage TEXT NOT NULL, "
+        "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL, "
+        "deadline REAL NOT NULL, last_error TEXT, updated_at REAL NOT NULL, "
+        "PRIMARY KEY (date, repo, stage))"
+    )
+    conn.execute(
+        "INSERT INTO jobs VALUES (?, 'o/old', 'summarize', 'done', 0, 0, ?, NULL, 0)",
+        (DS, time.time() + 10**6),
+    )
+    conn.commit()
+    conn.close()
+
+    job_queue.complete(DS, "o/new", "summarize", "heuristic")
+    jobs = job_queue.jobs_for(DS)
+    assert jobs["o/old"]["summarize"].result is None
+    assert jobs["o/new"]["summarize"].result == "heuristic"
@@ -0,0 +1,98 @@
+import pytest
+
+
+@pytest.fixture
+def scheduler_module():
+    from system_monitor import metric_scheduler
+
+    return metric_scheduler
+
+
+@pytest.fixture
+def clock(scheduler_module, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_wheel_fires_keys_when_due(scheduler_module, clock):
+    wheel = scheduler_module.TimerWheel(tick_ms=50, slots=8)
+    wheel.schedule("cpu", 100)
+    wheel.schedule("disk", 120)  # 向上取整到 150ms
+    assert wheel.next_delay_ms() == pytest.approx(100)
+
+    clock[0] += 0.1
+    assert wheel.advance() == ["cpu"]
+    clock[0] += 0.04
+    assert wheel.advance() == []
+    clock[0] += 0.01
+    assert wheel.advance() == ["disk"]
+    assert len(wheel) == 0
+    assert wheel.next_delay_ms() is None
+
+
+def test_wheel_cancel_and_reschedule(scheduler_module, clock):
+    wheel = scheduler_module.TimerWheel(tick_ms=50, slots=8)
+    wheel.schedule("cpu", 50)
+    wheel.schedule("net", 50)
+    wheel.cancel("net")
+    wheel.schedule("cpu", 200)
+
+    clock[0] += 0.05
+    assert wheel.advance() == []
+    clock[0] += 0.15
+    assert wheel.advance() == ["cpu"]
+
+
+def test_wheel_catches_up_after_a_long_stall(scheduler_module, clock):
+    # 延迟超过一圈的条目留在槽位里，直到真正到期
+    wheel = scheduler_module.TimerWheel(tick_ms=50, slots=8)
+    wheel.schedule("far", 1000)
+    wheel.schedule("near", 100)
+
+    clock[0] += 0.5
+    assert wheel.advance() == ["near"]
+    clock[0] += 10
+    assert wheel.advance() == ["far"]
+
+
+def test_scheduler_runs_collectors_on_their_own_intervals(scheduler_module, clock):
+    calls = []
+
+    def collect(name):
+        return lambda frame: calls.append(name)
+
+    def fail(frame):
+        raise RuntimeError("boom")
+
+    errors = []
+    scheduler = scheduler_module.MetricScheduler(
+        [
+            scheduler_module.MetricCollector("cpu", collect("cpu")),
+            scheduler_module.MetricCollector("disk", collect("disk"), interval_ms=5000),
+            scheduler_module.MetricCollector("bad", fail, interval_ms=1000),
+        ]
+    )
+    scheduler.set_adaptive_interval(1000)
+
+    ran = scheduler.run_due({}, on_error=lambda name, e: errors.append(name))
+    assert sorted(ran) == ["bad", "cpu", "disk"]
+    assert errors == ["bad"]
+    scheduler.reschedule(ran)
+
+    clock[0] += 1
+    assert sorted(scheduler.run_due({})) == ["bad", "cpu"]
+    assert calls == ["cpu", "disk", "cpu"]
+
+
+def test_scheduler_pause_and_resume(scheduler_module, clock):
+    scheduler = scheduler_module.MetricScheduler(
+        [scheduler_module.MetricCollector("cpu", lambda frame: None)]
+    )
+    scheduler.set_adaptive_interval(None)
+    assert scheduler.paused and scheduler.next_delay_ms() is None
+    scheduler.reschedule(["cpu"])
+    assert scheduler.next_delay_ms() is None
+
+    scheduler.schedule_all()
+    assert scheduler.run_due({}) == ["cpu"]
@@ -0,0 +1,71 @@
+import sys
+
+import numpy as np
+import pytest
+
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc 只在 Linux 上可用")
+
+
+class FakeFile:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return self.data
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def source():
+    from system_monitor.metric_sources import ProcSource
+
+    source = ProcSource()
+    yield source
+    source.close()
+
+
+MEMINFO = (
+    b"MemTotal:        1000 kB\n"
+    b"MemFree:          100 kB\n"
+    b"MemAvailable:     600 kB\n"
+    b"Buffers:           50 kB\n"
+    b"Cached:           150 kB\n"
+    b"SwapCached:       999 kB\n"
+)
+
+
+def test_memory_percent_uses_mem_available(source):
+    source._meminfo = FakeFile(MEMINFO)
+    assert source.memory_percent() == pytest.approx(40.0)
+
+
+def test_memory_percent_without_mem_available(source):
+    # 旧内核：按 MemFree + Buffers + Cached 估算，不能把 SwapCached 当成 Cached
+    source._meminfo = FakeFile(MEMINFO.replace(b"MemAvailable:     600 kB\n", b""))
+    assert source.memory_percent() == pytest.approx(70.0)
+
+
+def test_cpu_times_are_seconds_in_alternating_buffers(source):
+    from system_monitor.metric_sources import CLOCK_TICKS
+
+    stat = (
+        b"cpu  300 0 300 3000 0 0 0 0 0 0\n"
+        b"cpu0 100 0 200 1000 0 0 0 0 0 0\n"
+        b"cpu1 200 0 100 2000 0 0 0 0 0 0\n"
+        b"intr 0\n"
+    )
+    source._stat = FakeFile(stat)
+    fields, first = source.cpu_times()
+    assert fields[:4] == ("user", "nice", "system", "idle")
+    np.testing.assert_allclose(first[:, 3], np.array([1000, 2000]) / CLOCK_TICKS)
+
+    # 上一次的结果在下一次调用后仍然有效，供调用方计算差值
+    source._stat = FakeFile(stat.replace(b"cpu0 100", b"cpu0 400"))
+    _, second = source.cpu_times()
+    assert second is not first
+    assert first[0, 0] == pytest.approx(100 / CLOCK_TICKS)
+    assert second[0, 0] == pytest.approx(400 / CLOCK_TICKS)
+    assert source.cpu_times()[1] is first
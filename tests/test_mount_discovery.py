@@ -0,0 +1,82 @@
+import sys
+
+import pytest
+
+
+MOUNTINFO = "\n".join(
+    [
+        "22 1 8:2 / / rw,relatime shared:1 - ext4 /dev/sda2 rw",
+        "23 22 0:21 / /proc rw,nosuid shared:5 - proc proc rw",
+        "24 22 0:22 / /run rw,nosuid shared:6 - tmpfs tmpfs rw,mode=755",
+        "25 24 0:40 / /run/user/1000 rw,nosuid shared:7 - tmpfs tmpfs rw,uid=1000",
+        "26 25 0:41 / /run/user/1000/gvfs rw,nosuid shared:8 - fuse.gvfsd-fuse gvfsd-fuse rw",
+        "27 22 8:3 / /home rw,relatime shared:9 - ext4 /dev/sda3 rw",
+        # 同一设备 bind mount 到另一处
+        "28 22 8:3 /alice/data /srv/data rw,relatime shared:9 - ext4 /dev/sda3 rw",
+        # 挂载点中的空格转义为 \\040
+        r"29 24 8:17 / /run/media/alice/My\040Disk rw,nosuid shared:10 - exfat /dev/sdb1 rw",
+        "30 22 0:50 / /mnt/nas rw,relatime shared:11 - nfs4 nas:/export rw",
+        "31 24 0:4 net:[4026532] /run/netns/ns1 rw shared:12 - nsfs nsfs rw",
+        "32 22 7:1 / /snap/core/1 ro,nodev shared:13 - squashfs /dev/loop1 ro",
+        "",
+        "garbage line without separator",
+    ]
+)
+
+
+@pytest.fixture
+def mount_discovery():
+    from system_monitor import mount_discovery
+
+    return mount_discovery
+
+
+@pytest.fixture
+def table(mount_discovery, monkeypatch):
+    def make(config=None):
+        table = mount_discovery.MountTable(config)
+        monkeypatch.setattr(
+            table, "_read_linux", lambda: mount_discovery.parse_mountinfo(MOUNTINFO)
+        )
+        return table
+
+    monkeypatch.setattr(mount_discovery.sys, "platform", "linux")
+    monkeypatch.setattr(mount_discovery.os.path, "exists", lambda path: True)
+    return make
+
+
+def test_parse_mountinfo(mount_discovery):
+    mounts = mount_discovery.parse_mountinfo(MOUNTINFO)
+    assert len(mounts) == 11
+    root = mounts[0]
+    assert (root.device, root.mountpoint, root.fstype, root.dev_id) == ("/dev/sda2", "/", "ext4", "8:2")
+    assert mounts[7].mountpoint == "/run/media/alice/My Disk"
+    assert mounts[8].is_network
+
+
+def test_default_filter_keeps_removable_media_under_run(table):
+    assert table().mountpoints() == ["/", "/home", "/run/media/alice/My Disk", "/mnt/nas"]
+
+
+def test_config_rules_extend_defaults(table):
+    config = {"include_network": False, "exclude_mountpoints": ["/run/media"], "exclude_fstypes": ["ext4"]}
+    assert table(config).mountpoints() == []
+
+
+@pytest.mark.parametrize(
+    "mount, name",
+    [("C:\\", "C盘"), ("/", "根"), ("/run/media/alice/USB/", "USB"), ("/home", "home")],
+)
+def test_display_name(mount_discovery, mount, name):
+    assert mount_discovery.display_name(mount) == name
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="需要 /proc/self/mountinfo")
+def test_reads_live_mount_table(mount_discovery):
+    table = mount_discovery.MountTable()
+    try:
+        assert "/" in table.mountpoints()
+        # 挂载表没有变化时直接返回缓存
+        assert not table._changed()
+    finally:
+        table.close()
@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+import psutil
+import pytest
+
+
+IO = namedtuple("IO", "read_bytes write_bytes")
+Memory = namedtuple("Memory", "rss")
+
+
+class FakeProcess:
+    """按 pid 查找当前“系统”中的进程；创建后记住当时的进程，与 psutil 缓存创建时间的行为一致"""
+
+    table = {}
+
+    def __init__(self, pid):
+        if pid not in self.table:
+            raise psutil.NoSuchProcess(pid)
+        self.pid = pid
+        self.state = self.table[pid]
+        self.calls = 0
+
+    def is_running(self):
+        return self.table.get(self.pid) is self.state
+
+    def as_dict(self, attrs, ad_value=None):
+        # 与 cpu_percent 一样，第一次调用没有基线
+        self.calls += 1
+        return {
+            "name": self.state["name"],
+            "cpu_percent": self.state["cpu"] if self.calls > 1 else 0.0,
+            "memory_info": Memory(self.state["rss"]),
+            "io_counters": IO(self.state["io"], 0),
+        }
+
+
+@pytest.fixture
+def system(monkeypatch):
+    FakeProcess.table = {}
+    monkeypatch.setattr(psutil, "pids", lambda: list(FakeProcess.table))
+    monkeypatch.setattr(psutil, "Process", FakeProcess)
+    return FakeProcess.table
+
+
+@pytest.fixture
+def process_sampler():
+    from system_monitor import process_sampler
+
+    return process_sampler
+
+
+def _proc(name, cpu=0.0, rss=0, io=0):
+    return {"name": name, "cpu": cpu, "rss": rss, "io": io}
+
+
+def test_top_n_by_sort_key(system, process_sampler):
+    system.update({1: _proc("a", 5, 300), 2: _proc("b", 50, 100), 3: _proc("c", 20, 200)})
+    sampler = process_sampler.ProcessSampler(limit=2)
+    sampler.sample()
+    assert [r.name for r in sampler.sample()] == ["b", "c"]
+    sampler.sort_key = "memory"
+    assert [r.name for r in sampler.sample()] == ["a", "c"]
+
+
+def test_exited_process_is_dropped(system, process_sampler):
+    system.update({1: _proc("a"), 2: _proc("b")})
+    sampler = process_sampler.ProcessSampler()
+    sampler.sample()
+    del system[2]
+    assert [r.pid for r in sampler.sample()] == [1]
+    assert set(sampler._procs) == {1}
+
+
+def test_reused_pid_starts_a_new_baseline(system, process_sampler, monkeypatch):
+    clock = iter(range(0, 100, 10))
+    monkeypatch.setattr(process_sampler.time, "monotonic", lambda: next(clock))
+    system[7] = _proc("old", cpu=90.0, io=1000)
+    sampler = process_sampler.ProcessSampler()
+    sampler.sample()
+    sampler.sample()
+
+    # 旧进程退出，新进程拿到同一个 pid；IO 累计值比旧进程小
+    system[7] = _proc("new", cpu=40.0, io=100)
+    (row,) = sampler.sample()
+    assert row.name == "new"
+    assert row.cpu == 0.0
+    assert row.io_bps == 0.0
+    (row,) = sampler.sample()
+    assert row.cpu == 40.0
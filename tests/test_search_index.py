@@ -0,0 +1,72 @@
+import pytest
+
+
+@pytest.fixture
+def search_index():
+    from github_trending import search_index
+
+    return search_index
+
+
+@pytest.fixture
+def cache():
+    from github_trending.trending_service import cache_dir
+
+    return cache_dir()
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_tokenize_words_and_cjk_bigrams(search_index):
+    assert search_index.tokenize("C++ and Rust-lang! 向量数据库") == [
+        "c++",
+        "and",
+        "rust-lang",
+        "向量",
+        "量数",
+        "数据",
+        "据库",
+    ]
+    assert search_index.tokenize("库") == ["库"]
+    assert search_index.tokenize(None) == []
+
+
+def test_index_cache_and_search(search_index, cache):
+    _write(cache / "readme" / "2025-01-01" / "o__vec.md", "A fast vector database in Rust\n")
+    _write(cache / "readme" / "2025-01-02" / "o__vec.md", "A fast vector database in Rust\n")
+    _write(cache / "readme_summary" / "2025-01-02" / "o__vec.md", "用 Rust 编写的向量数据库\n")
+    _write(cache / "readme" / "2025-01-02" / "o__web.md", "A web framework\n")
+
+    assert search_index.index_cache() == 4
+    # 已登记的路径不会重复索引
+    assert search_index.index_cache() == 0
+
+    hits = search_index.search("vector rust")
+    assert [h.full_name for h in hits] == ["o/vec"]
+    assert hits[0].date == "2025-01-02"
+    assert search_index.search("向量数据库")[0].kind == "summary"
+    # 没有文档同时包含全部词时退回 OR 匹配
+    assert {h.full_name for h in search_index.search("vector framework")} == {"o/vec", "o/web"}
+    assert search_index.search("nothing-here") == []
+
+
+def test_cancelled_index_keeps_committed_files(search_index, cache):
+    for name in ("a", "b", "c"):
+        _write(cache / "readme" / "2025-01-01" / f"o__{name}.md", f"project {name}\n")
+    calls = iter([False, True])
+
+    assert search_index.index_cache(should_cancel=lambda: next(calls)) == 1
+    assert search_index.index_cache() == 2
+
+
+def test_forget_paths_hides_expired_dates(search_index, cache):
+    path = _write(cache / "readme" / "2025-01-01" / "o__a.md", "unique keyword\n")
+    search_index.index_document("o/a", "2025-01-01", "readme", path)
+    assert search_index.search("unique")
+
+    search_index.forget_paths([str(path)])
+    assert search_index.search("unique") == []
@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+import pytest
+
+
+DIM = 4
+
+
+@pytest.fixture
+def index_module(monkeypatch):
+    from github_trending import similarity_index
+    from utils import openai_llm
+
+    settings = openai_llm.OpenAISettings(
+        api_key="test",
+        base_url="http://localhost",
+        model="m",
+        embedding_model="embed",
+        max_input_chars=1000,
+        max_output_tokens=100,
+    )
+
+    def embeddings(texts, model=None):
+        # 以仓库名区分方向：名称决定哪一维为 1
+        return [np.eye(DIM)[_axis(text.split("\n", 1)[0])] for text in texts]
+
+    monkeypatch.setattr(openai_llm, "get_openai_settings", lambda: settings)
+    monkeypatch.setattr(openai_llm, "embeddings", embeddings)
+    return similarity_index
+
+
+def _axis(full_name):
+    return {"o/a": 0, "o/b": 1, "o/STALE": 2, "o/c": 3}[full_name]
+
+
+def _doc(full_name):
+    return (full_name, "2025-01-02", f"{full_name}.md", f"summary of {full_name}")
+
+
+def test_entries_after_crash_are_discarded(index_module, tmp_path):
+    root = tmp_path / "embeddings"
+    index = index_module.SimilarityIndex(root)
+    assert index.add_summaries([_doc("o/a"), _doc("o/b")]) == 2
+
+    # 模拟崩溃：条目与向量已写入，meta.json 还没有更新
+    with open(root / "entries.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"digest": "x", "full_name": "o/STALE", "date": "d", "path": "p"}) + "\n")
+    with open(root / "vectors.f32", "ab") as f:
+        f.write(np.eye(DIM, dtype=np.float32)[2].tobytes())
+
+    index = index_module.SimilarityIndex(root)
+    assert index.rows == 2
+    assert index.add_summaries([_doc("o/c")]) == 1
+
+    index = index_module.SimilarityIndex(root)
+    assert [e["full_name"] for e in index._entries] == ["o/a", "o/b", "o/c"]
+    top = index.similar_to_vector(np.eye(DIM)[3], k=1)
+    assert [r.full_name for r in top] == ["o/c"]
+
+
+def test_same_summary_is_embedded_once(index_module, tmp_path):
+    index = index_module.SimilarityIndex(tmp_path / "embeddings")
+    assert index.add_summaries([_doc("o/a"), _doc("o/a")]) == 1
+    assert index.add_summaries([_doc("o/a"), _doc("o/b")]) == 1
+    assert index.similar("o/a", k=5)[0].full_name == "o/b"
@@ -0,0 +1,150 @@
+import pytest
+
+
+class FakeLocator:
+    def __init__(self, readmes):
+        self.readmes = readmes
+        self.calls = []
+
+    def fetch(self, full_name, timeout_s=12):
+        self.calls.append(full_name)
+        return self.readmes.get(full_name)
+
+    def save(self):
+        pass
+
+    def log_stats(self):
+        pass
+
+
+@pytest.fixture
+def summarized():
+    return []
+
+
+@pytest.fixture
+def service(monkeypatch, summarized):
+    from github_trending import search_index, similarity_index, trending_service
+    from utils import http_client, openai_llm
+
+    def summarize(raw_text, full_name, fallback=False):
+        summarized.append(full_name)
+        return f"摘要 {full_name}", "openai"
+
+    monkeypatch.setattr(http_client, "get_session", lambda *a, **k: None)
+    monkeypatch.setattr(trending_service, "_build_github_session", lambda: None)
+    monkeypatch.setattr(trending_service, "render_markdown_to_html", lambda *a, **k: "<p>ok</p>")
+    monkeypatch.setattr(openai_llm, "summarize_readme_markdown", summarize)
+    monkeypatch.setattr(search_index, "index_document", lambda *a, **k: None)
+    monkeypatch.setattr(similarity_index, "index_summaries", lambda *a, **k: None)
+    return trending_service
+
+
+OPENAI_PAYLOAD = {"openai_enabled": True}
+
+
+def _run(service, locator, monkeypatch, items, since, cache_payload=OPENAI_PAYLOAD):
+    # 任务在次日截止后不再执行，只能使用当天日期
+    ds = service.date_str()
+    monkeypatch.setattr(service, "ReadmeLocator", lambda *a: locator)
+    options = service.TrendingOptions(since=since)
+    service.fetch_all_raw_readmes(items, ds)
+    service.summarize_all_readmes_from_raw(items, ds, options, cache_payload=cache_payload)
+    return items
+
+
+def test_repo_on_two_lists_same_date_reuses_finished_jobs(service, summarized, monkeypatch):
+    locator = FakeLocator({"a/with-readme": "# README"})
+    daily = _run(
+        service,
+        locator,
+        monkeypatch,
+        [{"full_name": "a/with-readme"}, {"full_name": "b/no-readme"}],
+        "daily",
+    )
+    weekly = _run(
+        service,
+        locator,
+        monkeypatch,
+        [{"full_name": "a/with-readme"}, {"full_name": "b/no-readme"}],
+        "weekly",
+    )
+
+    # 第二个周期不再获取、不再总结，直接沿用同一天的结果
+    assert locator.calls == ["a/with-readme", "b/no-readme"]
+    assert summarized == ["a/with-readme"]
+    ds = service.date_str()
+    for items in (daily, weekly):
+        with_readme, no_readme = items
+        assert with_readme["readme_source"] == "openai"
+        assert with_readme["readme_path"] == str(
+            service.repo_readme_summary_path("a/with-readme", ds)
+        )
+        assert with_readme["readme_html_path"] == str(
+            service.repo_readme_html_path("a/with-readme", ds)
+        )
+        assert no_readme["readme_source"] == "missing"
+        assert service._all_summaries_done(items, ds)
+
+
+def test_deleted_summary_is_regenerated_for_second_list(service, summarized, monkeypatch):
+    locator = FakeLocator({"a/with-readme": "# README"})
+    _run(service, locator, monkeypatch, [{"full_name": "a/with-readme"}], "daily")
+    ds = service.date_str()
+    service.compressed_path(service.repo_readme_summary_path("a/with-readme", ds)).unlink(
+        missing_ok=True
+    )
+    service.repo_readme_summary_path("a/with-readme", ds).unlink(missing_ok=True)
+
+    (item,) = _run(service, locator, monkeypatch, [{"full_name": "a/with-readme"}], "weekly")
+
+    assert summarized == ["a/with-readme", "a/with-readme"]
+    assert item["readme_source"] == "openai"
+    assert service._all_summaries_done([item], ds)
+
+
+def test_reused_summary_keeps_the_recorded_source(service, summarized, monkeypatch):
+    locator = FakeLocator({"a/with-readme": "# README"})
+    _run(service, locator, monkeypatch, [{"full_name": "a/with-readme"}], "daily")
+
+    # 单独总结正在查看的仓库时不传 cache_payload，来源应取自任务记录而不是默认的 heuristic
+    (item,) = _run(
+        service, locator, monkeypatch, [{"full_name": "a/with-readme"}], "weekly", None
+    )
+
+    assert summarized == ["a/with-readme"]
+    assert item["readme_source"] == "openai"
+
+
+def test_focused_repo_is_summarized_before_rest_of_fetch(service, summarized, monkeypatch):
+    from github_trending import trending_history
+
+    order = []
+
+    class LoggedLocator(FakeLocator):
+        def fetch(self, full_name, timeout_s=12):
+            order.append(("fetch", full_name))
+            return super().fetch(full_name, timeout_s)
+
+    locator = LoggedLocator({"a/one": "# one", "b/two": "# two", "c/three": "# three"})
+    monkeypatch.setattr(service, "ReadmeLocator", lambda *a: locator)
+    monkeypatch.setattr(
+        service,
+        "fetch_trending",
+        lambda options, d=None: [{"full_name": n} for n in ("a/one", "b/two", "c/three")],
+    )
+    monkeypatch.setattr(trending_history, "record_payload", lambda payload: None)
+    summarize = service.summarize_all_readmes_from_raw
+
+    def summarize_logged(items, *args, **kwargs):
+        order.extend(("summarize", i["full_name"]) for i in items if i.get("readme_source") == "raw")
+        return summarize(items, *args, **kwargs)
+
+    monkeypatch.setattr(service, "summarize_all_readmes_from_raw", summarize_logged)
+
+    items, _ = service.fetch_and_cache_daily(priority=lambda: ["b/two"])
+
+    # 获取顺序按优先级；正在查看的仓库获取后立即总结，不等其余仓库获取完成
+    assert order[:3] == [("fetch", "b/two"), ("summarize", "b/two"), ("fetch", "a/one")]
+    assert all(i["readme_source"] == "openai" for i in items)
+    assert summarized == ["b/two", "a/one", "c/three"]